@@ -1,5 +1,6 @@
 from .bm_static import TarjanBackground
 from .flat_background import FlatBackground, TermRef
+from .shared_background import BackgroundHost
 from .implementation import TarjanBackgroundImplementation
 
 import os
@@ -11,7 +11,14 @@ from .implementation import TarjanBackgroundImplementation
 
 class TarjanBackground(LcArchive):
 
-    def __init__(self, source, save_after=False, **kwargs):
+    def __init__(self, source, save_after=False, shared=None, **kwargs):
+        """
+        :param source: the flat background file
+        :param save_after: [False] write the flat background to the source file once it is created
+        :param shared: [None] a BackgroundHost descriptor.  If given, attach to the hosted background instead of
+         loading the source file.
+        :param kwargs: passed to LcArchive
+        """
         self._save_after = save_after
         filetype = os.path.splitext(source)[1]
         if filetype not in SUPPORTED_FILETYPES:
@@ -24,7 +31,9 @@ class TarjanBackground(LcArchive):
 
         super(TarjanBackground, self).__init__(source, **kwargs)
 
-        if os.path.exists(source):  # flat background already stored
+        if shared is not None:
+            self._flat = FlatBackground.from_shared_memory(shared)
+        elif os.path.exists(source):  # flat background already stored
             self._flat = FlatBackground.from_file(source)
         else:
             self._flat = None
@@ -48,6 +57,16 @@ class TarjanBackground(LcArchive):
                 self.write_to_file()  # otherwise, the user / catalog must explicitly request it
         return self._flat
 
+    def host(self, name=None):
+        """
+        Place the flat background in shared memory for use by other processes
+        :param name: [None] name of the shared memory segment
+        :return: a BackgroundHost, whose descriptor can be supplied as shared= to TarjanBackgrounds elsewhere
+        """
+        if self._flat is None:
+            raise InterfaceError('Flat background has not been created')
+        return self._flat.host(name=name, ref=self.ref, source=self.source)
+
     def write_to_file(self, filename=None, gzip=False, complete=True, **kwargs):
         if filename is None:
             filename = self.source
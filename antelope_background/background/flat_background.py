@@ -12,7 +12,9 @@ import os
 from collections import namedtuple
 
 from ..engine import BackgroundEngine
+from .shared_background import BackgroundHost, attach_arrays
 from lcatools.interfaces import CONTEXT_STATUS_
+from lcatools import tracing
 from lcatools import from_json, to_json, comp_dir
 
 
@@ -254,6 +256,25 @@ class FlatBackground(object):
                    lci_db=lci_db,
                    quiet=quiet)
 
+    @classmethod
+    def from_shared_memory(cls, descriptor, quiet=True):
+        """
+        Attach to a background hosted in shared memory by a BackgroundHost, possibly in another process.  The
+        matrices are read-only views of the shared segment.
+        :param descriptor: BackgroundHost.descriptor
+        :param quiet:
+        :return:
+        """
+        shm, m, ix = attach_arrays(descriptor)
+        if m['A'] is None:
+            lci_db = None
+        else:
+            lci_db = (m['A'], m['B'])
+        fb = cls(ix['foreground'], ix['background'], ix['exterior'], m['Af'], m['Ad'], m['Bf'],
+                 lci_db=lci_db, quiet=quiet)
+        fb._shm = shm  # the matrices are only valid while the segment is mapped
+        return fb
+
     def __init__(self, foreground, background, exterior, af, ad, bf, lci_db=None, quiet=True):
         """
 
@@ -282,6 +303,7 @@ class FlatBackground(object):
             self._B = lci_db[1].tocsr()
 
         self._lu = None  # store LU decomposition
+        self._shm = None  # shared memory segment, if attached to a hosted background
 
         self._fg_index = {(k.term_ref, k.flow_ref): i for i, k in enumerate(self._fg)}
         self._bg_index = {(k.term_ref, k.flow_ref): i for i, k in enumerate(self._bg)}
@@ -482,6 +504,7 @@ class FlatBackground(object):
             for x in self._generate_em_defs(process, bf_tilde, self._ex):
                 yield x
 
+    @tracing.traced('background', 'FlatBackground.solve')
     def _compute_bg_lci(self, ad, solver=None, **kwargs):
         if solver == 'factorize':
             if self._lu is None:
@@ -493,6 +516,7 @@ class FlatBackground(object):
             bx = csr_matrix(self._lu(ad.toarray().flatten())).T
         return self._B.dot(bx)
 
+    @tracing.traced('background', 'FlatBackground.lci')
     def _compute_lci(self, process, ref_flow, **kwargs):
         if self.is_in_background(process, ref_flow):
             if not self._complete:
@@ -516,6 +540,19 @@ class FlatBackground(object):
                                         self._ex):
             yield x
 
+    @property
+    def is_shared(self):
+        return self._shm is not None
+
+    def host(self, name=None, **kwargs):
+        """
+        Place this background in shared memory, so that other processes can attach to it with from_shared_memory()
+        :param name: [None] name of the shared memory segment
+        :param kwargs: ref, source: recorded in the descriptor
+        :return: a BackgroundHost; close it when the workers are finished
+        """
+        return BackgroundHost(self, name=name, **kwargs)
+
     def _write_index(self, ix_filename):
         ix = {'foreground': [tuple(f) for f in self._fg],
               'background': [tuple(f) for f in self._bg],
@@ -0,0 +1,152 @@
+"""
+Serve a FlatBackground's matrices from POSIX shared memory, so that several worker processes can answer background
+queries from a single copy.
+
+A BackgroundHost copies the background's sparse matrices (Af, Ad, Bf and, if present, the LCI database A and B) and its
+term index into one shared memory segment.  Its descriptor-- a small JSON-serializable dict naming the segment and the
+layout of the arrays within it-- is passed to the workers, which call FlatBackground.from_shared_memory(descriptor)
+to attach to the segment.  The attached matrices are read-only views of the segment: no matrix data is copied.  Only
+the term index is unpacked into each worker, since the background needs it as Python objects.
+
+Matrices are stored in canonical CSR form (sorted indices, no duplicates), so that nothing in the attached background
+ever needs to write to them.
+
+The host owns the segment: it must stay open while workers are using it, and close() removes it.
+"""
+
+import json
+import threading
+from multiprocessing import shared_memory, resource_tracker
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+
+MATRICES = ('Af', 'Ad', 'Bf', 'A', 'B')
+
+_ALIGN = 64
+
+_attach_lock = threading.Lock()
+
+
+def _canonical_csr(m):
+    m = csr_matrix(m)
+    m.sum_duplicates()
+    m.sort_indices()
+    # rebuild so that the index dtype is the one scipy chooses for these contents-- this way, attaching in another
+    # process finds the dtype it would have chosen, and does not make a copy
+    return csr_matrix((m.data, m.indices, m.indptr), shape=m.shape)
+
+
+def _flat_matrices(flat):
+    return {'Af': flat._af, 'Ad': flat._ad, 'Bf': flat._bf, 'A': flat._A, 'B': flat._B}
+
+
+class BackgroundHost(object):
+    """
+    Holds a FlatBackground in shared memory.  Usable as a context manager.
+    """
+    def __init__(self, flat, name=None, ref=None, source=None):
+        """
+        :param flat: a FlatBackground
+        :param name: [None] name of the shared memory segment; default is chosen by the system
+        :param ref: [None] semantic reference of the background, recorded in the descriptor
+        :param source: [None] the background's file, recorded in the descriptor
+        """
+        arrays = []
+        shapes = dict()
+        for k, m in _flat_matrices(flat).items():
+            if m is None:
+                continue
+            m = _canonical_csr(m)
+            shapes[k] = list(m.shape)
+            for part in ('data', 'indices', 'indptr'):
+                arrays.append(('%s.%s' % (k, part), getattr(m, part)))
+        ix = {'foreground': [tuple(f) for f in flat.fg],
+              'background': [tuple(f) for f in flat.bg],
+              'exterior': [tuple(f) for f in flat.ex]}
+        arrays.append(('index', np.frombuffer(json.dumps(ix).encode('utf-8'), dtype=np.uint8)))
+
+        layout = []
+        offset = 0
+        for key, arr in arrays:
+            layout.append([key, arr.dtype.str, list(arr.shape), offset])
+            offset += -(-arr.nbytes // _ALIGN) * _ALIGN
+
+        self._shm = shared_memory.SharedMemory(name=name, create=True, size=max(offset, 1))
+        for (key, arr), (_, dtype, shape, off) in zip(arrays, layout):
+            np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=off)[...] = arr
+
+        self._descriptor = {'name': self._shm.name,
+                            'size': offset,
+                            'ref': ref,
+                            'source': source,
+                            'shapes': shapes,
+                            'arrays': layout}
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @property
+    def size(self):
+        return self._descriptor['size']
+
+    @property
+    def descriptor(self):
+        return dict(self._descriptor)
+
+    def close(self):
+        """
+        Release and remove the segment.  Workers already attached keep their mapping until they exit.
+        :return:
+        """
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def _attach_segment(name):
+    """
+    Attach to an existing segment without taking ownership of it.  Before Python 3.13, attaching registers the
+    segment with the resource tracker, which then removes it when the attaching process exits-- or, if the tracker is
+    shared with the host, loses track of the host's registration.  So registration is suppressed while attaching.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def attach_arrays(descriptor):
+    """
+    :param descriptor: from BackgroundHost.descriptor
+    :return: shm, matrices, index: the attached segment (keep a reference to it for as long as the matrices are in
+     use), a dict of read-only CSR matrices (None for those not hosted), and the term index
+    """
+    shm = _attach_segment(descriptor['name'])
+    arrays = dict()
+    for key, dtype, shape, offset in descriptor['arrays']:
+        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+        arr.flags.writeable = False
+        arrays[key] = arr
+    matrices = {k: None for k in MATRICES}
+    for k, shape in descriptor['shapes'].items():
+        matrices[k] = csr_matrix((arrays[k + '.data'], arrays[k + '.indices'], arrays[k + '.indptr']),
+                                 shape=tuple(shape), copy=False)
+    index = json.loads(arrays['index'].tobytes().decode('utf-8'))
+    return shm, matrices, index
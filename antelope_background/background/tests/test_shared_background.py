@@ -0,0 +1,62 @@
+import multiprocessing
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from scipy.sparse import random as sparse_random, csr_matrix
+
+from antelope_background.background import FlatBackground, TarjanBackground
+
+
+n_bg = 40
+n_ex = 15
+
+
+def _flat_background():
+    a = sparse_random(n_bg, n_bg, density=0.1, random_state=1, format='csr') * 0.1
+    b = sparse_random(n_ex, n_bg, density=0.3, random_state=2, format='csr')
+    bg = [('flow %d' % i, 'Output', 'process %d' % i, 0) for i in range(n_bg)]
+    ex = [('emission %d' % i, 'Output', 'air', 0) for i in range(n_ex)]
+    return FlatBackground([], bg, ex, csr_matrix((0, 0)), csr_matrix((n_bg, 0)), csr_matrix((n_ex, 0)),
+                          lci_db=(a, b))
+
+
+def _lci(fb, i):
+    return sorted((x.flow, x.value) for x in fb.lci('process %d' % i, 'flow %d' % i, quiet=True))
+
+
+def _attached_lci(descriptor, i):
+    return _lci(FlatBackground.from_shared_memory(descriptor), i)
+
+
+class SharedBackgroundTestCase(unittest.TestCase):
+    def setUp(self):
+        self.fb = _flat_background()
+        self.host = self.fb.host()
+
+    def tearDown(self):
+        self.host.close()
+
+    def test_attach(self):
+        fb = FlatBackground.from_shared_memory(self.host.descriptor)
+        self.assertTrue(fb.is_shared)
+        self.assertEqual(fb.ndim, n_bg)
+        self.assertFalse(fb._A.data.flags.writeable)  # a view of the segment, not a copy
+        self.assertFalse(fb._B.indices.flags.writeable)
+        for i in (0, 7, 23):
+            self.assertListEqual(_lci(fb, i), _lci(self.fb, i))
+
+    def test_tarjan_background(self):
+        tb = TarjanBackground('/no/such/background.mat', shared=self.host.descriptor)
+        self.assertTrue(tb._flat.is_shared)
+        self.assertListEqual(_lci(tb._flat, 3), _lci(self.fb, 3))
+
+    def test_worker_process(self):
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as ex:
+            self.assertListEqual(ex.submit(_attached_lci, self.host.descriptor, 5).result(), _lci(self.fb, 5))
+        # the worker has exited; the segment must still be there
+        fb = FlatBackground.from_shared_memory(self.host.descriptor)
+        self.assertListEqual(_lci(fb, 5), _lci(self.fb, 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,6 +23,9 @@ From the catalog_ref file, the catalog should meet the following spec:
 
 import os
 import re
+import threading
+import time
+from concurrent.futures import Future
 from shutil import copy2
 import requests
 import hashlib
@@ -32,10 +35,12 @@ from shutil import rmtree
 from lcatools.qdb import LciaEngine, REF_QTYS
 
 
-from lcatools.interfaces import local_ref, EntityNotFound, InventoryRequired
+from lcatools.interfaces import local_ref, EntityNotFound, InventoryRequired, UnknownOrigin
 from ..catalog_query import CatalogQuery, INTERFACE_TYPES
 from .lc_resolver import LcCatalogResolver
-from ..lc_resource import LcResource
+from .entity_index import EntityIndex
+from .index_jobs import IndexJobs, IndexJob
+from ..lc_resource import LcResource, load_state, _memory_in_use
 from lcatools.flowdb.compartments import REFERENCE_INT  # reference intermediate flows
 from ..data_sources.local import TEST_ROOT
 
@@ -68,6 +73,7 @@ class LcCatalog(LciaEngine):
     Private folders + files:
      LcCatalog._download_dir
      LcCatalog._index_dir
+     LcCatalog._factor_dir: compiled LCIA factors (see lcatools.qdb.factor_store)
      LcCatalog._index_file(src) returns a sha1 hash of the source filename in the [absolute] index dir
      LcCatalog._cache_dir
      LcCatalog._entity_cache: local entities file in root
@@ -148,6 +154,10 @@ class LcCatalog(LciaEngine):
     def archive_dir(self):
         return os.path.join(self._rootdir, 'archives')
 
+    @property
+    def _factor_dir(self):
+        return os.path.join(self._rootdir, 'factors')
+
     @property
     def _entity_cache(self):
         return os.path.join(self._rootdir, 'entity_cache.json')
@@ -178,7 +188,8 @@ class LcCatalog(LciaEngine):
 
     @property
     def _dirs(self):
-        for x in (self._cache_dir, self._index_dir, self.resource_dir, self.archive_dir, self._download_dir):
+        for x in (self._cache_dir, self._index_dir, self.resource_dir, self.archive_dir, self._download_dir,
+                  self._factor_dir):
             yield x
 
     def _make_rootdir(self):
@@ -198,16 +209,28 @@ class LcCatalog(LciaEngine):
     def load_tester(cls):
         return cls(TEST_ROOT)
 
-    def __init__(self, rootdir, **kwargs):
+    def __init__(self, rootdir, lazy=False, **kwargs):
         """
         Instantiates a catalog based on the resources provided in resource_dir
         :param rootdir: directory storing LcResource files.
-        :param kwargs: passed to Qdb
+        :param lazy: [False] defer the complete load of static resources until an interface other than 'basic' is
+         requested from them, or until preload() gets to them
+        :param kwargs: passed to LciaEngine and Qdb.  factor_dir= to share compiled LCIA factors among catalogs
         """
+        self._load_report = []
+        self._lazy = lazy
+        self._last_activity = time.monotonic()
+        self._preloader = None
+        self._index_jobs = None
+
+        t0, m0 = time.perf_counter(), _memory_in_use()
         self._rootdir = os.path.abspath(rootdir)
         self._make_rootdir()  # this will be a git clone / fork
         self._resolver = LcCatalogResolver(self.resource_dir)
-        super(LcCatalog, self).__init__(source=self._reference_qtys, compartments=self._compartments, **kwargs)
+        t0, m0 = self._record_phase('resolver', self._rootdir, t0, m0)
+        super(LcCatalog, self).__init__(source=self._reference_qtys, compartments=self._compartments,
+                                        factor_dir=kwargs.pop('factor_dir', self._factor_dir), **kwargs)
+        self._record_phase('qdb', self._reference_qtys, t0, m0)
         """
         _archives := source -> archive
         _names :=  ref:interface -> source
@@ -216,6 +239,7 @@ class LcCatalog(LciaEngine):
         self._nicknames = dict()  # keep a collection of shorthands for sources
 
         self._queries = dict()  # keep a collection of CatalogQuery instances for each origin
+        self._entity_index = EntityIndex()  # external_ref -> loaded static resources holding it
 
         self.add_existing_archive(self._qdb, interfaces=('index', 'quantity'), store=False)
 
@@ -308,6 +332,7 @@ class LcCatalog(LciaEngine):
         :return:
         """
         self._resolver.delete_resource(resource)
+        self._entity_index.remove(resource)
         abs_src = self.abs_path(resource.source)
 
         if delete_source is False or resource.source is None or not os.path.isfile(abs_src):
@@ -447,6 +472,106 @@ class LcCatalog(LciaEngine):
         res.check(self)
         res.make_cache(self.cache_file(self._localize_source(source)))
 
+    '''
+    Background index and cache jobs
+    '''
+    @property
+    def index_jobs(self):
+        """
+        The catalog's IndexJobs, created on first use.  index_jobs.wait() blocks until all jobs are finished and
+        registers the new indexes.
+        :return:
+        """
+        if self._index_jobs is None:
+            self._index_jobs = IndexJobs()
+        return self._index_jobs
+
+    def close(self, wait=True):
+        """
+        Shut down the worker processes that run index and cache jobs.  A new pool is started if more jobs are
+        submitted afterwards.
+        :param wait: [True] wait for running jobs to finish and register their results; if False, jobs not yet
+         started are cancelled
+        :return:
+        """
+        if self._index_jobs is not None:
+            if wait:
+                self._index_jobs.wait()
+            self._index_jobs.shutdown(wait=wait, cancel_futures=not wait)
+            self._index_jobs = None
+
+    def __del__(self):
+        jobs = getattr(self, '_index_jobs', None)
+        if jobs is not None:
+            jobs.shutdown(wait=False, cancel_futures=True)
+
+    def _job_spec(self, res, kind, target):
+        if res.source is None:
+            res.check(self)  # download first
+        d = res.serialize()
+        if res.source.startswith('$CAT_ROOT'):
+            d['dataSource'] = self.abs_path(res.source)
+        return {'kind': kind,
+                'ref': res.reference,
+                'resource': d,
+                'target': target,
+                'checkpoint': re.sub(r'\.json\.gz$', '.checkpoint.json.gz', target),
+                'status': target + '.status',
+                'cache': self.cache_file(res.source)}
+
+    def _register_index(self, source, ref, priority, stored):
+        """
+        Called on the catalog's thread when an index job finishes.  Resources already pointing at the index file are
+        unloaded so that they pick up the new contents.
+        """
+        inx_local = self._localize_source(self._index_file(source))
+        stale = list(self._resolver.resources_with_source(inx_local))
+        for res in stale:
+            res.remove_archive()
+        if stale:
+            for q in self._queries.values():
+                q.clear_routes()
+                q.invalidate()
+        self.new_resource(ref, inx_local, 'json', priority=priority, store=stored, interfaces='index',
+                          _internal=True, static=True)
+
+    def submit_index(self, origin, interface=None, source=None, priority=60, force=False):
+        """
+        Like index_ref(), but the source archive is loaded and indexed in a worker process.  The catalog stays usable
+        in the meantime, and the index resource is registered once the job is finished.  An interrupted job resumes
+        from its checkpoint when resubmitted.
+        :param origin:
+        :param interface: [None]
+        :param source: find_single_source input
+        :param priority: [60] priority setting for the new index
+        :param force: [False] if True, overwrite existing index
+        :return: an IndexJob whose result is the index's reference
+        """
+        res = self._resolver.get_resource(ref=origin, iface=interface, source=source, include_internal=False)
+        spec = self._job_spec(res, 'index', self._index_file(res.source))
+        source = res.source
+        priority = min([priority, res.priority])
+        stored = self._resolver.is_permanent(res)
+        if os.path.exists(spec['target']) and not force:
+            future = Future()
+            future.set_result(self._index_source(source, priority))
+            return IndexJob('index', source, spec['target'], future)
+        print('Indexing %s in the background' % source)
+        return self.index_jobs.submit('index', source, spec['target'], spec,
+                                      on_success=lambda ref: self._register_index(source, ref, priority, stored))
+
+    def submit_source_cache(self, source):
+        """
+        Creates a complete cache of the named source (as create_source_cache(source, static=True)) in a worker
+        process.  Entities already in the cache are kept.
+        :param source:
+        :return: an IndexJob whose result is the cache file
+        """
+        res = next(r for r in self._resolver.resources_with_source(source))
+        spec = self._job_spec(res, 'cache', self.cache_file(self._localize_source(source)))
+        print('Caching %s in the background' % source)
+        return self.index_jobs.submit('cache', source, spec['target'], spec)
+
     def _background_for_origin(self, ref):
         inx_ref = self.index_ref(ref, interface='inventory')
         bk_file = self._localize_source(os.path.join(self.archive_dir, '%s_background.mat' % inx_ref))
@@ -456,6 +581,56 @@ class LcCatalog(LciaEngine):
         self.add_resource(bk)
         return bk.make_interface('background')  # when the interface is returned, it will trigger setup_bm
 
+    def host_background(self, origin, name=None):
+        """
+        Place the flat background for an origin in shared memory, so that catalogs in worker processes can use it
+        through attach_background() instead of each loading their own copy.  The background must already have been
+        created.
+        :param origin:
+        :param name: [None] name of the shared memory segment
+        :return: a BackgroundHost.  Pass its descriptor to the workers, and close it when they are finished.
+        """
+        return self.get_archive(origin, interface='background').host(name=name)
+
+    def attach_background(self, descriptor, priority=10):
+        """
+        Add a session-only background resource that attaches to a background hosted in shared memory by another
+        process.  The matrices are shared read-only and not copied.
+        :param descriptor: BackgroundHost.descriptor
+        :param priority: [10] ahead of backgrounds loaded from file
+        :return: the resource
+        """
+        res = LcResource(descriptor['ref'], descriptor['source'], 'Background', interfaces='background',
+                         priority=priority, shared=descriptor, _internal=True)
+        self.add_resource(res, store=False)
+        res.check(self)
+        return res
+
+    def _factor_signature(self, ref):
+        """
+        The sources of the resources that supply the quantity's origin: local files with their modification times
+        and sizes, other sources (e.g. remote services) by name only.  Nothing is retrieved from the origin.
+        :param ref: quantity ref
+        :return: a string, or None if the origin is not known to the catalog
+        """
+        sig = []
+        try:
+            resources = list(self._resolver.resolve(ref.origin, 'quantity'))
+        except UnknownOrigin:
+            resources = []
+        for res in resources:
+            if res.source is None:
+                continue
+            path = self.abs_path(res.source)
+            if os.path.exists(path):
+                st = os.stat(path)
+                sig.append('%s:%d:%d' % (res.source, st.st_mtime_ns, st.st_size))
+            else:
+                sig.append(res.source)
+        if len(sig) == 0:
+            return super(LcCatalog, self)._factor_signature(ref)
+        return '|'.join(sorted(sig))
+
     '''# deprecated-- background stores itself now
     def create_static_archive(self, archive_file, origin, interface=None, source=None, background=True, priority=90):
         """
@@ -527,6 +702,15 @@ class LcCatalog(LciaEngine):
                           key=lambda x: (not (x.is_loaded and x.static), x.priority, x.reference != origin)):
             yield res
 
+    @property
+    def routing_version(self):
+        """
+        Changes whenever the set of resources changes, or a resource is loaded or unloaded (which changes the order
+        of _sorted_resources()); queries use it to invalidate memoized routes
+        :return:
+        """
+        return self._resolver.version, load_state()
+
     def gen_interfaces(self, origin, itype=None, strict=False):
         """
         Generator of interfaces by spec
@@ -539,9 +723,12 @@ class LcCatalog(LciaEngine):
         if itype is None:
             itype = 'basic'  # fetch, get properties, uuid, reference
 
+        self._last_activity = time.monotonic()
+        if self._index_jobs is not None:
+            self._index_jobs.collect()  # register any indexes finished in the background
         for res in self._sorted_resources(origin, itype, strict):
-            res.check(self)
-            yield res.make_interface(itype)
+            res.check(self, defer_load=self._lazy)
+            yield res.make_interface(itype, catalog=self)
 
         if itype == 'background':
             if origin.startswith('local') or origin.startswith('test'):
@@ -553,6 +740,90 @@ class LcCatalog(LciaEngine):
             yield self._qdb  # fallback to our own quantity db for Quantity Interface requests
             '''
 
+    """
+    Startup profile and background loading
+    """
+    def record_load(self, ref, source, stage, how, elapsed, memory):
+        """
+        Add an entry to the load report.  Called by resources as they are instantiated.
+        :param ref: semantic reference
+        :param source:
+        :param stage: 'instantiate', 'load_all', or a catalog startup phase
+        :param how: 'startup', 'foreground' (on demand) or 'preload'
+        :param elapsed: seconds
+        :param memory: bytes allocated, or None if unknown
+        :return:
+        """
+        self._load_report.append({'ref': ref, 'source': source, 'stage': stage, 'how': how,
+                                  'time': elapsed, 'memory': memory})
+
+    def _record_phase(self, stage, source, t0, m0):
+        t1, m1 = time.perf_counter(), _memory_in_use()
+        memory = None if m0 is None or m1 is None else m1 - m0
+        self.record_load('(catalog)', source, stage, 'startup', t1 - t0, memory)
+        return t1, m1
+
+    def startup_report(self, show=True):
+        """
+        Time and memory spent on catalog startup and on instantiating each resource, in the order they happened.
+        Memory figures are exact if tracemalloc is tracing; otherwise they are changes in resident set size.
+        :param show: [True] print a table
+        :return: list of dicts with keys 'ref', 'source', 'stage', 'how', 'time', 'memory'
+        """
+        report = list(self._load_report)
+        if show:
+            for e in report:
+                mem = '%9.1f MB' % (e['memory'] / 1048576) if e['memory'] is not None else '%12s' % '--'
+                print('%8.3f s %s %-10s %-11s %s' % (e['time'], mem, e['how'], e['stage'], e['ref']))
+            print('%8.3f s total' % sum(e['time'] for e in report))
+        return report
+
+    def _preload_candidates(self, origins=None):
+        if origins is None:
+            origins = [ref for ref, ints in self._resolver.references]
+        elif isinstance(origins, str):
+            origins = [origins]
+        seen = set()
+        cands = []
+        for org in origins:
+            for res in self._resolver.resolve(org, strict=False):
+                if id(res) in seen or not res.static:
+                    continue
+                if res.is_loaded and not res.load_pending:
+                    continue
+                seen.add(id(res))
+                cands.append(res)
+        return sorted(cands, key=lambda x: x.priority)
+
+    def _preload(self, resources, idle):
+        for res in resources:
+            while time.monotonic() - self._last_activity < idle:
+                time.sleep(idle / 4)
+            try:
+                res.check(self, how='preload')
+                res.complete_load(self, how='preload')
+            except Exception as e:
+                print('Preload of %s failed: %s' % (res.reference, e))
+
+    def preload(self, origins=None, idle=0.5, background=True):
+        """
+        Instantiate and fully load static resources in order of priority, so that later queries find them ready.
+        In the background, each resource waits until the catalog has gone `idle` seconds without a query; a query
+        for a resource that is being preloaded waits for it rather than loading it twice.
+        :param origins: [None] origins to preload; default is all known
+        :param idle: [0.5] seconds without a query before the next resource is loaded
+        :param background: [True] load in a daemon thread; if False, load now (ignoring idle)
+        :return: the thread, if background
+        """
+        resources = self._preload_candidates(origins)
+        if not background:
+            self._preload(resources, 0)
+            return None
+        self._preloader = threading.Thread(target=self._preload, args=(resources, idle), daemon=True,
+                                           name='catalog-preload')
+        self._preloader.start()
+        return self._preloader
+
     """
     public functions -- should these operate directly on a catalog ref instead? I think so but let's see about usage
     """
@@ -574,18 +845,71 @@ class LcCatalog(LciaEngine):
             self._queries[origin] = CatalogQuery(origin, catalog=self, **kwargs)
         return self._queries[origin]
 
+    def invalidate_queries(self, origin=None, external_ref=None):
+        """
+        Drop cached query results, e.g. after modifying an archive in place.
+        :param origin: [None] only for this origin's query; default all queries
+        :param external_ref: [None] only results concerning this external_ref; default all results
+        :return:
+        """
+        for org, q in self._queries.items():
+            if origin is None or org == origin:
+                q.invalidate(external_ref)
+
+    def _indexed_resources(self, origin):
+        """
+        Brings the entity index up to date for the resources matching an origin, as far as it can answer for them
+        :param origin:
+        :return: the resources, in the order gen_interfaces() would consult them
+        """
+        resources = list(self._sorted_resources(origin, None, False))
+        for res in resources:
+            if not self._entity_index.sync(res):
+                break  # the index can't answer past the first resource it doesn't cover
+        return resources
+
     def lookup(self, origin, external_ref):
         """
-        Attempts to secure an entity
+        Attempts to secure an entity.  Answered from the catalog's entity index when possible; otherwise each matching
+        resource is asked in turn.
         :param origin:
         :param external_ref:
         :return: The origin of the lowest-priority resource to match the query
         """
+        res = self._entity_index.lookup(external_ref, self._indexed_resources(origin))
+        if res is not None:
+            self._last_activity = time.monotonic()
+            return res.archive.ref
         for i in self.gen_interfaces(origin):
             if i.lookup(external_ref):
                 return i.origin
         raise EntityNotFound('%s/%s' % (origin, external_ref))
 
+    def lookup_links(self, links):
+        """
+        Resolve many links at once.  The entity index is brought up to date once per distinct origin, rather than
+        once per link.
+        :param links: iterable of 'origin/external_ref' strings
+        :return: dict of link: origin of the lowest-priority resource to match, or None if not found
+        """
+        by_origin = dict()
+        for link in links:
+            org, ext = link.split('/', maxsplit=1)
+            by_origin.setdefault(org, []).append((link, ext))
+        found = dict()
+        for org, exts in by_origin.items():
+            resources = self._indexed_resources(org)
+            for link, ext in exts:
+                res = self._entity_index.lookup(ext, resources)
+                if res is not None:
+                    found[link] = res.archive.ref
+                    continue
+                try:
+                    found[link] = self.lookup(org, ext)
+                except EntityNotFound:
+                    found[link] = None
+        return found
+
     def fetch(self, origin, external_ref):
         org = self.lookup(origin, external_ref)
         return self.query(org).get(external_ref)
@@ -594,6 +918,27 @@ class LcCatalog(LciaEngine):
         org, ext = link.split('/', maxsplit=1)
         return self.fetch(org, ext)
 
+    def fetch_links(self, links):
+        """
+        Fetch many links at once: resolve them with lookup_links(), then retrieve each from its resolved origin's
+        query.
+        :param links: iterable of 'origin/external_ref' strings
+        :return: dict of link: entity, or None if not found
+        """
+        entities = dict()
+        for link, org in self.lookup_links(links).items():
+            if org is None:
+                entities[link] = None
+            else:
+                entities[link] = self.query(org).get(link.split('/', maxsplit=1)[1])
+        return entities
+
+    def entity_index_stats(self):
+        """
+        :return: dict with 'resources' (number indexed) and 'refs' (number of distinct external_refs)
+        """
+        return {'resources': len(self._entity_index), 'refs': self._entity_index.size}
+
     def create_foreground(self, path, ref=None, quiet=True):
         """
         Creates or activates a foreground as a sub-folder within the catalog's root directory.  Returns a
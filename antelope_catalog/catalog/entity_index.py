@@ -0,0 +1,83 @@
+"""
+A catalog-wide index of the entities held by loaded static resources, for resolving external_refs without asking each
+resource's interface in turn.
+
+The index maps an entity's external_ref (as a string) to the resources whose archives contain it.  A resource is
+indexed when it is first seen loaded, and re-indexed whenever its archive has been replaced or its entity count has
+changed, so the index always agrees with the archives' contents.  Only fully loaded static resources are indexed:
+their contents are complete, and they are the resources the catalog consults first.  A static resource whose load was
+deferred (in a lazy catalog) is not indexed until its load is complete.  A lookup that the index can't answer
+falls back to the catalog's normal routing, which loads further resources-- and those are indexed at the next lookup.
+"""
+
+from collections import defaultdict
+
+
+class EntityIndex(object):
+    def __init__(self):
+        self._refs = defaultdict(set)  # str(external_ref): {id(resource), ...}
+        self._indexed = dict()  # id(resource): (resource, archive, entity count, [external_ref, ...])
+
+    def __len__(self):
+        return len(self._indexed)
+
+    @property
+    def size(self):
+        return len(self._refs)
+
+    @staticmethod
+    def indexable(res):
+        return res.static and res.is_loaded and not res.load_pending
+
+    def remove(self, res):
+        entry = self._indexed.pop(id(res), None)
+        if entry is None:
+            return
+        for ref in entry[3]:
+            found = self._refs[ref]
+            found.discard(id(res))
+            if not found:
+                self._refs.pop(ref)
+
+    def _add(self, res):
+        archive = res.archive
+        refs = [str(e.external_ref) for e in archive.entities()]
+        for ref in refs:
+            self._refs[ref].add(id(res))
+        self._indexed[id(res)] = (res, archive, archive.count_all(), refs)
+
+    def sync(self, res):
+        """
+        Bring one resource's entries up to date
+        :param res: an LcResource
+        :return: True if the resource is indexed
+        """
+        entry = self._indexed.get(id(res))
+        if not self.indexable(res):
+            if entry is not None:
+                self.remove(res)
+            return False
+        if entry is not None and entry[0] is res and entry[1] is res.archive and entry[2] == res.archive.count_all():
+            return True
+        self.remove(res)
+        self._add(res)
+        return True
+
+    def lookup(self, external_ref, resources):
+        """
+        Find the first of the given resources to contain the external_ref, in the order the catalog would consult
+        them.  The answer is only given if every resource the catalog would consult first is indexed; otherwise the
+        catalog must route the query itself.
+        :param external_ref:
+        :param resources: the resources matching the requested origin, in catalog order, already synced
+        :return: the resource, or None
+        """
+        found = self._refs.get(str(external_ref))
+        if not found:
+            return None
+        for res in resources:
+            if id(res) not in self._indexed:
+                return None
+            if id(res) in found:
+                return res
+        return None
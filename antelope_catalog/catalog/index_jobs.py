@@ -0,0 +1,212 @@
+"""
+Background jobs that build indexes and source caches in worker processes.
+
+Indexing a large source (e.g. ecoinvent from EcoSpold2) means a full load_all() of the source archive followed by
+index_archive(), which can take a very long time.  An IndexJobs instance runs this work in a process pool, so the
+catalog stays usable in the meantime.  Each job reports its progress to a small JSON status file next to its target.
+
+Jobs are resumable: once the source archive is fully loaded, the worker writes a checkpoint of it.  If the job is
+interrupted after that point, the next job for the same source starts from the checkpoint instead of loading the
+source again.  The checkpoint and status files are removed when the job succeeds.
+
+Finished index jobs are not registered with the catalog from the pool's thread; they are registered by the catalog on
+its own thread, each in a single step, the next time it generates interfaces or waits on a job.
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from lcatools.archives import LcArchive, update_archive, index_archive
+from lcatools.from_json import from_json, to_json
+
+from ..lc_resource import LcResource
+
+
+def _write_status(status_file, **kwargs):
+    tmp = status_file + '.part'
+    with open(tmp, 'w') as fp:
+        json.dump(kwargs, fp)
+    os.replace(tmp, status_file)
+
+
+def _write_checkpoint(archive, checkpoint):
+    j = archive._serialize_all()
+    j['loaded'] = True
+    tmp = checkpoint + '.part.gz'
+    to_json(j, tmp, gzip=True)
+    os.replace(tmp, checkpoint)
+
+
+def _load_checkpoint(checkpoint, ref):
+    """
+    The checkpoint is loaded into a plain LcArchive: provider archives can't necessarily be constructed from a JSON
+    file, and the index or cache only needs the entities.
+    """
+    j = from_json(checkpoint)
+    init_args = j.pop('initArgs', {})
+    ns_uuid = init_args.pop('ns_uuid', None)
+    archive = LcArchive(j['dataSource'], ref=ref, ns_uuid=ns_uuid, static=True, **init_args)
+    archive.load_from_dict(j)
+    return archive
+
+
+def run_job(spec):
+    """
+    Worker entry point.  Instantiates the resource described by the spec without a catalog, loads its archive
+    completely (from the checkpoint, if one exists) and writes the index or cache.
+    :param spec: dict with keys 'kind', 'ref', 'resource', 'target', 'checkpoint', 'status', 'cache'
+    :return: the index's reference (index jobs) or the cache file (cache jobs)
+    """
+    t0 = time.time()
+
+    def status(stage):
+        _write_status(spec['status'], kind=spec['kind'], ref=spec['ref'], stage=stage, pid=os.getpid(),
+                      elapsed=time.time() - t0)
+
+    if os.path.exists(spec['checkpoint']):
+        status('resuming')
+        archive = _load_checkpoint(spec['checkpoint'], spec['ref'])
+    else:
+        status('instantiating')
+        res = LcResource.from_dict(spec['ref'], dict(spec['resource']))
+        res.check(None)
+        archive = res.archive
+        if not archive.static and spec['cache'] is not None and os.path.exists(spec['cache']):
+            update_archive(archive, spec['cache'])
+        status('loading')
+        archive.load_all()
+        status('checkpoint')
+        _write_checkpoint(archive, spec['checkpoint'])
+
+    if spec['kind'] == 'index':
+        status('indexing')
+        result = index_archive(archive, spec['target'], force=True).ref
+    else:
+        status('caching')
+        archive.write_to_file(spec['target'], gzip=True, complete=True)
+        result = spec['target']
+
+    os.remove(spec['checkpoint'])
+    os.remove(spec['status'])
+    return result
+
+
+class IndexJob(object):
+    """
+    A handle on one background job.
+    """
+    def __init__(self, kind, source, target, future, status_file=None):
+        self.kind = kind
+        self.source = source
+        self.target = target
+        self._future = future
+        self._status_file = status_file
+        self._submitted = time.time()
+
+    @property
+    def progress(self):
+        """
+        :return: dict with at least 'stage' and 'elapsed' (seconds)
+        """
+        if self._future.done():
+            if self._future.exception() is not None:
+                return {'stage': 'failed', 'error': repr(self._future.exception()),
+                        'elapsed': time.time() - self._submitted}
+            return {'stage': 'done', 'elapsed': time.time() - self._submitted}
+        if self._status_file is not None:
+            try:
+                with open(self._status_file) as fp:
+                    return json.load(fp)
+            except (OSError, ValueError):
+                pass
+        return {'stage': 'queued', 'elapsed': time.time() - self._submitted}
+
+    @property
+    def stage(self):
+        return self.progress['stage']
+
+    def done(self):
+        return self._future.done()
+
+    def result(self, timeout=None):
+        return self._future.result(timeout=timeout)
+
+    def __repr__(self):
+        return '%s(%s: %s [%s])' % (self.__class__.__name__, self.kind, self.source, self.stage)
+
+
+class IndexJobs(object):
+    """
+    Runs index and cache jobs for a catalog in a process pool.  Worker processes are started with 'spawn', so they
+    share no state (or threads) with the catalog.
+    """
+    def __init__(self, max_workers=None):
+        self._executor = ProcessPoolExecutor(max_workers=max_workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        self._jobs = []
+        self._uncollected = []  # (job, callback) awaiting registration on the catalog's thread
+
+    @property
+    def jobs(self):
+        return list(self._jobs)
+
+    def pending(self):
+        return [j for j in self._jobs if not j.done()]
+
+    def submit(self, kind, source, target, spec, on_success=None):
+        """
+        :param kind: 'index' or 'cache'
+        :param source: the source being indexed or cached
+        :param target: the file being written
+        :param spec: passed to run_job
+        :param on_success: [None] called as on_success(result) on the catalog's thread, by collect()
+        :return: an IndexJob
+        """
+        future = self._executor.submit(run_job, spec)
+        job = IndexJob(kind, source, target, future, status_file=spec['status'])
+        self._jobs.append(job)
+        if on_success is not None:
+            self._uncollected.append((job, on_success))
+        return job
+
+    def collect(self):
+        """
+        Run the callbacks of successfully finished jobs.  Must be called from the catalog's own thread.
+        :return: list of jobs collected
+        """
+        collected, waiting = [], []
+        for k in self._uncollected:
+            if k[0].done():
+                collected.append(k)
+            else:
+                waiting.append(k)
+        self._uncollected = waiting
+        for job, callback in collected:
+            if job._future.exception() is None:
+                callback(job.result())
+        return [job for job, callback in collected]
+
+    def wait(self, timeout=None):
+        """
+        Wait for all submitted jobs to finish, then collect them
+        :param timeout:
+        :return: list of jobs collected
+        """
+        for job in self.pending():
+            try:
+                job.result(timeout=timeout)
+            except Exception as e:
+                print('%s failed: %s' % (job, e))
+        return self.collect()
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        """
+        Stop the worker processes
+        :param wait: [True] block until running jobs are finished
+        :param cancel_futures: [False] cancel jobs that have not started
+        :return:
+        """
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
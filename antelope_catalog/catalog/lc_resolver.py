@@ -1,9 +1,9 @@
 import json
 import os
-from collections import defaultdict
 
 from lcatools.interfaces import UnknownOrigin
 from ..lc_resource import LcResource
+from .origin_trie import OriginTrie
 
 
 class LcCatalogResolver(object):
@@ -22,9 +22,20 @@ class LcCatalogResolver(object):
         self._resource_dir = resource_dir
         if not os.path.exists(resource_dir):
             os.makedirs(resource_dir)
-        self._resources = defaultdict(list)
+        self._resources = dict()  # ref: list of resources
+        self._trie = OriginTrie()  # answers resolve()
+        self._version = 0
         self.index_resources()
 
+    @property
+    def version(self):
+        """
+        Incremented whenever resources are added or removed, so that clients can tell when routes they have
+        memoized may be out of date
+        :return:
+        """
+        return self._version
+
     @property
     def references(self):
         """
@@ -56,6 +67,8 @@ class LcCatalogResolver(object):
             # os.remove(path)
             return
         self._resources[ref] = resources
+        self._trie.replace(ref, resources)
+        self._version += 1
 
     def index_resources(self):
         for res in os.listdir(self._resource_dir):
@@ -74,11 +87,13 @@ class LcCatalogResolver(object):
             return
         if store:
             resource.write_to_file(self._resource_dir)
-        self._resources[resource.reference].append(resource)
+        self._resources.setdefault(resource.reference, []).append(resource)
+        self._trie.add(resource.reference, resource)
+        self._version += 1
 
     def has_resource(self, resource):
         s = resource.serialize()
-        return any(k.matches(s) for k in self._resources[resource.reference])
+        return any(k.matches(s) for k in self._resources.get(resource.reference, []))
 
     def new_resource(self, ref, source, ds_type, store=True, **kwargs):
         new_res = LcResource(ref, source, ds_type, **kwargs)
@@ -87,10 +102,12 @@ class LcCatalogResolver(object):
 
     def delete_resource(self, resource):
         ref = resource.reference
-        res = self._resources[ref]
+        res = self._resources.get(ref, [])
         if resource not in res:
             raise KeyError('Resource not found by resolver (ref: %s)' % ref)
         res.remove(resource)
+        self._trie.remove(ref, resource)
+        self._version += 1
         self._write_or_delete_resource_file(ref, res)
         if len(res) == 0:
             self._resources.pop(ref)
@@ -116,24 +133,17 @@ class LcCatalogResolver(object):
         Fuzzy resolver returns all references that match the request and have equal or greater specificity.
         'uslci.clean' will match queries for 'uslci' but not for 'uslci.original' or 'uslci.clean.allocated'.
         However, 'uslci.clean.allocated' will match a query for 'uslci.clean'
+
+        Resources are looked up in a trie of dotted origins, and yielded in order of priority.
         :param req:
         :param interfaces: could be a single interface specification or a list
         :param strict: [False] if true, only yields interface for which req matches ref
         :return:
         """
-        terms = req.split('.')
-        origin_found = False
-        for ref, res_list in self._resources.items():
-            if strict:
-                if ref != req:
-                    continue
-            if ref.split('.')[:len(terms)] == terms:
-                origin_found = True
-                for res in res_list:
-                    if res.satisfies(interfaces):
-                        yield res
-        if not origin_found:
+        if not self._trie.known(req, strict=strict):
             raise UnknownOrigin(req)
+        for res in self._trie.resolve(req, interfaces, strict=strict):
+            yield res
 
     def get_resource(self, ref=None, iface=None, source=None, strict=True, include_internal=True):
         """
@@ -152,9 +162,11 @@ class LcCatalogResolver(object):
         else:
             _gen = self.resolve(ref, interfaces=iface, strict=strict)
         if include_internal:
-            matches = sorted([r for r in _gen], key=lambda x: x.priority)
+            matches = [r for r in _gen]
         else:
-            matches = sorted([r for r in _gen if not r.internal], key=lambda x: x.priority)
+            matches = [r for r in _gen if not r.internal]
+        if source is not None:
+            matches.sort(key=lambda x: x.priority)  # resolve() already yields in priority order
         if len(matches) > 1:
             if strict:
                 for k in matches:
@@ -0,0 +1,182 @@
+"""
+A trie of dotted origins, for resolving semantic references without scanning every registered resource.
+
+Each node corresponds to one dotted term: the resources registered under 'uslci.clean' sit at the node reached by
+'uslci' then 'clean'.  A node knows the interfaces offered anywhere in its subtree (as a bitset), and keeps the
+subtree's resources in priority order, computed on demand and discarded along the path whenever a resource below it is
+added or removed.  Among resources of equal priority, those added first come first.
+"""
+
+
+class _OriginNode(object):
+    __slots__ = ('children', 'resources', 'mask', 'subtree_mask', '_sorted')
+
+    def __init__(self):
+        self.children = dict()  # term: _OriginNode
+        self.resources = []  # (priority, seq, mask, resource) registered at exactly this origin, sorted
+        self.mask = 0  # interfaces offered at this origin
+        self.subtree_mask = 0  # interfaces offered at this origin or below
+        self._sorted = None
+
+    def _update(self):
+        self.mask = 0
+        for entry in self.resources:
+            self.mask |= entry[2]
+        self.subtree_mask = self.mask
+        for child in self.children.values():
+            self.subtree_mask |= child.subtree_mask
+        self._sorted = None
+
+    def is_empty(self):
+        return len(self.resources) == 0 and len(self.children) == 0
+
+    def subtree(self):
+        """
+        :return: entries for every resource at or below this node, sorted
+        """
+        if self._sorted is None:
+            entries = list(self.resources)
+            for child in self.children.values():
+                entries.extend(child.subtree())
+            entries.sort(key=lambda x: (x[0], x[1]))
+            self._sorted = entries
+        return self._sorted
+
+
+class OriginTrie(object):
+    """
+    Maps dotted origins to LcResources.  All matching is on whole terms: 'uslci.clean' matches requests for 'uslci'
+    and 'uslci.clean', but not 'uslci.cl' or 'uslci.clean.allocated'.
+    """
+    def __init__(self):
+        self._root = _OriginNode()
+        self._bits = dict()  # interface name: bit
+        self._seq = 0
+
+    def _bit(self, iface):
+        if iface not in self._bits:
+            self._bits[iface] = 1 << len(self._bits)
+        return self._bits[iface]
+
+    def _resource_mask(self, resource):
+        mask = 0
+        for i in resource.interfaces:
+            mask |= self._bit(i)
+        return mask
+
+    def _request_mask(self, interfaces):
+        """
+        :param interfaces: as for LcResource.satisfies
+        :return: a bitset, or None if every resource satisfies the request
+        """
+        if interfaces is None:
+            return None
+        if isinstance(interfaces, str):
+            interfaces = [interfaces]
+        mask = 0
+        for i in interfaces:
+            if i == 'basic':
+                return None
+            mask |= self._bits.get(i, 0)
+        return mask
+
+    def _path(self, origin, create=False):
+        """
+        :param origin:
+        :param create: add missing nodes
+        :return: list of nodes from the root to the origin's node, or None if there is no such node
+        """
+        node = self._root
+        path = [node]
+        for term in origin.split('.'):
+            child = node.children.get(term)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[term] = _OriginNode()
+            node = child
+            path.append(node)
+        return path
+
+    @staticmethod
+    def _refresh(path):
+        for node in reversed(path):
+            node._update()
+
+    def add(self, origin, resource):
+        path = self._path(origin, create=True)
+        entry = (resource.priority, self._seq, self._resource_mask(resource), resource)
+        self._seq += 1
+        node = path[-1]
+        node.resources.append(entry)
+        node.resources.sort(key=lambda x: (x[0], x[1]))
+        self._refresh(path)
+
+    def remove(self, origin, resource):
+        path = self._path(origin)
+        if path is None:
+            return
+        node = path[-1]
+        node.resources = [e for e in node.resources if e[3] is not resource]
+        # prune nodes left empty
+        terms = origin.split('.')
+        for i in range(len(terms), 0, -1):
+            if path[i].is_empty():
+                path[i - 1].children.pop(terms[i - 1])
+                path.pop()
+            else:
+                break
+        self._refresh(path)
+
+    def replace(self, origin, resources):
+        """
+        Set the resources registered at an origin, discarding any already there
+        :param origin:
+        :param resources:
+        :return:
+        """
+        path = self._path(origin)
+        if path is not None:
+            for entry in list(path[-1].resources):
+                self.remove(origin, entry[3])
+        for res in resources:
+            self.add(origin, res)
+
+    def known(self, origin, strict=False):
+        """
+        :param origin:
+        :param strict: if True, only resources registered at exactly this origin count
+        :return: whether any resource matches the origin
+        """
+        path = self._path(origin)
+        if path is None:
+            return False
+        node = path[-1]
+        if strict:
+            return len(node.resources) > 0
+        return not node.is_empty()
+
+    def resolve(self, origin, interfaces=None, strict=False):
+        """
+        :param origin:
+        :param interfaces: as for LcResource.satisfies
+        :param strict: if True, only resources registered at exactly this origin; otherwise also those registered
+         at more specific origins
+        :return: list of matching resources, in priority order
+        """
+        path = self._path(origin)
+        if path is None:
+            return []
+        node = path[-1]
+        mask = self._request_mask(interfaces)
+        if strict:
+            if mask is not None and not node.mask & mask:
+                return []
+            entries = node.resources
+        else:
+            if mask is not None and not node.subtree_mask & mask:
+                return []
+            entries = node.subtree()
+        if mask is None:
+            return [e[3] for e in entries]
+        return [e[3] for e in entries if e[2] & mask]
@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+from shutil import rmtree
+
+from lcatools import tracing
+from lcatools.archives import LcArchive
+from lcatools.archives.tests import basic_archive_src
+from lcatools.entities import LcProcess
+from lcatools.interfaces import EntityNotFound
+
+from .. import LcCatalog
+from ...lc_resource import LcResource
+from ...catalog_query import CatalogQuery, READONLY_INTERFACE_TYPES
+
+
+process_ref = 'Reforesting, average state or private moist cold softwood forest, INW'
+
+
+class CatalogQueryRoutingTest(unittest.TestCase):
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self.cat = LcCatalog(self._root)
+        res = LcResource('test.basic', basic_archive_src, 'json', interfaces=READONLY_INTERFACE_TYPES)
+        self.cat.add_resource(res, store=False)
+        res.check(self.cat)  # loading a resource discards the routes, so start with it loaded
+        self.q = self.cat.query('test.basic')
+        self.rq = CatalogQuery('test.basic', catalog=self.cat, cache_size=0)  # every query is routed
+
+    def tearDown(self):
+        rmtree(self._root)
+
+    def test_route_memo(self):
+        self.assertEqual(self.rq.get_item(process_ref, 'SpatialScope'), 'RNA')
+        self.assertEqual(self.rq.rerouted, 1)
+        for i in range(5):
+            self.rq.get_item(process_ref, 'SpatialScope')
+        self.assertEqual(self.rq.routed, 5)
+        self.assertEqual(self.rq.rerouted, 1)
+        stats = self.rq.routing_stats()
+        self.assertEqual(stats['routes'], 1)
+        self.assertGreater(stats['answer_time'], 0)
+
+    def test_missing_falls_through(self):
+        self.rq.get(process_ref)
+        routed, rerouted = self.rq.routed, self.rq.rerouted
+        with self.assertRaises(EntityNotFound):
+            self.rq.get('no such process')  # the memoized route fails, so the query is routed in full
+        self.assertEqual(self.rq.routed, routed)
+        self.assertEqual(self.rq.rerouted, rerouted + 1)
+
+    def test_priority(self):
+        ar = LcArchive(None, ref='test.basic')
+        ar.add(LcProcess(ar._key_to_id('ha'), external_ref='ha', Name='Shadows the lower-priority quantity'))
+        src = os.path.join(self._root, 'high.json')
+        ar.write_to_file(src, complete=True)
+        high = self.cat.new_resource('test.basic', src, 'json', interfaces=READONLY_INTERFACE_TYPES, priority=10,
+                                     store=False)
+        high.check(self.cat)
+        self.assertEqual(self.rq.get(process_ref).entity_type, 'process')  # answered by the lower priority
+        self.assertNotIn(self.rq._route_key(None, 'get', False), self.rq._routes)
+        self.assertEqual(self.rq.get('ha').entity_type, 'process')  # not the lower priority's quantity
+
+    def test_load_order(self):
+        ar = LcArchive(None, ref='test.basic')
+        ar.add(LcProcess(ar._key_to_id('ha'), external_ref='ha', Name='Shadows the lower-priority quantity'))
+        src = os.path.join(self._root, 'high.json')
+        ar.write_to_file(src, complete=True)
+        high = self.cat.new_resource('test.basic', src, 'json', interfaces=READONLY_INTERFACE_TYPES, priority=10,
+                                     store=False)
+        self.assertEqual(self.rq.get(process_ref).entity_type, 'process')
+        self.assertIn(self.rq._route_key(None, 'get', False), self.rq._routes)  # the loaded resource comes first
+        high.check(self.cat)  # now the higher priority is loaded, and comes first
+        self.assertEqual(self.rq.get('ha').entity_type, 'process')
+
+    def test_invalidate(self):
+        self.rq.get_item(process_ref, 'SpatialScope')
+        self.cat.new_resource('test.other', basic_archive_src, 'json', interfaces='index', store=False)
+        self.rq.get_item(process_ref, 'SpatialScope')
+        self.assertEqual(self.rq.rerouted, 2)
+        self.rq.get_item(process_ref, 'SpatialScope')
+        self.assertEqual(self.rq.routed, 1)
+
+    def test_entity_cache(self):
+        p = self.q.get(process_ref)
+        self.assertIs(self.q.get(process_ref), p)
+        self.q.get_item(process_ref, 'SpatialScope')
+        answered = self.q.routed + self.q.rerouted
+        self.assertEqual(self.q.get_item(process_ref, 'SpatialScope'), 'RNA')
+        self.assertEqual(len(self.q.get_reference(process_ref)), len(self.q.get_reference(process_ref)))
+        self.assertEqual(self.q.routed + self.q.rerouted, answered + 1)  # only the first get_reference
+        stats = self.q.cache_stats()
+        self.assertEqual(stats['hits'], 3)
+
+    def test_cache_bound(self):
+        q = self.cat.query('test.basic', refresh=True, cache_size=1)
+        q.get_item(process_ref, 'SpatialScope')
+        q.get_item(process_ref, 'Name')
+        self.assertEqual(q.cache_stats()['size'], 1)
+        self.assertEqual(q.cache_stats()['evictions'], 1)
+
+    def test_invalidate_cache(self):
+        self.q.get_item(process_ref, 'SpatialScope')
+        self.cat.invalidate_queries('test.basic', process_ref)
+        self.assertEqual(self.q.cache_stats()['size'], 0)
+        self.q.get_item(process_ref, 'SpatialScope')
+        self.cat.new_resource('test.other', basic_archive_src, 'json', interfaces='index', store=False)
+        self.q.get_item(process_ref, 'SpatialScope')
+        self.assertEqual(self.q.cache_stats()['hits'], 0)
+
+    def test_tracing(self):
+        tracing.reset()
+        tracing.enable()
+        try:
+            self.q.get_item(process_ref, 'SpatialScope')
+            self.q.get_item(process_ref, 'SpatialScope')
+        finally:
+            tracing.disable()
+        rows = {(r['category'], r['name']): r for r in tracing.flat_profile() if r['origin'] == 'test.basic'}
+        tracing.reset()
+        self.assertEqual(rows['query', 'get_item']['calls'], 1)
+        self.assertEqual(rows['interface', 'BasicImplementation.get_item']['calls'], 1)
+        self.assertEqual((rows['query', 'cache']['hits'], rows['query', 'cache']['misses']), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import tempfile
+import threading
+import time
+import unittest
+from shutil import rmtree
+from unittest.mock import patch
+
+from lcatools.archives import LcArchive
+from lcatools.archives.tests import basic_archive_src
+
+from .. import LcCatalog
+from ...lc_resource import LcResource
+from ...catalog_query import READONLY_INTERFACE_TYPES
+
+
+process_ref = 'Reforesting, average state or private moist cold softwood forest, INW'
+
+
+class CatalogStartupTest(unittest.TestCase):
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self.cat = LcCatalog(self._root, lazy=True)
+        self.res = LcResource('test.basic', basic_archive_src, 'json', interfaces=READONLY_INTERFACE_TYPES,
+                              static=True)
+        self.cat.add_resource(self.res, store=False)
+
+    def tearDown(self):
+        rmtree(self._root)
+
+    def _loads(self, how):
+        return [e for e in self.cat.startup_report(show=False) if e['ref'] == 'test.basic' and e['how'] == how]
+
+    def test_startup_phases(self):
+        stages = [e['stage'] for e in self.cat.startup_report(show=False) if e['how'] == 'startup']
+        self.assertListEqual(stages, ['resolver', 'qdb'])
+
+    def test_on_demand(self):
+        self.assertFalse(self.res.is_loaded)
+        self.assertEqual(self.cat.query('test.basic').get_item(process_ref, 'SpatialScope'), 'RNA')
+        loads = self._loads('foreground')
+        self.assertEqual(len(loads), 1)
+        self.assertEqual(loads[0]['stage'], 'instantiate')
+        self.assertGreater(loads[0]['time'], 0)
+
+    def test_preload(self):
+        self.cat.preload(idle=0.05).join(5)
+        self.assertTrue(self.res.is_loaded)
+        self.assertEqual(len(self._loads('preload')), 1)
+        self.cat.query('test.basic').get(process_ref)
+        self.assertEqual(len(self._loads('foreground')), 0)
+
+    def test_query_during_preload(self):
+        self.res.check(self.cat, defer_load=True)
+        self.res._load_pending = True  # as for a non-json static source
+        archive = self.res.archive
+        entered, order = threading.Event(), []
+        load_all = archive.load_all
+
+        def slow_load_all(**kwargs):
+            entered.set()
+            time.sleep(0.1)
+            order.append('load_all')
+            load_all(**kwargs)
+
+        archive.load_all = slow_load_all
+        iface = self.res.make_interface('basic')
+        preload = threading.Thread(target=self.res.complete_load, args=(self.cat, 'preload'))
+        preload.start()
+        entered.wait(5)
+        self.assertEqual(iface.get(process_ref).external_ref, process_ref)  # waits for load_all
+        order.append('get')
+        preload.join(5)
+        self.assertListEqual(order, ['load_all', 'get'])
+        self.assertFalse(self.res.load_pending)
+
+    def test_deferred_config(self):
+        # an archive built directly from the source is keyed by uuid
+        p_uuid, f_uuid = '78c8b1e5-ca60-38b6-9a94-dde046560a38', '9cc0ccce-8e33-35ca-a3c0-c7bb6c397e95'
+        res = LcResource('test.basic', basic_archive_src, 'LcArchive', interfaces='basic',
+                         config={'set_reference': [[p_uuid, f_uuid, 'Input']]})
+
+        def static_archive(source, ds_type, ref=None, **kwargs):
+            return LcArchive(source, ref=ref, static=True)  # as for a non-json static source
+
+        with patch('antelope_catalog.lc_resource.create_archive', static_archive):
+            res.check(self.cat, defer_load=True)
+        self.assertTrue(res.load_pending)
+        res.complete_load(self.cat)
+        rx = [(x.flow.external_ref, x.direction) for x in res.archive[p_uuid].reference_entity]
+        self.assertIn((f_uuid, 'Input'), rx)
+
+    def test_preload_now(self):
+        self.assertIsNone(self.cat.preload('test', background=False))
+        self.assertTrue(self.res.is_loaded)
+        self.assertEqual(self.cat.preload(background=False), None)  # nothing left to do
+        self.assertEqual(len(self._loads('preload')), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
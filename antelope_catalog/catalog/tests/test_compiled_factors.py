@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+from shutil import copy2, rmtree
+
+from lcatools.characterizations import Characterization
+from lcatools.entities import LcFlow
+from lcatools.from_json import to_json
+from lcatools.qdb import IPCC_2007_GWP
+from lcatools.qdb.lcia_engine import LciaEngine
+
+from .. import LcCatalog
+from ...lc_resource import LcResource
+
+
+class CompiledFactorsTest(unittest.TestCase):
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        rmtree(self._root)
+
+    def _catalog(self, source=IPCC_2007_GWP):
+        cat = LcCatalog(self._root)
+        cat.add_resource(LcResource('test.ipcc', source, 'json', interfaces=('index', 'quantity')),
+                         store=False)
+        return cat, cat.query('test.ipcc').get('Global Warming Air')
+
+    def test_compiled_matches_origin(self):
+        cat, gwp = self._catalog()
+        cat.load_lcia_factors(gwp)
+        slow = cat.qdb.factor_table(gwp)
+        self.assertGreater(len(slow), 0)
+        self.assertTrue(cat._factor_store.known(gwp.link))
+
+        cat, gwp = self._catalog()
+        record = cat._factor_store.load(gwp.link, cat._factor_signature(gwp))
+        self.assertTrue(cat.qdb.add_compiled_factors(gwp, record))
+        self.assertListEqual(cat.qdb.factor_table(gwp), slow)
+        self.assertTrue(cat.verify_lcia_factors(gwp))
+
+    def test_warm_load_skips_origin(self):
+        cat, gwp = self._catalog()
+        cat.load_lcia_factors(gwp)
+        slow = cat.qdb.factor_table(gwp)
+
+        def _fail(*args, **kwargs):
+            raise AssertionError('origin was consulted')
+
+        cat, gwp = self._catalog()
+        gwp.factors = gwp.flowables = _fail
+        cat.load_lcia_factors(gwp)
+        self.assertListEqual(cat.qdb.factor_table(gwp), slow)
+
+        # nor does an engine that knows nothing of the quantity's source
+        factor_dir = os.path.join(self._root, 'engine')
+        cat, gwp = self._catalog()
+        LciaEngine(factor_dir=factor_dir).load_lcia_factors(gwp)
+        gwp.factors = gwp.flowables = _fail
+        engine = LciaEngine(factor_dir=factor_dir)
+        engine.load_lcia_factors(gwp)
+        self.assertListEqual(engine.qdb.factor_table(gwp), slow)
+
+    def test_corrupt_record_discarded(self):
+        cat, gwp = self._catalog()
+        cat.load_lcia_factors(gwp)
+        fname = cat._factor_store._file(gwp.link)
+        record = cat._factor_store.load(gwp.link, cat._factor_signature(gwp))
+        content_hash = cat._factor_store.content_hash(record)
+        record['flows'][0][8] = {'GLO': -1.0}
+        to_json({'link': gwp.link, 'signature': cat._factor_signature(gwp), 'hash': content_hash, 'record': record},
+                fname, gzip=True)
+        self.assertIsNone(cat._factor_store.load(gwp.link, cat._factor_signature(gwp)))
+
+        cat, gwp = self._catalog()
+        cat.load_lcia_factors(gwp)  # falls back to the origin and recompiles
+        self.assertIsNotNone(cat._factor_store.load(gwp.link, cat._factor_signature(gwp)))
+        self.assertTrue(os.path.exists(fname))
+
+    def test_source_changed(self):
+        source = os.path.join(self._root, os.path.basename(IPCC_2007_GWP))
+        copy2(IPCC_2007_GWP, source)
+        cat, gwp = self._catalog(source)
+        cat.load_lcia_factors(gwp)
+        signature = cat._factor_signature(gwp)
+        self.assertIsNotNone(cat._factor_store.load(gwp.link, signature))
+
+        st = os.stat(source)
+        os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        cat, gwp = self._catalog(source)
+        self.assertNotEqual(cat._factor_signature(gwp), signature)
+        self.assertIsNone(cat.verify_lcia_factors(gwp))  # the compiled factors are stale
+        cat.load_lcia_factors(gwp)
+        self.assertTrue(cat.verify_lcia_factors(gwp))
+
+    def test_origin_factors_only(self):
+        cat, gwp = self._catalog()
+        cf = next(gwp.factors())
+        flow = LcFlow.new('Annotated gas', cf.flow.reference_entity, Compartment=cf.flow['Compartment'])
+        annotation = Characterization(flow, cf.quantity)
+        annotation.add_value(value=42.0, location='GLO')
+        cat.qdb.add_cf(annotation)  # not one of the origin's factors
+        cat.load_lcia_factors(gwp)
+        record = cat._factor_store.load(gwp.link, cat._factor_signature(gwp))
+        self.assertNotIn('Annotated gas', [f[3] for f in record['flows']])
+        self.assertIn('Annotated gas', [f[3] for f in cat.qdb.compile_factors(gwp)['flows']])
+        self.assertTrue(cat.verify_lcia_factors(gwp))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import tempfile
+import unittest
+from shutil import rmtree
+
+from lcatools.archives.tests import basic_archive_src
+from lcatools.interfaces import EntityNotFound
+
+from .. import LcCatalog
+from ...lc_resource import LcResource
+from ...catalog_query import READONLY_INTERFACE_TYPES
+
+
+process_ref = 'Reforesting, average state or private moist cold softwood forest, INW'
+
+
+class EntityIndexTest(unittest.TestCase):
+    def setUp(self):
+        self._root = tempfile.mkdtemp()
+        self.cat = LcCatalog(self._root)
+        self.res = LcResource('test.basic', basic_archive_src, 'json', interfaces=READONLY_INTERFACE_TYPES,
+                              static=True)
+        self.cat.add_resource(self.res, store=False)
+
+    def tearDown(self):
+        rmtree(self._root)
+
+    def _routed(self, origin, external_ref):
+        for i in self.cat.gen_interfaces(origin):
+            if i.lookup(external_ref):
+                return i.origin
+
+    def test_lookup_indexed(self):
+        self.assertEqual(self.cat.lookup('test', process_ref), 'test.basic')  # loads the resource
+        self.assertEqual(self.cat.entity_index_stats()['resources'], 0)
+        self.assertEqual(self.cat.lookup('test', process_ref), 'test.basic')
+        self.assertEqual(self.cat.entity_index_stats()['resources'], 1)
+        self.assertEqual(self.cat.lookup('test', process_ref), self._routed('test', process_ref))
+        with self.assertRaises(EntityNotFound):
+            self.cat.lookup('test', 'no such process')
+
+    def test_order(self):
+        self.cat.lookup('test', process_ref)
+        other = LcResource('test.other', basic_archive_src, 'json', interfaces='index', static=True, priority=10)
+        self.cat.add_resource(other)
+        other.check(self.cat)
+        self.assertEqual(self.cat.lookup('test', process_ref), 'test.other')
+        self.assertEqual(self.cat.lookup('test', process_ref), self._routed('test', process_ref))
+        self.cat.delete_resource(other)
+        self.assertEqual(self.cat.lookup('test', process_ref), 'test.basic')
+
+    def test_reindex(self):
+        self.cat.lookup('test', process_ref)
+        self.cat.lookup('test', process_ref)
+        self.res.remove_archive()
+        self.assertEqual(self.cat.lookup('test', process_ref), 'test.basic')
+        self.assertEqual(self.cat.lookup('test', process_ref), 'test.basic')
+        self.assertEqual(self.cat.entity_index_stats()['resources'], 1)
+
+    def test_load_pending(self):
+        self.cat.lookup('test', process_ref)
+        self.res._load_pending = True  # as for a non-json static source in a lazy catalog
+        self.assertEqual(self.cat.lookup('test', process_ref), 'test.basic')
+        self.assertEqual(self.cat.entity_index_stats()['resources'], 0)
+        self.res.complete_load(self.cat)
+        self.cat.lookup('test', process_ref)
+        self.assertEqual(self.cat.entity_index_stats()['resources'], 1)
+
+    def test_links(self):
+        links = ['test.basic/%s' % process_ref, 'test.basic/no such process']
+        found = self.cat.lookup_links(links)
+        self.assertEqual(found[links[0]], 'test.basic')
+        self.assertIsNone(found[links[1]])
+        entities = self.cat.fetch_links(links)
+        self.assertEqual(entities[links[0]].external_ref, process_ref)
+        self.assertIsNone(entities[links[1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from shutil import rmtree
+
+from lcatools.archives import archive_from_json
+from lcatools.archives.tests import basic_archive_src
+from lcatools.entities import LcProcess
+
+from .. import LcCatalog
+from ...lc_resource import LcResource
+
+
+class IndexJobsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls._root = tempfile.mkdtemp()
+        cls.cat = LcCatalog(cls._root)
+        cls.cat.add_resource(LcResource('test.basic', basic_archive_src, 'json', interfaces='inventory'), store=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cat.close()
+        rmtree(cls._root)
+
+    def setUp(self):
+        for f in os.listdir(self.cat._index_dir):
+            os.remove(os.path.join(self.cat._index_dir, f))
+
+    def test_submit_index(self):
+        job = self.cat.submit_index('test.basic', force=True)
+        self.assertIn(job.stage, ('queued', 'instantiating', 'resuming', 'loading', 'checkpoint', 'indexing', 'done'))
+        self.assertIn(job, self.cat.index_jobs.wait())
+        ref = job.result()
+        self.assertTrue(ref.startswith('test.basic.index'))
+        res = self.cat.get_resource(ref, iface='index')
+        self.assertEqual(res.source, self.cat._localize_source(self.cat._index_file(basic_archive_src)))
+        self.assertEqual(self.cat.query(ref).count('process'), 1)
+        self.assertListEqual(os.listdir(self.cat._index_dir), [os.path.basename(job.target)])
+
+    def test_existing(self):
+        self.cat.submit_index('test.basic', force=True)
+        self.cat.index_jobs.wait()
+        job = self.cat.submit_index('test.basic')
+        self.assertTrue(job.done())
+        self.assertEqual(job.stage, 'done')
+
+    def test_resume(self):
+        spec = self.cat._job_spec(self.cat.get_resource('test.basic'), 'index', self.cat._index_file(basic_archive_src))
+        ar = archive_from_json(basic_archive_src)
+        ar.add(LcProcess.new('Loaded before the interruption'))
+        ar.write_to_file(spec['checkpoint'], gzip=True, complete=True)
+        job = self.cat.submit_index('test.basic', force=True)
+        self.cat.index_jobs.wait()
+        self.assertEqual(self.cat.query(job.result()).count('process'), 2)
+        self.assertFalse(os.path.exists(spec['checkpoint']))
+
+    def test_source_cache(self):
+        job = self.cat.submit_source_cache(basic_archive_src)
+        self.cat.index_jobs.wait()
+        self.assertTrue(os.path.exists(job.result()))
+        self.assertEqual(job.result(), self.cat.cache_file(basic_archive_src))
+
+    def test_close(self):
+        jobs = self.cat.index_jobs
+        job = self.cat.submit_index('test.basic', force=True)
+        self.cat.close()
+        self.assertTrue(job.done())
+        self.assertIsNone(self.cat._index_jobs)
+        self.assertTrue(jobs._executor._shutdown_thread)
+        self.assertEqual(self.cat.query(job.result()).count('process'), 1)  # registered on close
+
+
+if __name__ == '__main__':
+    unittest.main()
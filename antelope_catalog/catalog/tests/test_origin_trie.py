@@ -0,0 +1,80 @@
+import tempfile
+import unittest
+from shutil import rmtree
+
+from lcatools.interfaces import UnknownOrigin
+
+from ..origin_trie import OriginTrie
+from ..lc_resolver import LcCatalogResolver
+from ...lc_resource import LcResource
+
+
+def _res(ref, interfaces, priority=50):
+    return LcResource(ref, '/dev/null/%s' % ref, 'LcArchive', interfaces=interfaces, priority=priority)
+
+
+class OriginTrieTest(unittest.TestCase):
+    def setUp(self):
+        self.trie = OriginTrie()
+        self.a = _res('uslci', 'inventory', priority=40)
+        self.b = _res('uslci.clean', 'index', priority=30)
+        self.c = _res('uslci.clean.allocated', ['background', 'index'], priority=90)
+        self.d = _res('uslcix', 'inventory', priority=10)
+        for r in (self.a, self.b, self.c, self.d):
+            self.trie.add(r.reference, r)
+
+    def test_prefix(self):
+        self.assertEqual(self.trie.resolve('uslci'), [self.b, self.a, self.c])
+        self.assertEqual(self.trie.resolve('uslci.clean'), [self.b, self.c])
+        self.assertEqual(self.trie.resolve('uslci.cl'), [])
+        self.assertFalse(self.trie.known('uslci.original'))
+
+    def test_strict(self):
+        self.assertEqual(self.trie.resolve('uslci', strict=True), [self.a])
+        self.assertTrue(self.trie.known('uslci.clean', strict=True))
+
+    def test_interfaces(self):
+        self.assertEqual(self.trie.resolve('uslci', 'index'), [self.b, self.c])
+        self.assertEqual(self.trie.resolve('uslci', ['background', 'inventory']), [self.a, self.c])
+        self.assertEqual(self.trie.resolve('uslci', 'basic'), [self.b, self.a, self.c])
+        self.assertEqual(self.trie.resolve('uslci.clean', 'foreground'), [])
+
+    def test_remove(self):
+        self.trie.remove(self.c.reference, self.c)
+        self.assertFalse(self.trie.known('uslci.clean.allocated'))
+        self.assertEqual(self.trie.resolve('uslci', 'background'), [])
+        self.trie.remove(self.b.reference, self.b)
+        self.assertFalse(self.trie.known('uslci.clean'))
+        self.assertEqual(self.trie.resolve('uslci'), [self.a])
+
+
+class ResolverTest(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.mkdtemp()
+        self.resolver = LcCatalogResolver(self._dir)
+
+    def tearDown(self):
+        rmtree(self._dir)
+
+    def test_resolve(self):
+        lo = _res('test.basic', 'index', priority=10)
+        hi = _res('test.basic.sub', 'index', priority=80)
+        self.resolver.add_resource(hi)
+        self.resolver.add_resource(lo)
+        self.assertEqual(list(self.resolver.resolve('test.basic')), [lo, hi])
+        self.assertIs(self.resolver.get_resource('test.basic', strict=False), lo)
+        with self.assertRaises(UnknownOrigin):
+            next(self.resolver.resolve('test.other'))
+        self.resolver.delete_resource(lo)
+        self.assertEqual(list(self.resolver.resolve('test.basic')), [hi])
+        with self.assertRaises(UnknownOrigin):
+            next(self.resolver.resolve('test.basic', strict=True))
+
+    def test_reindex(self):
+        self.resolver.add_resource(_res('test.stored', 'index'))
+        fresh = LcCatalogResolver(self._dir)
+        self.assertEqual([r.reference for r in fresh.resolve('test')], ['test.stored'])
+
+
+if __name__ == '__main__':
+    unittest.main()
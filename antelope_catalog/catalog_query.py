@@ -2,9 +2,14 @@
 Query Interface -- used to operate catalog refs
 """
 
+from time import perf_counter
+
+from lcatools import tracing
 from lcatools.interfaces import (IndexInterface, BackgroundInterface, InventoryInterface, QuantityInterface,
                                  EntityNotFound, IndexRequired)
 
+from .query_cache import QueryCache, DEFAULT_CACHE_SIZE
+
 INTERFACE_TYPES = {'basic', 'index', 'inventory', 'background', 'quantity', 'foreground'}
 READONLY_INTERFACE_TYPES = {'basic', 'index', 'inventory', 'background', 'quantity'}
 
@@ -29,13 +34,38 @@ class CatalogQuery(IndexInterface, BackgroundInterface, InventoryInterface, Quan
     The catalog's resolver performs fuzzy matching, meaning that a generic query (such as 'local.ecoinvent') will return
     both exact resources and resources with greater semantic specificity (such as 'local.ecoinvent.3.2.apos').
     All queries accept the "strict=" keyword: set to True to only accept exact matches.
+
+    Routing a query-- resolving the origin, sorting the matching resources, and making (and for background queries,
+    setting up) their interfaces-- is memoized: for each (interface type, method, strict) the query remembers the
+    interface that answered, and tries it first next time.  Only if it fails to answer is the query routed in full.
+    An interface is only remembered if it is the first in priority order, so that the memo never answers a query
+    that a higher-priority resource would have answered.  The memo is discarded whenever the catalog's resources
+    change, or one of them is loaded or unloaded, since either can change the priority order.
+
+    The results of entity-level queries (get, get_uuid, get_item, get_reference, terminate) are kept in a bounded
+    QueryCache, which is likewise emptied when the catalog's resources change, and on demand with invalidate().
     """
-    def __init__(self, origin, catalog=None, debug=False):
+    def __init__(self, origin, catalog=None, debug=False, cache_size=DEFAULT_CACHE_SIZE, cache_ttl=None):
+        """
+
+        :param origin:
+        :param catalog:
+        :param debug:
+        :param cache_size: [4096] maximum number of query results to keep.  0 disables the cache; None is unbounded
+        :param cache_ttl: [None] seconds after which a cached result expires
+        """
         self._origin = origin
         self._catalog = catalog
         self._debug = debug
 
-        self._entity_cache = dict()
+        self._cache = QueryCache(max_size=cache_size, ttl=cache_ttl)
+
+        self._routes = dict()  # (itype, attrname, strict): first interface in priority order, once it has answered
+        self._routes_version = None
+        self.routed = 0  # queries answered by a memoized route
+        self.rerouted = 0  # queries routed in full
+        self.routing_time = 0.0  # seconds spent finding interfaces
+        self.answer_time = 0.0  # seconds spent in the interfaces themselves
 
     @property
     def origin(self):
@@ -74,6 +104,122 @@ class CatalogQuery(IndexInterface, BackgroundInterface, InventoryInterface, Quan
                     raise IndexRequired('Background engine requires index interface')
             yield i
 
+    @staticmethod
+    def _route_key(itype, attrname, strict):
+        if itype is None or isinstance(itype, str):
+            return itype, attrname, strict
+        return tuple(sorted(itype)), attrname, strict
+
+    def _check_routes(self):
+        if self._catalog is None:
+            raise NoCatalog
+        version = self._catalog.routing_version
+        if version != self._routes_version:
+            self._routes.clear()
+            self._cache.invalidate()
+            self._routes_version = version
+
+    def clear_routes(self):
+        self._routes.clear()
+
+    def _answer(self, iface, attrname, exc, args, kwargs):
+        t = perf_counter()
+        try:
+            if tracing.is_enabled():
+                with tracing.span('interface', '%s.%s' % (iface.__class__.__name__, attrname), self._origin):
+                    return getattr(iface, attrname)(*args, **kwargs)
+            return getattr(iface, attrname)(*args, **kwargs)
+        except exc.__class__:
+            return None
+        finally:
+            self.answer_time += perf_counter() - t
+
+    def _perform_query(self, itype, attrname, exc, *args, strict=False, **kwargs):
+        if not tracing.is_enabled():
+            return self._route_query(itype, attrname, exc, args, kwargs, strict)
+        with tracing.span('query', attrname, self._origin):
+            return self._route_query(itype, attrname, exc, args, kwargs, strict)
+
+    def _route_query(self, itype, attrname, exc, args, kwargs, strict):
+        if self._debug:
+            print('Performing %s query, iface %s' % (attrname, itype))
+        t = perf_counter()
+        self._check_routes()
+        key = self._route_key(itype, attrname, strict)
+        route = self._routes.get(key)
+        self.routing_time += perf_counter() - t
+        if route is not None:
+            try:
+                result = self._answer(route, attrname, exc, args, kwargs)
+            except NotImplementedError:
+                result = None
+            if result is not None:
+                self.routed += 1
+                tracing.count('query', 'route', self._origin, hit=True)
+                return result
+
+        self.rerouted += 1
+        tracing.count('query', 'route', self._origin, hit=False)
+        t = perf_counter()
+        try:
+            for n, iface in enumerate(self._iface(itype, strict=strict)):
+                self.routing_time += perf_counter() - t
+                result = self._answer(iface, attrname, exc, args, kwargs)
+                t = perf_counter()
+                if result is not None:
+                    if n == 0 and self._catalog.routing_version == self._routes_version:
+                        # only the first interface in priority order may be memoized: an answer from a later one
+                        # says nothing about the earlier ones for other arguments.  Nor if a resource was loaded
+                        # meanwhile (perhaps by routing this very query), as the order may have changed since
+                        self._routes[key] = iface
+                    return result
+        except NotImplementedError:
+            pass
+        self.routing_time += perf_counter() - t
+
+        raise exc
+
+    def routing_stats(self):
+        """
+        :return: dict reporting how queries were routed, and the time spent routing them versus answering them
+        """
+        return {'routed': self.routed,
+                'rerouted': self.rerouted,
+                'routes': len(self._routes),
+                'routing_time': self.routing_time,
+                'answer_time': self.answer_time}
+
+    def invalidate(self, external_ref=None):
+        """
+        Drop cached query results
+        :param external_ref: [None] only drop results concerning this external_ref
+        :return: the number of results dropped
+        """
+        return self._cache.invalidate(external_ref)
+
+    def cache_stats(self):
+        return self._cache.stats()
+
+    def _cached(self, key, compute):
+        """
+        :param key: (method, external_ref, ...)
+        :param compute: callable performing the query
+        :return:
+        """
+        if self._catalog is not None:
+            self._check_routes()  # the cache is emptied along with the routes
+        try:
+            hash(key)
+        except TypeError:  # e.g. unhashable kwargs
+            return compute()
+        if not tracing.is_enabled():
+            return self._cache.get_or_compute(key, compute)
+        hits = self._cache.hits
+        try:
+            return self._cache.get_or_compute(key, compute)
+        finally:
+            tracing.count('query', 'cache', self._origin, hit=self._cache.hits > hits)
+
     def is_elementary(self, obj):
         """
         accesses the catalog's qdb to detect elementary compartment. Should work on flows or exchanges.
@@ -103,8 +249,24 @@ class CatalogQuery(IndexInterface, BackgroundInterface, InventoryInterface, Quan
         :param item:
         :return:
         """
-        return self._perform_query(None, 'get_item', EntityNotFound('%s/%s' % (self.origin, external_ref)),
-                                   external_ref, item)
+        return self._cached(('get_item', external_ref, item),
+                            lambda: self._perform_query(None, 'get_item',
+                                                        EntityNotFound('%s/%s' % (self.origin, external_ref)),
+                                                        external_ref, item))
+
+    def get_reference(self, external_ref):
+        """
+        :param external_ref:
+        :return: a process's reference exchanges, or the reference entity of a flow or quantity
+        """
+        return self._cached(('get_reference', external_ref),
+                            lambda: self._perform_query(None, 'get_reference',
+                                                        EntityNotFound('%s/%s' % (self.origin, external_ref)),
+                                                        external_ref))
+
+    def get_uuid(self, external_ref):
+        return self._cached(('get_uuid', external_ref),
+                            lambda: super(CatalogQuery, self).get_uuid(external_ref))
 
     def get(self, eid, **kwargs):
         """
@@ -112,11 +274,27 @@ class CatalogQuery(IndexInterface, BackgroundInterface, InventoryInterface, Quan
         :param eid: an external Id
         :return:
         """
-        if eid not in self._entity_cache:
-            entity = self._perform_query(None, 'get', EntityNotFound('%s/%s' % (self.origin, eid)), eid,
-                                         **kwargs)
-            self._entity_cache[eid] = self.make_ref(entity)
-        return self._entity_cache[eid]
+        return self._cached(('get', eid),
+                            lambda: self.make_ref(self._perform_query(None, 'get',
+                                                                      EntityNotFound('%s/%s' % (self.origin, eid)),
+                                                                      eid, **kwargs)))
+
+    def terminate(self, flow, direction=None, **kwargs):
+        """
+        Find processes that match the given flow and have a complementary direction.  Results for a flow given by
+        external_ref are cached.
+        :param flow:
+        :param direction:
+        :return:
+        """
+        if not isinstance(flow, str):
+            for p in super(CatalogQuery, self).terminate(flow, direction=direction, **kwargs):
+                yield p
+            return
+        key = ('terminate', flow, direction, tuple(sorted(kwargs.items())))
+        for p in self._cached(key, lambda: list(super(CatalogQuery, self).terminate(flow, direction=direction,
+                                                                                       **kwargs))):
+            yield p
 
     def do_lcia(self, inventory, quantity_ref, **kwargs):
         self.ensure_lcia_factors(quantity_ref)
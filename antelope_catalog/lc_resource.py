@@ -1,7 +1,12 @@
+import itertools
 import json
 import os
+import threading
+import time
+import tracemalloc
 from collections import defaultdict
 
+from lcatools import tracing
 from lcatools.archives import InterfaceError, index_archive, update_archive, create_archive
 
 from .foreground import LcForeground
@@ -10,6 +15,65 @@ from .catalog_query import INTERFACE_TYPES, NoCatalog
 # from .providers import create_archive
 
 
+_load_events = itertools.count(1)
+_load_state = 0
+
+
+def _load_state_changed():
+    global _load_state
+    _load_state = next(_load_events)
+
+
+def load_state():
+    """
+    Changes whenever any resource's archive is instantiated, completes a deferred load, or is removed-- events which
+    change the order in which a catalog prefers resources.
+    :return: an int
+    """
+    return _load_state
+
+
+def _memory_in_use():
+    """
+    :return: bytes allocated by Python if tracemalloc is tracing; otherwise the resident set size where /proc is
+     available; otherwise None
+    """
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    try:
+        with open('/proc/self/statm') as fp:
+            return int(fp.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class _GuardedInterface(object):
+    """
+    The 'basic' interface of a resource whose static load is deferred.  While the load is pending, each call holds the
+    resource's lock, so that a query cannot run while another thread (e.g. the catalog's preloader) is inside the
+    archive's load_all().  Once the load is complete, calls go straight to the interface.
+    """
+    def __init__(self, resource, iface):
+        self._resource = resource
+        self._iface = iface
+
+    def __getattr__(self, item):
+        attr = getattr(self._iface, item)
+        if not callable(attr):
+            return attr
+        res = self._resource
+
+        def guarded(*args, **kwargs):
+            if res.load_pending:
+                with res._lock:
+                    return attr(*args, **kwargs)
+            return attr(*args, **kwargs)
+        return guarded
+
+    def __str__(self):
+        return str(self._iface)
+
+
 class LcResource(object):
     """
     This is a record that links a semantic reference to a physical data source, and specifies the capabilities
@@ -67,7 +131,15 @@ class LcResource(object):
 
         return sorted([cls.from_dict(ref, d) for d in j[ref]], key=lambda x: x.priority)
 
-    def _instantiate(self, catalog=None):
+    def _instantiate(self, catalog=None, defer_load=False):
+        """
+        Create the archive, merge in any cached entities and apply stored configuration.  The archive is only
+        assigned once it is ready, so other threads see either no archive or a complete one.  If the static load is
+        deferred, so is the configuration, which must see the archive's full contents.
+        :param catalog:
+        :param defer_load: [False] if True, postpone load_all() of a static archive until complete_load()
+        :return:
+        """
         if self.source is None:
             if catalog is None:
                 raise NoCatalog('Remote resource encountered')
@@ -85,31 +157,87 @@ class LcResource(object):
         else:
             src = self.source
         if self.ds_type.lower() in ('foreground', 'lcforeground'):
-            self._archive = LcForeground(src, catalog=catalog, ref=self.reference, **self.init_args)
+            archive = LcForeground(src, catalog=catalog, ref=self.reference, **self.init_args)
         else:
-            self._archive = create_archive(src, self.ds_type, catalog=catalog, ref=self.reference,
-                                           # upstream=catalog.qdb,
-                                           **self.init_args)
+            archive = create_archive(src, self.ds_type, catalog=catalog, ref=self.reference,
+                                     # upstream=catalog.qdb,
+                                     **self.init_args)
         if catalog is not None and os.path.exists(catalog.cache_file(self.source)):
-            update_archive(self._archive, catalog.cache_file(self.source))
-        self._static = self._archive.static
+            update_archive(archive, catalog.cache_file(self.source))
+        self._static = archive.static
         if self.static and self.ds_type.lower() != 'json':
-            self._archive.load_all()  # static json archives are by convention saved in complete form
-        self.apply_config()
+            # static json archives are by convention saved in complete form
+            if defer_load:
+                self._load_pending = True
+            else:
+                archive.load_all()
+        if not self._load_pending:
+            self._apply_config(archive)
+        self._archive = archive
+        _load_state_changed()
 
     @property
     def is_loaded(self):
         return self._archive is not None
 
+    @property
+    def load_pending(self):
+        """
+        :return: True if the archive was instantiated with its static load deferred
+        """
+        return self._load_pending
+
     def remove_archive(self):
         self._archive = None
+        self._load_pending = False
+        _load_state_changed()
 
-    def check(self, catalog):
+    def check(self, catalog, defer_load=False, how='foreground'):
+        """
+        Instantiate the archive if it has not been already.  Thread-safe: a caller arriving while another thread is
+        instantiating the same resource waits for it to finish.
+        :param catalog:
+        :param defer_load: [False] postpone the load_all() of a static archive until an interface other than 'basic'
+         is requested
+        :param how: ['foreground'] label for the load profile
+        :return:
+        """
         if self._archive is None:
-            # TODO: try/catch exceptions or return false
-            self._instantiate(catalog)
+            with self._lock:
+                if self._archive is None:
+                    # TODO: try/catch exceptions or return false
+                    t0 = time.perf_counter()
+                    m0 = _memory_in_use()
+                    with tracing.span('catalog', 'instantiate', self.reference, how=how):
+                        self._instantiate(catalog, defer_load=defer_load)
+                    self._record_load(catalog, 'instantiate', how, t0, m0)
         return True
 
+    def complete_load(self, catalog=None, how='foreground'):
+        """
+        Perform a static load that was deferred at instantiation, and then apply the stored configuration
+        :param catalog: to receive the load profile
+        :param how: ['foreground'] label for the load profile
+        :return:
+        """
+        if self._load_pending:
+            with self._lock:
+                if self._load_pending:
+                    t0 = time.perf_counter()
+                    m0 = _memory_in_use()
+                    self._archive.load_all()
+                    self._apply_config(self._archive)
+                    self._load_pending = False
+                    _load_state_changed()
+                    self._record_load(catalog, 'load_all', how, t0, m0)
+
+    def _record_load(self, catalog, stage, how, t0, m0):
+        elapsed = time.perf_counter() - t0
+        m1 = _memory_in_use()
+        memory = None if m0 is None or m1 is None else m1 - m0
+        if catalog is not None:
+            catalog.record_load(self.reference, self.source, stage, how, elapsed, memory)
+
     def save(self, catalog):
         self.write_to_file(catalog.resource_dir)
 
@@ -128,13 +256,20 @@ class LcResource(object):
         print('Created archive of %s containing:' % self._archive)
         self._archive.check_counter()
 
-    def make_interface(self, iface):
+    def make_interface(self, iface, catalog=None):
+        if iface != 'basic':
+            self.complete_load(catalog)
+        elif self._load_pending:
+            return _GuardedInterface(self, self._archive.make_interface(iface))
         return self._archive.make_interface(iface)
 
     def apply_config(self):
+        self._apply_config(self._archive)
+
+    def _apply_config(self, archive):
         if len(self._config) > 0:
             print('Applying stored configuration')
-            self._archive.make_interface('configure').apply_config(self._config)
+            archive.make_interface('configure').apply_config(self._config)
 
     def add_interface(self, iface):
         if iface in INTERFACE_TYPES:
@@ -181,6 +316,8 @@ class LcResource(object):
         '''
 
         self._archive = preload_archive
+        self._lock = threading.RLock()
+        self._load_pending = False
 
         self._ref = reference
         if source is None:
@@ -5,12 +5,14 @@ At this point I am really straight repeating a lot of Chris's work. but who can
 from __future__ import print_function, unicode_literals
 
 from lcatools.archives import BasicArchive
+from lcatools.implementations import QuantityImplementation
 from lcatools.literate_float import LiterateFloat
 
 from lcatools.entities import LcFlow, LcQuantity
 
+from .xl_columns import XlColumns
+
 import os
-import xlrd
 
 EI_LCIA_VERSION = '3.1'
 EI_LCIA_NSUUID = '46802ca5-8b25-398c-af10-2376adaa4623'
@@ -19,6 +21,26 @@ Ecoinvent_Indicators = os.path.join(os.path.dirname(__file__), 'data',
                                     'list_of_methods_and_indicators_ecoinvent_v3.2.xlsx')
 
 
+class EcoinventLciaQuantityImplementation(QuantityImplementation):
+    """
+    Loads each LCIA method the first time its factors are requested, so that an archive that is not loaded can still
+    answer quantity queries without reading every method
+    """
+    def factors(self, quantity, flowable=None, compartment=None, **kwargs):
+        if isinstance(quantity, str):
+            if self._archive.load_lcia_method(quantity):
+                self._flowables = None  # new flows
+            quantity = self.get_canonical(quantity)
+        if quantity is not None and self._archive.load_lcia_method(quantity.external_ref):
+            self._flowables = None
+        return super(EcoinventLciaQuantityImplementation, self).factors(quantity, flowable=flowable,
+                                                                        compartment=compartment, **kwargs)
+
+    def profile(self, flow, **kwargs):
+        self._archive.load_all()
+        return super(EcoinventLciaQuantityImplementation, self).profile(flow, **kwargs)
+
+
 class EcoinventLcia(BasicArchive):
     """
     Class to import the Ecoinvent LCIA implementation and construct a flow-cf-quantity catalog.
@@ -28,32 +50,19 @@ class EcoinventLcia(BasicArchive):
 
     _drop_columns = ['Change?']
 
-    @staticmethod
-    def _sheet_to_rows(sheet):
-        g = sheet.get_rows()
-        headings = [h.value for h in next(g)]
-
-        rows = []
-        for row in g:
-            d = dict()
-            for i, h in enumerate(headings):
-                if h in EcoinventLcia._drop_columns:
-                    continue
-                d[h] = row[i].value
-            rows.append(d)
-        return rows
-
     def _load_xl_rows(self):
         """
         25+sec just to open_workbook for EI3.1 LCIA (pandas is similar)
         note: this is down to 15.5 sec
+        The sheet is compiled once per workbook (see XlColumns); with a sheet_cache, later instances skip xlrd entirely
+        :return: XlColumns
         """
-        b = xlrd.open_workbook(self.source).sheet_by_name(self._sheet_name)
-
-        self._xl_rows = self._sheet_to_rows(b)
+        if self._xl_rows is None:
+            self._xl_rows = XlColumns.from_workbook(self.source, self._sheet_name, cache_dir=self._sheet_cache)
+        return self._xl_rows
 
     def __init__(self, source, ref=None, sheet_name='impact methods', mass_quantity=None,
-                 value_tag='CF ' + EI_LCIA_VERSION, ns_uuid=EI_LCIA_NSUUID, static=True, **kwargs):
+                 value_tag='CF ' + EI_LCIA_VERSION, ns_uuid=EI_LCIA_NSUUID, static=True, sheet_cache=None, **kwargs):
         """
         EI_LCIA_VERSION is presently 3.1 for the spreadsheet named 'LCIA implementation v3.1 2014_08_13.xlsx'
 
@@ -63,19 +72,33 @@ class EcoinventLcia(BasicArchive):
         :param mass_quantity:
         :param value_tag: 'CF ' + EI_LCIA_VERSION
         :param ns_uuid: required
-        :param static: this archive type is always static
+        :param static: [True] load all methods when the resource is instantiated.  If False, quantities are created
+         up front and each method's characterizations are loaded when first requested (see load_lcia_method)
+        :param sheet_cache: [None] directory in which to keep compiled copies of the spreadsheets (see XlColumns)
         :param kwargs: quiet, upstream
         """
         if ref is None:
             ref = '.'.join(['local', 'ecoinvent', EI_LCIA_VERSION, 'lcia'])
-        super(EcoinventLcia, self).__init__(source, ref=ref, ns_uuid=ns_uuid, static=True, **kwargs)
-        self._xl_rows = []
+        if sheet_cache is not None:
+            kwargs['sheet_cache'] = sheet_cache
+        super(EcoinventLcia, self).__init__(source, ref=ref, ns_uuid=ns_uuid, static=static, **kwargs)
+        self._xl_rows = None
+        self._method_rows = None
+        self._methods_loaded = set()
         self._sheet_name = sheet_name
+        self._sheet_cache = sheet_cache
         self._value_tag = value_tag
 
         mass = mass_quantity or LcQuantity.new('Mass', self._create_unit('kg')[0])
         self.add(mass)
         self._mass = mass
+        if not static:
+            self._create_all_quantities()
+
+    def make_interface(self, iface):
+        if iface == 'quantity':
+            return EcoinventLciaQuantityImplementation(self)
+        return super(EcoinventLcia, self).make_interface(iface)
 
     @staticmethod
     def _quantity_key(row):
@@ -106,11 +129,8 @@ class EcoinventLcia(BasicArchive):
         return q
 
     def _create_all_quantities(self):
-        x = xlrd.open_workbook(Ecoinvent_Indicators)
-        w = x.sheet_by_index(0)
-
-        qs = self._sheet_to_rows(w)
-        for row in qs:
+        qs = XlColumns.from_workbook(Ecoinvent_Indicators, 0, cache_dir=self._sheet_cache)
+        for index, row in qs.iterrows(drop=self._drop_columns):
             self._create_quantity(row)
 
     def _create_flow(self, row):
@@ -132,13 +152,38 @@ class EcoinventLcia(BasicArchive):
         else:
             return row[self._value_tag]
 
-    def _load_all(self):
-        self._create_all_quantities()
-        if len(self._xl_rows) == 0:
-            self._load_xl_rows()
-        for row in self._xl_rows:
+    def _rows_by_method(self):
+        """
+        :return: dict of quantity key: indices of the method's rows in the compiled sheet
+        """
+        if self._method_rows is None:
+            groups = self._load_xl_rows().groups('method', 'category', 'indicator')
+            self._method_rows = dict((', '.join(k), v) for k, v in groups.items())
+        return self._method_rows
+
+    def load_lcia_method(self, key):
+        """
+        Create the flows and characterizations of a single LCIA method, reading only that method's rows.
+        :param key: the quantity's external ref, 'method, category, indicator'
+        :return: True if the method was loaded by this call; False if it was already loaded or is not in the sheet
+        """
+        if key in self._methods_loaded:
+            return False
+        indices = self._rows_by_method().get(key)
+        if indices is None:
+            return False
+        rows = self._load_xl_rows()
+        for i in indices:
+            row = rows.row(i, drop=self._drop_columns)
             f = self._create_flow(row)
             q = self._create_quantity(row)
             v = LiterateFloat(self._get_value(row), **row)
             f.add_characterization(q, value=v)
+        self._methods_loaded.add(key)
+        return True
+
+    def _load_all(self):
+        self._create_all_quantities()
+        for key in self._rows_by_method():
+            self.load_lcia_method(key)
         self.check_counter()
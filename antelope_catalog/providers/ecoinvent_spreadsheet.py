@@ -1,9 +1,12 @@
 from __future__ import print_function, unicode_literals
 
 from lcatools.archives import LcArchive
-from .xl_dict import XlDict
+from .xl_columns import XlColumns
 from lcatools.entities import LcProcess, LcFlow, LcQuantity
 from .ecospold2 import EcospoldV2Archive
+from .ecospold2.ecospold2 import spold_reference_flow
+from .file_store import FileStore
+from .lci_store import LciStore, process_record, load_record
 from lcatools.interact import pick_reference
 
 from lcatools.from_json import from_json
@@ -19,23 +22,30 @@ class EcoinventSpreadsheet(LcArchive):
     "activity overview" spreadsheet. Note the lack of specification for such a spreadsheet.
     """
 
-    def _little_read(self, sheetname):
+    def _open_workbook(self):
         if not isinstance(self._xl, xlrd.book.Book):
             print('Loading workbook')
             self._xl = xlrd.open_workbook(self.source)
+        return self._xl
+
+    def _little_read(self, sheetname):
         print('Reading %s ...' % sheetname)
-        return XlDict.from_sheetname(self._xl, sheetname)
+        return XlColumns.from_workbook(self.source, sheetname, cache_dir=self._sheet_cache,
+                                       open_workbook=self._open_workbook)
 
     def __init__(self, source, ref=None, version='Unspecified', internal=False, data_dir=None, model=None,
-                 ns_uuid=None, **kwargs):
+                 ns_uuid=None, sheet_cache=None, **kwargs):
         """
         :param source:
         :param ref: hard-coded 'local.ecoinvent.[version].[model].spreadsheet'; specify at instantiation to override
         :param version:
         :param internal:
         :param ns_uuid: required
+        :param sheet_cache: [None] directory in which to keep compiled copies of the spreadsheet tabs (see XlColumns)
         :param kwargs: quiet, upstream
         """
+        if sheet_cache is not None:
+            kwargs['sheet_cache'] = sheet_cache
         if ns_uuid is None:
             ns_uuid = uuid.uuid4()
         if ref is None:
@@ -44,6 +54,7 @@ class EcoinventSpreadsheet(LcArchive):
         self.version = version
         self.internal = internal
         self._xl = None
+        self._sheet_cache = sheet_cache
 
         self._serialize_dict['version'] = version
         self._serialize_dict['internal'] = internal
@@ -54,6 +65,8 @@ class EcoinventSpreadsheet(LcArchive):
         self.fg = None
         self.bg = None
         self._bg_cache_loaded = None
+        self._lci_store = None
+        self._lci_checked = False  # whether the LCI archive has been made random-access
         self.lcia = None
         if self._data_dir is not None:
             if model == 'undefined':
@@ -63,14 +76,34 @@ class EcoinventSpreadsheet(LcArchive):
                 if os.path.exists(self._bg_filename):
                     print('BG: Cache available via %s' % self._bg_filename)
                     self._bg_cache_loaded = False
-                    self.bg = LcArchive(self._lci_cache)
+                    self.bg = LcArchive(None, ref='.'.join(['local', 'ecoinvent', version, model, 'lci']))
+                    self._lci_store = LciStore(self._lci_store_path)
                 if os.path.exists(self._lcia_validate_filename):
                     self.lcia = EcospoldV2Archive(self._lcia_validate_filename, prefix='datasets')
 
+    def _migrate_lci_cache(self):
+        """
+        Copy the datasets in a legacy whole-archive LCI cache (lci_persist_*.json.gz) into an empty LCI store
+        :return:
+        """
+        if len(self._lci_store) > 0 or not os.path.exists(self._lci_cache):
+            return
+        print('Migrating LCI cache %s' % self._lci_cache)
+        legacy = LcArchive(None, ref=self.bg.ref)
+        legacy.load_from_dict(from_json(self._lci_cache))
+        for p in legacy.entities_by_type('process'):
+            self._lci_store.put(p.external_ref, process_record(p))
+
     def load_lci_cache(self):
+        """
+        Load every dataset in the LCI store.  Lookups don't need this: bg_proxy loads stored datasets one at a time.
+        :return:
+        """
         if self._bg_cache_loaded is False:
-            print('Accessing LCI from %s' % self._bg_filename)
-            self.bg.load_from_dict(from_json(self._lci_cache))
+            print('Accessing LCI from %s' % self._lci_store.data_file)
+            self._migrate_lci_cache()
+            for k in list(self._lci_store.keys()):
+                self._bg_from_store(k)
             self._bg_cache_loaded = True
 
     def _fetch(self, entity, **kwargs):
@@ -111,8 +144,19 @@ class EcoinventSpreadsheet(LcArchive):
                                                         'lci', 'ecoSpold02']) + '.7z')
             return fn
 
+    @property
+    def _lci_store_path(self):
+        if self._data_dir is None:
+            raise AttributeError('No data directory')
+        else:
+            return os.path.join(self._data_dir, '_'.join(['lci', 'store', self.version, self._model]))
+
     @property
     def _lci_cache(self):
+        """
+        legacy whole-archive LCI cache; see _migrate_lci_cache
+        :return:
+        """
         if self._data_dir is None:
             raise AttributeError('No data directory')
         else:
@@ -124,22 +168,69 @@ class EcoinventSpreadsheet(LcArchive):
             self.fg.retrieve_or_fetch_entity(ds)
         return self.fg[proxy]
 
-    def bg_proxy(self, proxy):
-        self.load_lci_cache()
+    def _lci_archive(self):
+        """
+        The LCI archive is a solid 7z, so reading one dataset means decompressing everything before it in its block.
+        On first use, make a random-access copy (see FileStore.transcode), which later archives on the same file read
+        from.  A fresh archive is returned on every call, so that the processes it reads are dropped once they have
+        been stored-- to avoid out-of-memory errors.
+        :return:
+        """
+        if not self._lci_checked:
+            store = FileStore(self._bg_filename)
+            if not store.random_access:
+                print('Making random-access copy of %s -- this is slow, but only happens once' % self._bg_filename)
+                try:
+                    store.transcode()
+                except OSError as e:
+                    print('Unable to write copy: %s' % e)
+            self._lci_checked = True
+        return EcospoldV2Archive(self._bg_filename, prefix='datasets')
+
+    def _bg_from_store(self, proxy):
         bg = self.bg[proxy]
+        if bg is None:
+            record = self._lci_store.get(proxy)
+            if record is not None:
+                bg = load_record(self.bg, record)[0]
+        return bg
+
+    def bg_proxy(self, proxy):
+        self._migrate_lci_cache()
+        bg = self._bg_from_store(proxy)
         if bg is None:
             print('Looking up: %s' % proxy)
-            print('Performing LCI lookup -- this is slow because of 7z')
-            # re-instantiate each time to avoid out-of-memory errors
-            lci = EcospoldV2Archive(self._bg_filename, prefix='datasets')
-            for ds in lci.list_datasets(proxy):
+            self.prefetch_lci([proxy])
+            bg = self.bg[proxy]
+            print('LCI: %s' % bg)
+        return bg
+
+    def prefetch_lci(self, process_ids):
+        """
+        Read the LCI datasets for any of the given processes that are not already stored, in a single pass through
+        the LCI archive, and append them to the LCI store.
+        :param process_ids: iterable of activity uuids
+        :return: the number of processes added to the store
+        """
+        self._migrate_lci_cache()
+        wanted = set(p for p in process_ids if p not in self._lci_store)
+        if len(wanted) == 0:
+            return 0
+        lci = self._lci_archive()
+        for ds in lci.list_datasets():  # archive order, so that solid blocks are read sequentially
+            if spold_reference_flow(ds)[0] in wanted:
                 print('retrieving %s' % ds)
                 lci.retrieve_or_fetch_entity(ds)
-            bg = lci[proxy]
-            print('LCI: %s' % bg)
+        count = 0
+        for p_id in sorted(wanted):
+            bg = lci[p_id]
+            if bg is None:
+                print('No LCI dataset found for %s' % p_id)
+                continue
+            self._lci_store.put(p_id, process_record(bg))
             self.bg.add_entity_and_children(bg)
-            self.bg.write_to_file(self._lci_cache, gzip=True, exchanges=True, values=True, characterizations=True)
-        return bg
+            count += 1
+        return count
 
     def lcia_validation_proxy(self, proxy):
         for ds in self.lcia.list_datasets(proxy):
@@ -13,16 +13,19 @@ from __future__ import print_function, unicode_literals
 import eight
 import uuid
 import re
+from collections import namedtuple
 
 from lxml import objectify
 # from lxml.etree import tostring
 
+from lcatools import tracing
 from lcatools.archives import LcArchive
 from lcatools.entities import LcQuantity, LcFlow, LcProcess
 from lcatools.interact import parse_math
 # from lcatools.exchanges import DirectionlessExchangeError
 
 from .file_store import FileStore
+from .parse_cache import ParseCache
 from .xml_widgets import find_tag
 
 tail = re.compile('/([^/]+)$')
@@ -50,6 +53,16 @@ conversion_dict = {
 }
 
 
+# plain records parsed from a dataset; picklable so that they can be kept in a ParseCache
+EcospoldV1Flow = namedtuple('EcospoldV1Flow', ('number', 'name', 'unit', 'comment', 'cas', 'compartment'))
+EcospoldV1Exchange = namedtuple('EcospoldV1Exchange', ('flow', 'direction', 'is_ref', 'value', 'comment'))
+EcospoldV1Process = namedtuple('EcospoldV1Process', ('name', 'spatial_scope', 'temporal_scope', 'comment',
+                                                     'classifications', 'exchanges'))
+
+# bump whenever the records or the parsing that produces them change, to invalidate parse caches
+RECORD_VERSION = 1
+
+
 def not_none(x):
     return x if x is not None else ''
 
@@ -68,12 +81,13 @@ class EcospoldV1Archive(LcArchive):
     nsmap = 'http://www.EcoInvent.org/EcoSpold01'  # only valid for v1 ecospold files
     spold_version = tail.search(nsmap).groups()[0]
 
-    def __init__(self, source, prefix=None, ns_uuid=None, **kwargs):
+    def __init__(self, source, prefix=None, ns_uuid=None, parse_cache=None, **kwargs):
         """
         Just instantiates the parent class.
         :param source: physical data source
         :param prefix: difference between the internal path (ref) and the ILCD base
         :param ns_uuid: NS UUID not allowed for ecospold ve
+        :param parse_cache: [None] directory in which to keep parsed datasets between sessions (see ParseCache)
         :return:
         """
         if ns_uuid is None:
@@ -83,6 +97,11 @@ class EcospoldV1Archive(LcArchive):
             self._serialize_dict['prefix'] = prefix
         self._q_dict = dict()
         self._archive = FileStore(self.source, internal_prefix=prefix)
+        if parse_cache is None:
+            self._parse_cache = None
+        else:
+            self._parse_cache = ParseCache(parse_cache, self._archive,
+                                           '%s:%d' % (self.__class__.__name__, RECORD_VERSION))
 
     def list_datasets(self):
         assert self._archive.remote is False, "Cannot list objects for remote archives"
@@ -105,7 +124,9 @@ class EcospoldV1Archive(LcArchive):
         return s
 
     def _get_objectified_entity(self, filename):
-        o = objectify.fromstring(self._fetch_filename(filename))
+        st = self._fetch_filename(filename)
+        with tracing.span('provider', 'EcospoldV1.parse', self.ref, file=filename):
+            o = objectify.fromstring(st)
         if o.nsmap[None] != self.nsmap:
             raise EcospoldVersionError('This class is for EcoSpold v%s only!' % self.nsmap[-2:])
         return o
@@ -131,14 +152,22 @@ class EcospoldV1Archive(LcArchive):
 
         return q
 
-    def _create_flow(self, exch):
+    @staticmethod
+    def _flow_record(exch):
         """
         An ecospold01 exchange is really just a long attribute list, plus an inputGroup or outputGroup (ignored here)
         :param exch:
-        :return:
+        :return: an EcospoldV1Flow
         """
-        number = int(exch.get('number'))
-        uid = self._key_to_nsuuid(number)
+        return EcospoldV1Flow(int(exch.get('number')), exch.get("name"), exch.get("unit"),
+                              not_none(exch.get("generalComment")), not_none(exch.get("CASNumber")),
+                              [exch.get('category'), exch.get('subCategory')])
+
+    def _create_flow(self, exch):
+        return self._flow_from_record(self._flow_record(exch))
+
+    def _flow_from_record(self, rec):
+        uid = self._key_to_nsuuid(rec.number)
         try_f = self[uid]
         if try_f is not None:
             f = try_f
@@ -146,19 +175,15 @@ class EcospoldV1Archive(LcArchive):
 
         else:
             # generate flow
-            n = exch.get("name")
-            q = self._create_quantity(exch.get("unit"))
-            c = not_none(exch.get("generalComment"))
-            cas = not_none(exch.get("CASNumber"))
-            cat = [exch.get('category'), exch.get('subCategory')]
+            q = self._create_quantity(rec.unit)
 
-            f = LcFlow(uid, Name=n, CasNumber=cas, Comment=c, Compartment=cat)
+            f = LcFlow(uid, Name=rec.name, CasNumber=rec.cas, Comment=rec.comment, Compartment=rec.compartment)
             f.add_characterization(q, reference=True)
-            f.set_external_ref(number)
+            f.set_external_ref(rec.number)
             self.add(f)
 
-        if exch.get("unit") != f.unit():
-            local_q = self._create_quantity(exch.get("unit"))
+        if rec.unit != f.unit():
+            local_q = self._create_quantity(rec.unit)
             if not f.has_characterization(local_q):
                 if (f.unit(), local_q.unit()) in conversion_dict:
                     val = conversion_dict[(f.unit(), local_q.unit())]
@@ -170,48 +195,89 @@ class EcospoldV1Archive(LcArchive):
                 f.add_characterization(local_q, value=val)
         return f
 
-    def _extract_exchanges(self, o):
-        rf = set()  # reference flows
-        flowlist = []
-
+    @classmethod
+    def _exchange_records(cls, o):
+        exchs = []
         for exch in o.dataset.flowData.getchildren():
-            f = self._create_flow(exch)
+            is_ref = False
             if hasattr(exch, 'outputGroup'):
                 d = 'Output'
                 if exch.outputGroup == 0 or exch.outputGroup == 2:
-                    rf.add(f)
+                    is_ref = True
             elif hasattr(exch, 'OutputGroup'):
                 d = 'Output'
                 if exch.OutputGroup == 0 or exch.OutputGroup == 2:
-                    rf.add(f)
+                    is_ref = True
             elif hasattr(exch, 'inputGroup'):
                 d = 'Input'
             elif hasattr(exch, 'InputGroup'):
                 d = 'Input'
             else:
+                d = None  # directionless; reported and dropped in _extract_exchanges
+                # raise DirectionlessExchangeError(tostring(exch))
+            if d is None:
+                v = None
+            else:
+                v = float(exch.get('meanValue'))  # returns none if missing
+            exchs.append(EcospoldV1Exchange(cls._flow_record(exch), d, is_ref, v, exch.get('generalComment')))
+        return exchs
+
+    def _extract_exchanges(self, exchs):
+        """
+        :param exchs: list of EcospoldV1Exchange records
+        :return: list of reference flows, list of (flow, direction, value, comment)
+        """
+        rf = []  # reference flows
+        flowlist = []
+
+        for exch in exchs:
+            f = self._flow_from_record(exch.flow)
+            if exch.is_ref and f not in rf:
+                rf.append(f)
+            if exch.direction is None:
                 print('Abandoning directionless exchange for flow %s' % f)
                 continue
-                # raise DirectionlessExchangeError(tostring(exch))
-            local_q = self._create_quantity(exch.get("unit"))
-            v = float(exch.get('meanValue'))  # returns none if missing
+            local_q = self._create_quantity(exch.flow.unit)
+            v = exch.value
             if local_q is not f.reference_entity:
                 v = v / f.cf(local_q)
-            c = exch.get('generalComment')
-            flowlist.append((f, d, v, c))
+            flowlist.append((f, exch.direction, v, exch.comment))
         return rf, flowlist
 
+    @classmethod
+    def _process_record(cls, o):
+        """
+        Parse an objectified dataset into an EcospoldV1Process record
+        :param o:
+        :return:
+        """
+        p_meta = o.dataset.metaInformation.processInformation
+        n = p_meta.referenceFunction.get('name')
+        g = p_meta.geography.get('location')
+        stt = {'begin': str(find_tag(p_meta, 'startDate')), 'end': str(find_tag(p_meta, 'endDate'))}
+
+        c = p_meta.referenceFunction.get('generalComment')
+
+        cl = [p_meta.referenceFunction.get('category'), p_meta.referenceFunction.get('subCategory')]
+        return EcospoldV1Process(n, g, stt, c, cl, cls._exchange_records(o))
+
+    def _read_process(self, filename):
+        def _parse(fn):
+            return self._process_record(self._get_objectified_entity(fn))
+
+        if self._parse_cache is None:
+            return _parse(filename)
+        return self._parse_cache.get_or_parse(filename, _parse)
+
     def _create_process(self, filename):
         """
         Extract dataset object from XML file
         :param filename:
         :return:
         """
-        o = self._get_objectified_entity(filename)
-
-        p_meta = o.dataset.metaInformation.processInformation
-        n = p_meta.referenceFunction.get('name')
+        rec = self._read_process(filename)
 
-        u = self._key_to_nsuuid(n)
+        u = self._key_to_nsuuid(rec.name)
 
         try_p = self[u]
         if try_p is not None:
@@ -220,17 +286,11 @@ class EcospoldV1Archive(LcArchive):
 
         else:
             # create new process
-            g = p_meta.geography.get('location')
-            stt = {'begin': str(find_tag(p_meta, 'startDate')), 'end': str(find_tag(p_meta, 'endDate'))}
-
-            c = p_meta.referenceFunction.get('generalComment')
-
-            cls = [p_meta.referenceFunction.get('category'), p_meta.referenceFunction.get('subCategory')]
-            p = LcProcess(u, Name=n, Comment=c, SpatialScope=g, TemporalScope=stt,
-                          Classifications=cls)
-            p.set_external_ref(n)
+            p = LcProcess(u, Name=rec.name, Comment=rec.comment, SpatialScope=rec.spatial_scope,
+                          TemporalScope=rec.temporal_scope, Classifications=rec.classifications)
+            p.set_external_ref(rec.name)
 
-            rf, flowlist = self._extract_exchanges(o)
+            rf, flowlist = self._extract_exchanges(rec.exchanges)
 
             for flow, f_dir, val, cmt in flowlist:
                 self._print('Exch %s [%s] (%g)' % (flow, f_dir, val))
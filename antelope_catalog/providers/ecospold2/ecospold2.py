@@ -4,13 +4,15 @@ Import ecospold2 files
 
 from __future__ import print_function, unicode_literals
 
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from time import time
 
 import six
 from lxml import objectify
 from lxml.etree import XMLSyntaxError
 
+from lcatools import tracing
 from lcatools.interfaces import uuid_regex
 from lcatools.characterizations import Characterization
 from lcatools.entities import LcQuantity, LcFlow, LcProcess
@@ -18,6 +20,7 @@ from lcatools.exchanges import ExchangeValue, DirectionlessExchangeError
 from lcatools.lcia_results import LciaResult, LciaResults
 from ..ecospold import tail
 from ..file_store import FileStore
+from ..parse_cache import ParseCache
 from lcatools.archives import LcArchive
 from ..xml_widgets import *
 
@@ -31,6 +34,20 @@ if six.PY2:
 EcospoldExchange = namedtuple('EcospoldExchange', ('flow', 'direction', 'value', 'termination', 'is_ref', 'comment'))
 EcospoldLciaResult = namedtuple('EcospoldLciaResult', ('Method', 'Category', 'Indicator', 'score'))
 
+# plain records produced by parsing a dataset; picklable so that parsing can be done in worker processes
+EcospoldFlow = namedtuple('EcospoldFlow', ('uuid', 'name', 'cas', 'compartment', 'unit_uuid', 'unitstring'))
+EcospoldActivity = namedtuple('EcospoldActivity', ('uuid', 'name', 'comment', 'spatial_scope', 'temporal_scope',
+                                                   'classifications', 'parent'))
+EcospoldDataset = namedtuple('EcospoldDataset', ('process', 'ref_flow', 'exchanges'))
+
+
+# bump whenever the record layout above or the parsing that produces it changes, to invalidate parse caches
+RECORD_VERSION = 1
+
+
+def spold_filename(process_uuid, rf_uuid):
+    return '%s_%s.spold' % (process_uuid.lower(), rf_uuid.lower())
+
 
 def spold_reference_flow(filename):
     """
@@ -63,13 +80,14 @@ class EcospoldV2Archive(LcArchive):
     nsmap = 'http://www.EcoInvent.org/EcoSpold02'  # only valid for v1 ecospold files
     spold_version = tail.search(nsmap).groups()[0]
 
-    def __init__(self, source, prefix=None, linked=True, **kwargs):
+    def __init__(self, source, prefix=None, linked=True, parse_cache=None, **kwargs):
         """
         Just instantiates the parent class.
         :param source: physical data source
         :param prefix: relative path for datasets from the archive root
         :param linked: [True] whether the archive includes unlinked or linked datasets. Reference exchanges
         get detected differently in one case versus the other (see _create_process)
+        :param parse_cache: [None] directory in which to keep parsed datasets between sessions (see ParseCache)
         :return:
         """
         super(EcospoldV2Archive, self).__init__(source, **kwargs)
@@ -78,6 +96,10 @@ class EcospoldV2Archive(LcArchive):
 
         self._archive = FileStore(self.source, internal_prefix=prefix)
         self._linked = linked
+        if parse_cache is None:
+            self._parse_cache = None
+        else:
+            self._parse_cache = ParseCache(parse_cache, self._archive, self._cache_namespace(linked))
         self._process_flow_map = defaultdict(set)
         self._terminations = defaultdict(set)
         self._map_datasets()
@@ -103,11 +125,30 @@ class EcospoldV2Archive(LcArchive):
             raise FileNotFoundError
         return st
 
-    def _map_datasets(self):
+    def _build_dataset_map(self):
+        """
+        :return: list of (process uuid, [reference flow uuids]), in archive order
+        """
+        dataset_map = OrderedDict()
         for f in self.list_datasets():
             p, r = spold_reference_flow(f)
-            self._process_flow_map[p].add(r)
-            self._terminations[r].add(p)
+            dataset_map.setdefault(p, []).append(r)
+        return list(dataset_map.items())
+
+    def _map_datasets(self):
+        """
+        Map processes to their reference flows, from the dataset filenames.  If a parse cache is in use, the map is
+        kept there, keyed on the archive's signature, so that reopening an unchanged archive does not enumerate it.
+        :return:
+        """
+        if self._parse_cache is None:
+            dataset_map = self._build_dataset_map()
+        else:
+            dataset_map = self._parse_cache.get_or_build_index('.dataset-map', self._build_dataset_map)
+        for p, rs in dataset_map:
+            for r in rs:
+                self._process_flow_map[p].add(r)
+                self._terminations[r].add(p)
 
     @property
     def ti(self):
@@ -131,33 +172,75 @@ class EcospoldV2Archive(LcArchive):
         for x in self._archive.listfiles(in_prefix=startswith):
             yield x
 
-    def _get_objectified_entity(self, filename):
+    @classmethod
+    def _objectify_string(cls, st, filename):
         try:
-            o = objectify.fromstring(self._fetch_filename(filename))
-        except FileNotFoundError:
-            raise
+            with tracing.span('provider', 'EcospoldV2.parse', file=filename):
+                o = objectify.fromstring(st)
         except ValueError:
             print('failed on :%s:' % filename)
             return None
-        if o.nsmap[None] != self.nsmap:
-            raise EcospoldV2Error('This class is for EcoSpold v%s only!' % self.nsmap[-2:])
+        if o.nsmap[None] != cls.nsmap:
+            raise EcospoldV2Error('This class is for EcoSpold v%s only!' % cls.nsmap[-2:])
         return o
 
-    def _get_objectified_entity_with_lt_gt(self, filename):
+    @classmethod
+    def _objectify_file(cls, fetch, filename):
+        """
+        Objectify a spold file, retrying with escaped < and > signs if the file is not well-formed.
+        :param fetch: callable that maps filename to file content
+        :param filename:
+        :return:
+        """
         try:
-            f = self._fetch_filename(filename)
-            f = re.sub(' < ', ' &lt; ', re.sub(' > ', ' &gt; ', f.decode()))
-            o = objectify.fromstring(f)
-        except ValueError:
-            print('failed on :%s:' % filename)
-            return None
-        except TypeError:
-            print('failed on :%s:' % filename)
-            raise
-        if o.nsmap[None] != self.nsmap:
-            raise EcospoldV2Error('This class is for EcoSpold v%s only!' % self.nsmap[-2:])
+            o = cls._objectify_string(fetch(filename), filename)
+        except XMLSyntaxError:
+            print('  !!XMLSyntaxError-- trying to escape < and > signs')
+            try:
+                f = re.sub(' < ', ' &lt; ', re.sub(' > ', ' &gt; ', fetch(filename).decode()))
+            except TypeError:
+                print('failed on :%s:' % filename)
+                raise
+            try:
+                o = cls._objectify_string(f, filename)
+            except XMLSyntaxError:
+                print('  !!Failed loading %s' % filename)
+                raise
         return o
 
+    @classmethod
+    def _cache_namespace(cls, linked):
+        return '%s:%d:%s' % (cls.__name__, RECORD_VERSION, 'linked' if linked else 'unlinked')
+
+    @classmethod
+    def _read_dataset(cls, fetch, cache, process_uuid, ref_uuid, linked=True, exchanges=True):
+        """
+        Parse the dataset file for a (process, reference) pair into an EcospoldDataset record, consulting the parse
+        cache first if one is given.  Cached records always include exchanges.
+        :param fetch: callable that maps filename to file content
+        :param cache: a ParseCache or None
+        :param process_uuid:
+        :param ref_uuid:
+        :param linked:
+        :param exchanges:
+        :return:
+        """
+        def _parse(filename):
+            o = cls._objectify_file(fetch, filename)
+            return cls._dataset_record(o, ref_uuid, linked=linked, exchanges=exchanges or cache is not None)
+
+        filename = spold_filename(process_uuid, ref_uuid)
+        if cache is None:
+            return _parse(filename)
+        return cache.get_or_parse(filename, _parse)
+
+    def _get_objectified_entity(self, filename):
+        return self._objectify_string(self._fetch_filename(filename), filename)
+
+    @staticmethod
+    def _quantity_record(exchange):
+        return exchange.attrib['unitId'], exchange.unitName.text
+
     def _create_quantity(self, exchange):
         """
         In ecospold v2, quantities are still only units, defined by string.  They do get their own uuids, but only
@@ -166,8 +249,9 @@ class EcospoldV2Archive(LcArchive):
         :param exchange:
         :return:
         """
-        unitstring = exchange.unitName.text
-        unit_uuid = exchange.attrib['unitId']
+        return self._quantity_from_record(*self._quantity_record(exchange))
+
+    def _quantity_from_record(self, unit_uuid, unitstring):
         try_q = self[unit_uuid]
         if try_q is None:
             ref_unit, _ = self._create_unit(unitstring)
@@ -194,36 +278,48 @@ class EcospoldV2Archive(LcArchive):
         else:
             return []
 
-    def _create_flow(self, exchange):
+    @classmethod
+    def _flow_record(cls, exchange):
         """
-        makes a flow entity and adds to the db
+        Extracts the flow properties from an exchange element into a picklable EcospoldFlow record
         :param exchange:
         :return:
         """
         if 'intermediate' in exchange.tag:
             uid = exchange.attrib['intermediateExchangeId']
-            cat = [self._cls_to_text(exchange.classification)]
+            cat = [cls._cls_to_text(exchange.classification)]
         elif 'elementary' in exchange.tag:
             uid = exchange.attrib['elementaryExchangeId']
-            cat = self._cat_to_text(exchange.compartment)
+            cat = cls._cat_to_text(exchange.compartment)
         else:
             raise AttributeError('No exchange type found for id %s' % exchange.attrib['id'])
 
-        f = self[uid]
-        if f is not None:
-            return f
-
         if 'casNumber' in exchange.attrib:
             cas = exchange.attrib['casNumber']
         else:
             cas = ''
 
-        q = self._create_quantity(exchange)
+        unit_uuid, unitstring = cls._quantity_record(exchange)
+        return EcospoldFlow(uid, exchange.name.text, cas, cat, unit_uuid, unitstring)
+
+    def _create_flow(self, exchange):
+        """
+        makes a flow entity and adds to the db
+        :param exchange:
+        :return:
+        """
+        return self._flow_from_record(self._flow_record(exchange))
+
+    def _flow_from_record(self, rec):
+        f = self[rec.uuid]
+        if f is not None:
+            return f
+
+        q = self._quantity_from_record(rec.unit_uuid, rec.unitstring)
 
-        n = exchange.name.text
         c = 'EcoSpold02 Flow'
 
-        f = LcFlow(uid, Name=n, CasNumber=cas, Comment=c, Compartment=cat)
+        f = LcFlow(rec.uuid, Name=rec.name, CasNumber=rec.cas, Comment=c, Compartment=rec.compartment)
         f.add_characterization(quantity=q, reference=True)
 
         self.add(f)
@@ -255,39 +351,63 @@ class EcospoldV2Archive(LcArchive):
             c = 'no comment.'
         return c
 
-    def _create_process_entity(self, o):
+    @classmethod
+    def _activity_record(cls, o):
         """
-        Constructs the process without populating exchanges
+        Extracts the process properties from an objectified dataset into a picklable EcospoldActivity record
         :param o:
         :return:
         """
         ad = find_tag(o, 'activityDescription')
 
         u = ad.activity.get('id')
-
-        if self[u] is not None:
-            return self[u]
-
         n = find_tag(ad, 'activityName').text
 
-        c = self._get_process_comment(ad, u)
+        c = cls._get_process_comment(ad, u)
 
         g = find_tag(ad, 'geography').shortname.text
 
         tp = find_tag(ad, 'timePeriod')
         stt = {'begin': tp.get('startDate'), 'end': tp.get('endDate')}
-        cls = [self._cls_to_text(i) for i in find_tags(ad, 'classification')]
-
-        p = LcProcess(u, Name=n, Comment=c, SpatialScope=g, TemporalScope=stt,
-                      Classifications=cls)
+        cl = [cls._cls_to_text(i) for i in find_tags(ad, 'classification')]
 
         parent = find_tag(o, 'activity').get('parentActivityId')
-        if parent is not None:
-            p['ParentActivityId'] = parent
+        return EcospoldActivity(u, n, c, g, stt, cl, parent)
+
+    def _create_process_entity(self, o):
+        """
+        Constructs the process without populating exchanges
+        :param o:
+        :return:
+        """
+        u = find_tag(o, 'activityDescription').activity.get('id')
+
+        if self[u] is not None:
+            return self[u]
+
+        return self._process_from_record(self._activity_record(o))
+
+    def _process_from_record(self, rec):
+        if self[rec.uuid] is not None:
+            return self[rec.uuid]
+
+        p = LcProcess(rec.uuid, Name=rec.name, Comment=rec.comment, SpatialScope=rec.spatial_scope,
+                      TemporalScope=rec.temporal_scope, Classifications=rec.classifications)
+
+        if rec.parent is not None:
+            p['ParentActivityId'] = rec.parent
 
         self.add(p)
         return p
 
+    @classmethod
+    def _reference_flow_record(cls, o, rf_uuid):
+        for x in find_tag(o, 'flowData').getchildren():
+            if 'intermediate' in x.tag:
+                if x.attrib['intermediateExchangeId'] == rf_uuid:
+                    return cls._flow_record(x)
+        return None
+
     def _grab_reference_flow(self, o, rf_uuid):
         """
         Create a reference exchange from the flowdata
@@ -295,16 +415,16 @@ class EcospoldV2Archive(LcArchive):
         :param rf_uuid:
         :return:
         """
-        for x in find_tag(o, 'flowData').getchildren():
-            if 'intermediate' in x.tag:
-                if x.attrib['intermediateExchangeId'] == rf_uuid:
-                    return self._create_flow(x)
+        rec = self._reference_flow_record(o, rf_uuid)
+        if rec is None:
+            raise KeyError('Noted reference exchange %s not found!' % rf_uuid)
+        return self._flow_from_record(rec)
 
-        raise KeyError('Noted reference exchange %s not found!' % rf_uuid)
-
-    def _collect_exchanges(self, o, ref_uuid):
+    @classmethod
+    def _exchange_records(cls, o, ref_uuid):
         """
-
+        Extracts exchanges from an objectified dataset as EcospoldExchange records whose flows are EcospoldFlow
+        records
         :param o:
         :param ref_uuid: strictly for diagnostic purposes
         :return:
@@ -317,7 +437,7 @@ class EcospoldV2Archive(LcArchive):
             if 'impactIndicator' in exch.tag:
                 continue
 
-            f = self._create_flow(exch)
+            f = cls._flow_record(exch)
             is_ref = False
             if hasattr(exch, 'outputGroup'):
                 d = 'Output'
@@ -325,9 +445,9 @@ class EcospoldV2Archive(LcArchive):
                 if og == 0:
                     is_ref = True
                 elif og == 2:  # 1, 3 not used
-                    for cls in find_tags(exch, 'classification'):
-                        if cls.classificationSystem == 'By-product classification':
-                            if str(cls.classificationValue).startswith('allocat'):
+                    for cls_tag in find_tags(exch, 'classification'):
+                        if cls_tag.classificationSystem == 'By-product classification':
+                            if str(cls_tag.classificationValue).startswith('allocat'):
                                 is_ref = True
             elif hasattr(exch, 'inputGroup'):
                 d = 'Input'
@@ -347,6 +467,36 @@ class EcospoldV2Archive(LcArchive):
             flowlist.append(EcospoldExchange(f, d, v, t, is_ref, c))
         return flowlist
 
+    def _collect_exchanges(self, o, ref_uuid):
+        """
+
+        :param o:
+        :param ref_uuid: strictly for diagnostic purposes
+        :return:
+        """
+        return [exch._replace(flow=self._flow_from_record(exch.flow)) for exch in self._exchange_records(o, ref_uuid)]
+
+    @classmethod
+    def _dataset_record(cls, o, ref_uuid, linked=True, exchanges=True):
+        """
+        Parses an objectified dataset into a plain EcospoldDataset record, without touching any archive.  This is
+        the part of loading that can be farmed out to worker processes (see _load_all).
+        :param o:
+        :param ref_uuid:
+        :param linked:
+        :param exchanges:
+        :return:
+        """
+        if linked:
+            rf = cls._reference_flow_record(o, ref_uuid)
+        else:
+            rf = None
+        if exchanges:
+            exchs = cls._exchange_records(o, ref_uuid)
+        else:
+            exchs = []
+        return EcospoldDataset(cls._activity_record(o), rf, exchs)
+
     @staticmethod
     def _collect_impact_scores(o):  # , process, flow):
         """
@@ -369,20 +519,9 @@ class EcospoldV2Archive(LcArchive):
         return scores
 
     def objectify(self, process_uuid, rf_uuid):
-        filename = '%s_%s.spold' % (process_uuid.lower(), rf_uuid.lower())
+        filename = spold_filename(process_uuid, rf_uuid)
         self._print('\nObjectifying %s' % filename)
-        try:
-            o = self._get_objectified_entity(filename)
-        except FileNotFoundError:
-            raise
-        except XMLSyntaxError:
-            print('  !!XMLSyntaxError-- trying to escape < and > signs')
-            try:
-                o = self._get_objectified_entity_with_lt_gt(filename)
-            except XMLSyntaxError:
-                print('  !!Failed loading %s' % filename)
-                raise
-        return o
+        return self._objectify_file(self._fetch_filename, filename)
 
     def _create_process_and_single_reference(self, process_uuid, ref_uuid, exchanges=True):
         """
@@ -398,31 +537,43 @@ class EcospoldV2Archive(LcArchive):
         :param ref_uuid: uuid of reference flow
         :return:
         """
-        p = self[process_uuid]
-        if p is not None:
-            if p.has_reference(ref_uuid):
-                return p
+        if self._has_dataset(process_uuid, ref_uuid):
+            return self[process_uuid]
 
+        self._print('\nReading %s' % spold_filename(process_uuid, ref_uuid))
         try:
-            o = self.objectify(process_uuid, ref_uuid)
+            ds = self._read_dataset(self._fetch_filename, self._parse_cache, process_uuid, ref_uuid,
+                                    linked=self._linked, exchanges=exchanges)
         except KeyError:
             raise FileNotFoundError
 
-        p = self._create_process_entity(o)
+        return self._add_dataset(ds, ref_uuid, exchanges=exchanges)
+
+    def _add_dataset(self, ds, ref_uuid, exchanges=True):
+        """
+        Builds entities from a parsed EcospoldDataset record and adds them to the archive.
+        :param ds: an EcospoldDataset
+        :param ref_uuid: uuid of reference flow
+        :param exchanges:
+        :return:
+        """
+        p = self._process_from_record(ds.process)
 
         if p.has_reference(ref_uuid):
-            self._print('Process %s already has reference %s' % (process_uuid, ref_uuid))
+            self._print('Process %s already has reference %s' % (p.external_ref, ref_uuid))
             return p
 
         if self._linked:
-            rf = self._grab_reference_flow(o, ref_uuid)
+            if ds.ref_flow is None:
+                raise KeyError('Noted reference exchange %s not found!' % ref_uuid)
+            rf = self._flow_from_record(ds.ref_flow)
             p.add_exchange(rf, 'Output')  # this should get overwritten with an ExchangeValue later
             rx = p.add_reference(rf, 'Output')
             self._print('# Identified reference exchange\n %s' % rx)
         else:
             rx = None
         if exchanges:
-            for exch in self._collect_exchanges(o, ref_uuid):
+            for exch in ds.exchanges:
                 """
                 If the dataset is linked, all we do is load non-zero exchanges, ideally all with terminations.  Spurious
                  terminations in reference exchanges are dropped (deprecated EI linker feature)
@@ -434,9 +585,10 @@ class EcospoldV2Archive(LcArchive):
                 muck with the data at that stage.
 
                 """
+                flow = self._flow_from_record(exch.flow)
                 if exch.value == 0 and self._linked:
                     continue
-                self._print('## Exch %s [%s] (%g)' % (exch.flow, exch.direction, exch.value))
+                self._print('## Exch %s [%s] (%g)' % (flow, exch.direction, exch.value))
 
                 term = exch.termination
                 is_ref = exch.is_ref
@@ -445,22 +597,22 @@ class EcospoldV2Archive(LcArchive):
                     if exch.termination is not None:
                         if self._linked:
                             print('Squashing bad termination in linked reference exchange, %s\nFlow %s Term %s' % (
-                                p.get_uuid(), exch.flow.get_uuid(), exch.termination))
+                                p.get_uuid(), flow.get_uuid(), exch.termination))
                             term = None
                         else:
                             print('Removing reference status from linked reference exchange, %s\nFlow %s Term %s' % (
-                                p.get_uuid(), exch.flow.get_uuid(), exch.termination))
+                                p.get_uuid(), flow.get_uuid(), exch.termination))
                             is_ref = False
 
-                x = p.add_exchange(exch.flow, exch.direction, reference=rx, value=exch.value,
+                x = p.add_exchange(flow, exch.direction, reference=rx, value=exch.value,
                                    termination=term)
                 if len(exch.comment) > 0:
                     x.comment = exch.comment
 
                 if not self._linked:
                     if is_ref:
-                        self._print('## ## Exch is reference %s %s' % (exch.flow, exch.direction))
-                        p.add_reference(exch.flow, exch.direction)
+                        self._print('## ## Exch is reference %s %s' % (flow, exch.direction))
+                        p.add_reference(flow, exch.direction)
         return p
 
     def find_tag(self, process_uuid, rf_uuid, tag):
@@ -553,15 +705,84 @@ class EcospoldV2Archive(LcArchive):
 
         return results
 
-    def _load_all(self, exchanges=True):
+    def _load_all(self, exchanges=True, workers=None):
+        """
+        Load every dataset in the archive.
+        :param exchanges: [True] whether to load non-reference exchanges
+        :param workers: [None] if greater than 1, parse datasets in that many worker processes.  The workers only
+         produce EcospoldDataset records; entities are created in this process, in the same order as a serial load,
+         so the result is identical.  Ignored for remote archives.
+        :return:
+        """
         now = time()
         count = 0
+        if workers is not None and workers > 1 and not self._archive.remote:
+            pending = [(p_u, r_u) for p_u, r_set in self._process_flow_map.items() for r_u in r_set
+                       if not self._has_dataset(p_u, r_u)]
+            datasets = self._parse_datasets(pending, workers, exchanges)
+            pending = set(pending)
+        else:
+            pending = datasets = None
         for p_u, r_set in self._process_flow_map.items():
             for r_u in r_set:
-                self._create_process_and_single_reference(p_u, r_u, exchanges=exchanges)
+                if datasets is None:
+                    self._create_process_and_single_reference(p_u, r_u, exchanges=exchanges)
+                elif (p_u, r_u) in pending:
+                    self._add_dataset(next(datasets), r_u, exchanges=exchanges)
             count += 1
             if count % 100 == 0:
                 print(' Loaded %d processes (t=%.2f s)' % (count, time()-now))
 
         print(' Loaded %d processes (t=%.2f s)' % (count, time() - now))
         self.check_counter()
+
+    def _has_dataset(self, process_uuid, ref_uuid):
+        p = self[process_uuid]
+        return p is not None and p.has_reference(ref_uuid)
+
+    def _parse_datasets(self, pending, workers, exchanges):
+        """
+        Generates EcospoldDataset records for a list of (process, reference) pairs, in order, parsed in a pool of
+        worker processes.  Each worker opens its own FileStore.
+        :param pending: list of (process uuid, reference flow uuid) 2-tuples
+        :param workers:
+        :param exchanges:
+        :return:
+        """
+        if len(pending) == 0:
+            return
+        tasks = [(p_u, r_u, self._linked, exchanges) for p_u, r_u in pending]
+        chunksize = max(1, len(tasks) // (workers * 16))
+        if self._parse_cache is None:
+            cache_args = None
+        else:
+            cache_args = (self._parse_cache.cache_dir, self._cache_namespace(self._linked))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_spold_worker,
+                                 initargs=(self.source, self._serialize_dict.get('prefix'),
+                                           cache_args)) as executor:
+            for ds in executor.map(_parse_spold_worker, tasks, chunksize=chunksize):
+                yield ds
+
+
+_worker_store = None
+_worker_cache = None
+
+
+def _init_spold_worker(source, prefix, cache_args):
+    global _worker_store, _worker_cache
+    _worker_store = FileStore(source, internal_prefix=prefix)
+    if cache_args is not None:
+        _worker_cache = ParseCache(cache_args[0], _worker_store, cache_args[1])
+
+
+def _worker_fetch(filename):
+    st = _worker_store.readfile(filename)
+    if st is None:
+        raise FileNotFoundError
+    return st
+
+
+def _parse_spold_worker(task):
+    p_u, r_u, linked, exchanges = task
+    return EcospoldV2Archive._read_dataset(_worker_fetch, _worker_cache, p_u, r_u, linked=linked,
+                                           exchanges=exchanges)
@@ -4,10 +4,11 @@ import os
 import re
 import posixpath
 import magic
+from collections import OrderedDict
 
 
 from py7zlib import Archive7z
-from zipfile import ZipFile
+from zipfile import ZipFile, ZIP_DEFLATED
 try:
     from urllib.request import urlopen
     from urllib.parse import urljoin
@@ -62,7 +63,32 @@ class FileStore(object):
             archive = False
         return archive
 
-    def __init__(self, path, internal_prefix=None, query_string=None, cache=True):
+    @staticmethod
+    def _signature_7z(path):
+        st = os.stat(path)
+        return ('7z:%d:%d' % (st.st_mtime_ns, st.st_size)).encode('utf-8')
+
+    @classmethod
+    def _access_transcoded(cls, path):
+        """
+        Open the random-access copy of a 7z archive made by transcode(), if there is one and it was made from the
+        archive's current contents.
+        :param path: path to the 7z archive
+        :return: a ZipFile or None
+        """
+        t_path = path + '.idx.zip'
+        if not os.path.exists(t_path):
+            return None
+        try:
+            archive = ZipFile(t_path)
+        except (OSError, ValueError):
+            return None
+        if archive.comment != cls._signature_7z(path):
+            archive.close()
+            return None
+        return archive
+
+    def __init__(self, path, internal_prefix=None, query_string=None, cache=True, read_cache_size=0):
         """
         Create a FileStore object from a path.  Basically encapsulates the compression algorithm and presents
         a common interface to client code:
@@ -81,11 +107,17 @@ class FileStore(object):
          from responses).
         :param query_string: for remote repositories, append the supplied string after '?' in the URL
         :param cache: (True) for remote repositories, cache downloaded files locally and use first
+        :param read_cache_size: (0) for compressed archives, keep up to this many bytes of recently read members in
+         memory
         :return: an archive object
         """
 
         self.path = path
         self._internal_prefix = internal_prefix
+        self._members = None  # raw member names of a compressed archive, in archive order
+        self._read_cache = OrderedDict()
+        self._read_cache_size = read_cache_size
+        self._read_cache_bytes = 0
 
         if bool(protocol.search(path)):
             self.ext = protocol.search(path).groups()[0]
@@ -130,10 +162,18 @@ class FileStore(object):
             self.compressed = True
             self.ext = get_ext(path)
             print('Found Extension: %s' % self.ext)
-            self._archive = {
-                '7z': self._access_7z,
-                'zip': self._access_zip
-            }[self.ext](path)
+            transcoded = None
+            if self.ext == '7z':
+                transcoded = self._access_transcoded(path)
+            if transcoded is not None:
+                print('Using random-access copy %s' % transcoded.filename)
+                self.ext = 'zip'
+                self._archive = transcoded
+            else:
+                self._archive = {
+                    '7z': self._access_7z,
+                    'zip': self._access_zip
+                }[self.ext](path)
             self.OK = self._archive is not False
             if self.OK:
                 self._internal_subfolders = {
@@ -184,7 +224,69 @@ class FileStore(object):
     def _de_prefix(self, file):
         if self._internal_prefix is None:
             return file
-        return re.sub('^' + self.pathtype.join(self._internal_prefix, ''), '', file)
+        prefix = self.pathtype.join(self._internal_prefix, '')
+        if file.startswith(prefix):
+            return file[len(prefix):]
+        return file
+
+    @property
+    def random_access(self):
+        """
+        False only for 7z archives, where reading a member may require decompressing its whole solid block
+        """
+        return not (self.compressed and self.ext == '7z')
+
+    def _member_index(self):
+        """
+        Names of all members of a compressed archive (not directory entries), computed once
+        :return:
+        """
+        if self._members is None:
+            if self.ext == '7z':
+                self._members = [q.filename for q in self._archive.files]
+            elif self.ext == 'zip':
+                self._members = [q for q in self._archive.namelist() if q[:-1] not in self._internal_subfolders]
+            else:
+                self._members = []
+        return self._members
+
+    def transcode(self):
+        """
+        Make a random-access copy of a 7z archive: a zip file alongside it (path + '.idx.zip') in which every member
+        is compressed separately, so that a single member can be read without decompressing the solid block that
+        contains it.  Members are read in archive order, so each solid block is decompressed only once; memory use is
+        bounded by the largest block.  The copy is tagged with the 7z's mtime and size, and FileStores later opened
+        on the same path will use it in place of the 7z for as long as the 7z is unchanged.
+
+        After transcoding, this FileStore also reads from the copy.
+        :return: path to the copy
+        """
+        if self.random_access:
+            raise TypeError('Only 7z archives need transcoding')
+        t_path = self.path + '.idx.zip'
+        tmp = t_path + '.part'
+        folder = None
+        with ZipFile(tmp, 'w', compression=ZIP_DEFLATED) as z:
+            for f in self._archive.files:
+                if getattr(f, '_folder', None) is not folder:
+                    self._drop_7z_block(folder)
+                    folder = getattr(f, '_folder', None)
+                data = f.read() if f.size else b''
+                z.writestr(f.filename, data)
+            self._drop_7z_block(folder)
+            z.comment = self._signature_7z(self.path)
+        os.replace(tmp, t_path)
+        self._archive = self._access_transcoded(self.path)
+        self.ext = 'zip'
+        return t_path
+
+    @staticmethod
+    def _drop_7z_block(folder):
+        """
+        py7zlib keeps the decompressed prefix of a solid block to speed up sequential reads; release it
+        """
+        if folder is not None and hasattr(folder, '_decompress_cache'):
+            del folder._decompress_cache
 
     def _gen_files(self):
         """
@@ -195,20 +297,10 @@ class FileStore(object):
             raise AttributeError('Unable to list files for remote archives')
 
         if self.compressed:
-            if self.ext == '7z':
-                if self._internal_prefix is None:
-                    lg = (q.filename for q in self._archive.files)
-                else:
-                    lg = (q.filename for q in self._archive.files if q.filename.startswith(self._internal_prefix))
-            elif self.ext == 'zip':
-                # filter out directory entries
-                if self._internal_prefix is None:
-                    lg = (q for q in self._archive.namelist() if q[:-1] not in self._internal_subfolders)
-                else:
-                    lg = (q for q in self._archive.namelist() if q[:-1] not in self._internal_subfolders
-                          and q.startswith(self._internal_prefix))
+            if self._internal_prefix is None:
+                lg = self._member_index()
             else:
-                lg = []
+                lg = (q for q in self._member_index() if q.startswith(self._internal_prefix))
         else:
             w = os.walk(self.path)
             lg = []
@@ -233,11 +325,65 @@ class FileStore(object):
         else:
             g = self._gen_files()
 
-        for l in g:
-            if in_prefix is not None:
-                if not bool(re.match('^' + in_prefix, l)):
-                    continue
-            yield l
+        if in_prefix is None or in_prefix == '':
+            for l in g:
+                yield l
+        else:
+            pattern = re.compile(in_prefix)
+            for l in g:
+                if pattern.match(l):
+                    yield l
+
+    def member_signature(self, fname):
+        """
+        Identify the current version of a member file without reading it: (path, member, mtime, size).  For
+        compressed archives the mtime and size are those of the archive itself.
+        :param fname:
+        :return: a tuple, or None for remote or missing files
+        """
+        if self.remote:
+            return None
+        if self.compressed:
+            path = self.path
+        else:
+            path = os.path.join(self.path, self._prefix(fname))
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return os.path.abspath(self.path), self._prefix(fname), st.st_mtime_ns, st.st_size
+
+    def archive_signature(self):
+        """
+        Identify the current contents of the archive as a whole, without listing it.  For compressed archives this is
+        (path, internal prefix, mtime, size); for directories it is the path and the mtimes of the directory and its
+        subfolders, which change whenever a file is added, removed or renamed (though not when one is rewritten).
+        :return: a tuple, or None for remote or missing archives
+        """
+        if self.remote:
+            return None
+        if self.compressed:
+            try:
+                st = os.stat(self.path)
+            except OSError:
+                return None
+            return os.path.abspath(self.path), self._internal_prefix, st.st_mtime_ns, st.st_size
+        mtimes = []
+        for sub in [''] + sorted(self._internal_subfolders):
+            try:
+                mtimes.append((sub, os.stat(os.path.join(self.path, sub)).st_mtime_ns))
+            except OSError:
+                pass
+        return (os.path.abspath(self.path),) + tuple(mtimes)
+
+    def _cache_read(self, member, data):
+        if len(data) > self._read_cache_size:
+            return
+        self._read_cache[member] = data
+        self._read_cache_bytes += len(data)
+        while self._read_cache_bytes > self._read_cache_size:
+            _, old = self._read_cache.popitem(last=False)
+            self._read_cache_bytes -= len(old)
 
     def writefile(self, fname, file, mode='wb'):
         if self.remote:
@@ -285,14 +431,19 @@ class FileStore(object):
             return file.read()
 
         elif self.compressed:
+            member = self._prefix(fname)
+            if member in self._read_cache:
+                self._read_cache.move_to_end(member)
+                return self._read_cache[member]
             file = {
                 '7z': lambda x: self._archive.getmember(x),
                 'zip': lambda x: self._archive.open(x)
-            }[self.ext](self._prefix(fname))
+            }[self.ext](member)
             if file is None:
                 return file
-            else:
-                return file.read()
+            data = file.read()
+            self._cache_read(member, data)
+            return data
 
         else:
             file = open(os.path.join(self.path, self._prefix(fname)), 'rb')
@@ -1,7 +1,10 @@
 from __future__ import print_function, unicode_literals
 
 import os
+from collections import namedtuple, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from itertools import chain
+from time import time
 
 from lxml import objectify
 from lxml.etree import XMLSyntaxError
@@ -18,8 +21,10 @@ except ImportError:  # python2
 
 
 from ..file_store import FileStore
+from ..parse_cache import ParseCache
 from ..xml_widgets import *
 
+from lcatools import tracing
 from lcatools.interfaces import uuid_regex
 
 from lcatools.archives import LcArchive
@@ -35,6 +40,21 @@ typeDirs = {'Process': 'processes',
             'Contact': 'contacts'
             }
 
+# plain records parsed from ILCD datasets; picklable so that they can be kept in a ParseCache
+IlcdUnitGroup = namedtuple('IlcdUnitGroup', ('uuid', 'unitstring', 'unitconv'))
+IlcdFlowProperty = namedtuple('IlcdFlowProperty', ('uuid', 'name', 'comment', 'unitgroup'))
+IlcdFlow = namedtuple('IlcdFlow', ('uuid', 'name', 'comment', 'cas', 'category', 'elementary', 'properties'))
+IlcdProcess = namedtuple('IlcdProcess', ('uuid', 'name', 'spatial_scope', 'temporal_scope', 'comment',
+                                         'classifications', 'ref_flow', 'ref_dir', 'exchanges'))
+IlcdExchange = namedtuple('IlcdExchange', ('flow', 'uri', 'direction', 'value', 'comment', 'description'))
+
+# bump whenever the records or the parsing that produces them change, to invalidate parse caches
+RECORD_VERSION = 1
+CACHE_NAMESPACE = 'IlcdArchive:%d' % RECORD_VERSION
+
+# _load_all loads datasets in this order, so that every dataset's references are loaded before it is
+LOAD_STAGES = ('UnitGroup', 'FlowProperty', 'Flow', 'Process')
+
 elcd3_local_fallback = os.path.join(os.path.expanduser('~'), 'Dropbox', 'data',
                                     'ELCD', 'ELCD3.2.zip')
 
@@ -53,6 +73,20 @@ def _extract_uuid(filename):
     return uuid_regex.search(filename).groups()[0]
 
 
+_version_regex = re.compile(r'_([0-9]+(\.[0-9]+)*)\.xml$', flags=re.IGNORECASE)
+
+
+def _version_key(version):
+    """
+    Sort key for ILCD dataset versions ('01.00.000'); unversioned datasets sort first
+    :param version: string or None
+    :return:
+    """
+    if version is None:
+        return ()
+    return tuple(int(k) for k in version.split('.'))
+
+
 def _extract_dtype(filename, pathtype=os.path):
     cands = [i for i in re.split(pathtype.sep, filename) if i in typeDirs.values()]
     dtype = [k for k, v in typeDirs.items() if v in cands]
@@ -142,13 +176,14 @@ class IlcdArchive(LcArchive):
     This class handles de-referencing for ILCD archives
     """
 
-    def __init__(self, source, prefix=None, **kwargs):
+    def __init__(self, source, prefix=None, parse_cache=None, **kwargs):
         """
         Just instantiates the parent class.
         :param source: root of the archive
         :param prefix: difference between the internal path (ref) and the ILCD base
           (note: for local archives, this defaults to 'ILCD'; for remote arcnives it
            defaults to empty)
+        :param parse_cache: [None] directory in which to keep parsed datasets between sessions (see ParseCache)
         :param quiet: forwarded to ArchiveInterface
         :return:
         """
@@ -158,6 +193,9 @@ class IlcdArchive(LcArchive):
             self._serialize_dict['prefix'] = prefix
 
         self._archive = FileStore(self.source, internal_prefix=prefix)
+        self._members = None  # see _member_index
+        self._staged = dict()  # records parsed by _load_all but not (yet) turned into entities, by filename
+        self.load_timing = None
 
         if not self._archive.OK:
             print('Trying local ELCD reference')
@@ -171,6 +209,10 @@ class IlcdArchive(LcArchive):
                 self._source = elcd3_remote_fallback
         if not self._archive.remote:
             self._archive.internal_prefix = 'ILCD'  # appends
+        if parse_cache is None:
+            self._parse_cache = None
+        else:
+            self._parse_cache = ParseCache(parse_cache, self._archive, CACHE_NAMESPACE)
 
     @property
     def _pathtype(self):
@@ -209,16 +251,80 @@ class IlcdArchive(LcArchive):
             postpath += '_' + version
         return postpath + '.xml'
 
+    def _build_member_index(self):
+        """
+        :return: a dict with 'names': all member names, in archive order, and 'ids': {dtype: {uuid: [(version key,
+         version, filename), ...]}}, uuids in lowercase
+        """
+        names = list(self._archive.listfiles())
+        ids = defaultdict(dict)
+        for f in names:
+            try:
+                dtype = _extract_dtype(f, self._pathtype)
+            except ValueError:
+                continue
+            m = uuid_regex.search(f)
+            if m is None:
+                continue
+            v = _version_regex.search(f)
+            version = None if v is None else v.groups()[0]
+            ids[dtype].setdefault(m.groups()[0].lower(), []).append((_version_key(version), version, f))
+        return {'names': names, 'ids': dict(ids)}
+
+    def _member_index(self):
+        """
+        Index of archive members by dtype, uuid and version, built once per archive.  If a parse cache is in use, the
+        index is also kept there, keyed on the archive's signature.
+        :return:
+        """
+        if self._members is None:
+            assert self._archive.remote is False, "Cannot list objects for remote archives"
+            if self._parse_cache is None:
+                self._members = self._build_member_index()
+            else:
+                self._members = self._parse_cache.get_or_build_index('.member-index', self._build_member_index)
+        return self._members
+
+    def _member_path(self, dtype, uid, version=None):
+        """
+        Path to a dataset, looked up in the member index.  If no version is given, the latest version is returned.
+        Falls back to _path_from_parts for remote archives and unindexed datasets.
+        :param dtype:
+        :param uid:
+        :param version:
+        :return:
+        """
+        if not self._archive.remote:
+            versions = self._member_index()['ids'].get(dtype, dict()).get(uid.lower())
+            if versions:
+                if version is None:
+                    return max(versions)[2]
+                for _, v, f in versions:
+                    if v == version:
+                        return f
+        return self._path_from_parts(dtype, uid, version=version)
+
     def search_by_id(self, uid, dtype=None):
-        return [i for i in self.list_objects(dtype=dtype) if re.search(uid, i, flags=re.IGNORECASE)]
+        if uuid_regex.fullmatch(uid):
+            ids = self._member_index()['ids']
+            if dtype is None:
+                dtypes = ids.keys()
+            else:
+                dtypes = [dtype]
+            return [f for dt in dtypes for _, _, f in sorted(ids.get(dt, dict()).get(uid.lower(), []))]
+        pattern = re.compile(uid, flags=re.IGNORECASE)
+        return [i for i in self.list_objects(dtype=dtype) if pattern.search(i)]
 
     def list_objects(self, dtype=None):
-        assert self._archive.remote is False, "Cannot list objects for remote archives"
-        in_prefix = None
-        if dtype is not None:
+        names = self._member_index()['names']
+        if dtype is None:
+            for f in names:
+                yield f
+        else:
             in_prefix = typeDirs[dtype]
-        for f in self._archive.listfiles(in_prefix=in_prefix):
-            yield f
+            for f in names:
+                if f.startswith(in_prefix):
+                    yield f
 
     def _fetch_filename(self, filename):
         return self._archive.readfile(filename)
@@ -230,36 +336,103 @@ class IlcdArchive(LcArchive):
         return child
 
     def _get_objectified_entity(self, filename):
-        return objectify.fromstring(self._fetch_filename(filename))
+        st = self._fetch_filename(filename)
+        with tracing.span('provider', 'ILCD.parse', self.ref, file=filename):
+            return objectify.fromstring(st)
+
+    @classmethod
+    def _record_from_objectified(cls, o):
+        dtype = dtype_from_nsmap(o.nsmap)
+        if dtype == 'Flow':
+            return cls._flow_record(o)
+        elif dtype == 'Process':
+            return cls._process_record(o)
+        elif dtype == 'FlowProperty':
+            return cls._quantity_record(o)
+        elif dtype == 'UnitGroup':
+            return cls._unitgroup_record(o)
+        return None
+
+    @classmethod
+    def _parse_record(cls, fetch, cache, filename):
+        """
+        Parse a dataset into a plain record.  Needs no archive instance, so that it can run in a worker process.
+        :param fetch: callable that maps filename to XML content
+        :param cache: a ParseCache, or None
+        :param filename:
+        :return: a record, or the objectified dataset if its type has no record
+        """
+        if cache is not None:
+            rec = cache.get(filename)
+            if rec is not None:
+                return rec
+        st = fetch(filename)
+        with tracing.span('provider', 'ILCD.parse', file=filename):
+            o = objectify.fromstring(st)
+        rec = cls._record_from_objectified(o)
+        if rec is None:
+            return o
+        if cache is not None:
+            cache.put(filename, rec)
+        return rec
+
+    def _read_record(self, filename):
+        """
+        Read a dataset as a plain record (see IlcdFlow etc.), consulting the parse cache if there is one.  Datasets
+        of types that have no record are returned objectified.
+        :param filename:
+        :return:
+        """
+        if filename in self._staged:
+            return self._staged[filename]
+        return self._parse_record(self._fetch_filename, self._parse_cache, filename)
 
-    def _search_for_term(self, term, dtype=None):
+    def _search_for_term(self, term, dtype=None, reader=None):
         search_results = self.search_by_id(term, dtype=dtype)
         if len(search_results) > 0:
             self._print('Found Results:')
             [print(i) for i in search_results]
             if len(search_results) > 1:
-                print('Please refine search')
-                return None
-            result = search_results[0]
+                keys = set((_extract_dtype(k, self._pathtype), _extract_uuid(k).lower()) for k in search_results)
+                if len(keys) > 1:
+                    print('Please refine search')
+                    return None
+                # all versions of the same dataset
+                dt, u = keys.pop()
+                result = self._member_path(dt, u)
+            else:
+                result = search_results[0]
             dtype = _extract_dtype(result, self._pathtype)
-            return self.objectify(result, dtype=dtype)
+            return self._read_term(reader or self._get_objectified_entity, result, dtype=dtype)
         print('No results for %s' % term)
         return None
 
     def objectify(self, term, dtype=None, version=None, uri=None):
+        return self._read_term(self._get_objectified_entity, term, dtype=dtype, version=version, uri=uri)
+
+    def _read_term(self, reader, term, dtype=None, version=None, uri=None):
+        """
+        Locate the file for a term and read it.
+        :param reader: callable that maps filename to its parsed content
+        :param term:
+        :param dtype:
+        :param version:
+        :param uri:
+        :return: the reader's output, or an existing entity, or None
+        """
         if uri is not None:
-            return self._get_objectified_entity(self._path_from_uri(uri))
+            return reader(self._path_from_uri(uri))
         if dtype is None:
             try:
                 dtype = _extract_dtype(term, self._pathtype)
             except ValueError:
-                return self._search_for_term(term)
+                return self._search_for_term(term, reader=reader)
 
         try:
             uid = _extract_uuid(term)
         except AttributeError:
             # can't find UUID: search is required
-            return self._search_for_term(term, dtype=dtype)
+            return self._search_for_term(term, dtype=dtype, reader=reader)
 
         # if we get here, uid is valid and dtype is valid
         entity = self.__getitem__(uid)  # checks upstream first (!! should this be local only?)
@@ -268,11 +441,11 @@ class IlcdArchive(LcArchive):
 
         try:
             # if we are a search result, this will succeed
-            o = self._get_objectified_entity(term)
+            o = reader(term)
         except (KeyError, FileNotFoundError):
             # we are not a search result-- let's build the entity path
             try:
-                o = self._get_objectified_entity(self._path_from_parts(dtype, uid, version=version))
+                o = reader(self._member_path(dtype, uid, version=version))
             except (KeyError, FileNotFoundError):
                 # still not found- maybe it isn't here
                 return None
@@ -289,21 +462,39 @@ class IlcdArchive(LcArchive):
             uid = _extract_uuid(unit_ref)
         except AttributeError:
             return super(IlcdArchive, self)._create_unit(unit_ref)
-        filename = self._path_from_parts(dtype, uid)
-        o = self._get_objectified_entity(filename)
+        filename = self._member_path(dtype, uid)
+        rec = self._read_record(filename)
+
+        ref_unit = LcUnit(rec.unitstring, unit_uuid=rec.uuid)
+        ref_unit.set_external_ref('%s/%s' % (typeDirs['UnitGroup'], rec.uuid))
+
+        return ref_unit, dict(rec.unitconv)
 
+    @staticmethod
+    def _unitgroup_record(o):
         ns = find_ns(o.nsmap, 'UnitGroup')
 
         u = str(find_common(o, 'UUID'))
         reference_unit = int(find_tag(o, 'referenceToReferenceUnit', ns=ns))
         unitstring = str(o['units'].getchildren()[reference_unit]['name'])
-        ref_unit = LcUnit(unitstring, unit_uuid=u)
-        ref_unit.set_external_ref('%s/%s' % (typeDirs['UnitGroup'], u))
 
         unitconv = dict()
         for i in o['units'].getchildren():
             unitconv[str(i['name'])] = 1.0 / float(i['meanValue'])
-        return ref_unit, unitconv
+        return IlcdUnitGroup(u, unitstring, unitconv)
+
+    @staticmethod
+    def _quantity_record(o):
+        ns = find_ns(o.nsmap, 'FlowProperty')
+
+        u = str(find_common(o, 'UUID'))
+
+        n = str(find_common(o, 'name'))
+
+        c = str(find_common(o, 'generalComment'))
+
+        ug, ug_uri = get_reference_unit_group(o, ns=ns)
+        return IlcdFlowProperty(u, n, c, ug)
 
     def _create_quantity(self, o):
         """
@@ -315,22 +506,20 @@ class IlcdArchive(LcArchive):
         try_q = self[u]
         if try_q is not None:
             return try_q
+        return self._quantity_from_record(self._quantity_record(o))
 
-        ns = find_ns(o.nsmap, 'FlowProperty')
-
-        n = str(find_common(o, 'name'))
-
-        c = str(find_common(o, 'generalComment'))
-
-        ug, ug_uri = get_reference_unit_group(o, ns=ns)
+    def _quantity_from_record(self, rec):
+        try_q = self[rec.uuid]
+        if try_q is not None:
+            return try_q
 
-        ug_path = self._pathtype.join('unitgroups', ug)  # need the path without extension- I know- it's all sloppy
+        ug_path = self._pathtype.join('unitgroups', rec.unitgroup)  # need the path without extension- I know- it's all sloppy
 
         refunit, unitconv = self._create_unit(ug_path)
 
-        q = LcQuantity(u, Name=n, ReferenceUnit=refunit, UnitConversion=unitconv, Comment=c)
+        q = LcQuantity(rec.uuid, Name=rec.name, ReferenceUnit=refunit, UnitConversion=unitconv, Comment=rec.comment)
 
-        q.set_external_ref('%s/%s' % (typeDirs['FlowProperty'], u))
+        q.set_external_ref('%s/%s' % (typeDirs['FlowProperty'], rec.uuid))
 
         self.add(q)
 
@@ -338,21 +527,21 @@ class IlcdArchive(LcArchive):
 
     @staticmethod
     def _create_dummy_flow_from_exch(uid, exch):
-        n = str(find_common(exch, 'shortDescription'))
+        if isinstance(exch, IlcdExchange):
+            n = exch.description
+        else:
+            n = str(find_common(exch, 'shortDescription'))
         print('Creating DUMMY flow (%s) with name %s' % (uid, n))
         return LcFlow(uid, Name=n, Comment='Dummy flow (HTTP or XML error)', Compartment=['dummy flows'])
 
-    def _create_flow(self, o):
+    @staticmethod
+    def _flow_record(o):
         """
 
         :param o: objectified flow
-        :return: an LcFlow
+        :return: an IlcdFlow
         """
         u = str(find_common(o, 'UUID'))
-        try_f = self[u]
-        if try_f is not None:
-            return try_f
-
         ns = find_ns(o.nsmap, 'Flow')
         n = grab_flow_name(o, ns=ns)
 
@@ -365,13 +554,9 @@ class IlcdArchive(LcArchive):
             cat = find_tags(o, 'class', ns='common')
         cat = [str(i) for i in cat]
 
-        if str(find_tag(o, 'typeOfDataSet', ns=ns)) == 'Elementary flow':
-            f = LcFlow(u, Name=n, CasNumber=cas, Comment=c, Compartment=cat)
-        else:
-            f = LcFlow(u, Name=n, CasNumber=cas, Comment=c, Compartment=['Intermediate flows'], Class=cat)
-
-        f.set_external_ref('%s/%s' % (typeDirs['Flow'], u))
+        elementary = str(find_tag(o, 'typeOfDataSet', ns=ns)) == 'Elementary flow'
 
+        props = []
         ref_to_ref = get_reference_flow_property_id(o, ns=ns)
         for fp in o['flowProperties'].getchildren():
             if int(fp.attrib['dataSetInternalID']) == ref_to_ref:
@@ -381,9 +566,37 @@ class IlcdArchive(LcArchive):
             val = float(find_tag(fp, 'meanValue', ns=ns))
 
             ref = find_tag(fp, 'referenceToFlowPropertyDataSet', ns=ns)
-            rfp_uuid = ref.attrib['refObjectId']
-            rfp_uri = ref.attrib['uri']
+            props.append((is_ref, val, ref.attrib['refObjectId'], ref.attrib['uri']))
+
+        return IlcdFlow(u, n, c, cas, cat, elementary, props)
 
+    def _create_flow(self, o):
+        """
+
+        :param o: objectified flow
+        :return: an LcFlow
+        """
+        u = str(find_common(o, 'UUID'))
+        try_f = self[u]
+        if try_f is not None:
+            return try_f
+        return self._flow_from_record(self._flow_record(o))
+
+    def _flow_from_record(self, rec):
+        u = rec.uuid
+        try_f = self[u]
+        if try_f is not None:
+            return try_f
+
+        if rec.elementary:
+            f = LcFlow(u, Name=rec.name, CasNumber=rec.cas, Comment=rec.comment, Compartment=rec.category)
+        else:
+            f = LcFlow(u, Name=rec.name, CasNumber=rec.cas, Comment=rec.comment, Compartment=['Intermediate flows'],
+                       Class=rec.category)
+
+        f.set_external_ref('%s/%s' % (typeDirs['Flow'], u))
+
+        for is_ref, val, rfp_uuid, rfp_uri in rec.properties:
             try:
                 q = self._check_or_retrieve_child(rfp_uuid, rfp_uri)
             except (HTTPError, XMLSyntaxError, KeyError):
@@ -398,11 +611,32 @@ class IlcdArchive(LcArchive):
         self.add(f)
         return f
 
-    def _create_process_entity(self, o, ns):
+    @staticmethod
+    def _process_record(o):
+        """
+
+        :param o: objectified process
+        :return: an IlcdProcess
+        """
+        ns = find_ns(o.nsmap, 'Process')
         u = str(find_common(o, 'UUID'))
-        try_p = self[u]
-        if try_p is not None:
-            return try_p
+
+        try:
+            rf, rf_uri, rf_dir = get_reference_flow(o, ns=ns)
+        except XMLSyntaxError:
+            rf = None
+            rf_dir = None
+
+        exch_list = []
+        for exch in o['exchanges'].getchildren():
+            f_id, f_uri, f_dir = get_flow_ref(exch, ns=ns)
+            v = get_exch_value(exch, ns=ns)
+            cmt = str(find_tag(exch, 'generalComment', ns=ns))
+            try:
+                desc = str(find_common(exch, 'shortDescription'))
+            except KeyError:
+                desc = ''
+            exch_list.append(IlcdExchange(f_id, f_uri, f_dir, v, cmt, desc))
 
         n = ', '.join(chain(filter(len, [str(find_tag(o, k, ns=ns))
                                          for k in ('baseName',
@@ -421,12 +655,19 @@ class IlcdArchive(LcArchive):
 
         cls = [str(i) for i in find_tags(o, 'class', ns='common')]
 
-        p = LcProcess(u, Name=n, Comment=c, SpatialScope=g, TemporalScope=stt,
-                      Classifications=cls)
+        return IlcdProcess(u, n, g, stt, c, cls, rf, rf_dir, exch_list)
+
+    def _create_process_entity(self, rec):
+        try_p = self[rec.uuid]
+        if try_p is not None:
+            return try_p
+
+        p = LcProcess(rec.uuid, Name=rec.name, Comment=rec.comment, SpatialScope=rec.spatial_scope,
+                      TemporalScope=rec.temporal_scope, Classifications=rec.classifications)
 
         self.add(p)
 
-        p.set_external_ref('%s/%s' % (typeDirs['Process'], u))
+        p.set_external_ref('%s/%s' % (typeDirs['Process'], rec.uuid))
 
         return p
 
@@ -436,31 +677,25 @@ class IlcdArchive(LcArchive):
         :param o: objectified process
         :return:
         """
-        ns = find_ns(o.nsmap, 'Process')
+        return self._process_from_record(self._process_record(o))
 
-        try:
-            rf, rf_uri, rf_dir = get_reference_flow(o, ns=ns)
-        except XMLSyntaxError:
-            rf = None
-            rf_dir = None
+    def _process_from_record(self, rec):
+        rf = rec.ref_flow
+        rf_dir = rec.ref_dir
 
         exch_list = []
 
-        for exch in o['exchanges'].getchildren():
+        for exch in rec.exchanges:
             # load all child flows
-            f_id, f_uri, f_dir = get_flow_ref(exch, ns=ns)
             try:
-                f = self._check_or_retrieve_child(f_id, f_uri)
+                f = self._check_or_retrieve_child(exch.flow, exch.uri)
             except (HTTPError, XMLSyntaxError, KeyError):
-                u = str(find_common(o, 'UUID'))
-                print('In UUID %s:' % u)
-                f = self._create_dummy_flow_from_exch(f_id, exch)
+                print('In UUID %s:' % rec.uuid)
+                f = self._create_dummy_flow_from_exch(exch.flow, exch)
                 self.add(f)
-            v = get_exch_value(exch, ns=ns)
-            cmt = find_tag(exch, 'generalComment', ns=ns)
-            exch_list.append((f, f_dir, v, cmt))
+            exch_list.append((f, exch.direction, exch.value, exch.comment))
 
-        p = self._create_process_entity(o, ns)
+        p = self._create_process_entity(rec)
 
         for flow, f_dir, val, cmt in exch_list:
             x = p.add_exchange(flow, f_dir, reference=None, value=val,
@@ -487,32 +722,144 @@ class IlcdArchive(LcArchive):
             except ValueError:
                 pass
 
-        o = self.objectify(term, dtype=dtype, version=version, **kwargs)
+        o = self._read_term(self._read_record, term, dtype=dtype, version=version, **kwargs)
         if o is None:
             return None
 
-        if dtype is None:
-            dtype = dtype_from_nsmap(o.nsmap)
-
-        if dtype == 'Flow':
+        if isinstance(o, IlcdFlow):
             try:
-                return self._create_flow(o)
+                return self._flow_from_record(o)
             except KeyError:
                 print('KeyError on term %s dtype %s version %s' % (term, dtype, version))
-        elif dtype == 'Process':
-            return self._create_process(o)
-        elif dtype == 'FlowProperty':
-            return self._create_quantity(o)
+        elif isinstance(o, IlcdProcess):
+            return self._process_from_record(o)
+        elif isinstance(o, IlcdFlowProperty):
+            return self._quantity_from_record(o)
         else:
             return o
 
-    def _load_all(self):
-        for i in self.list_objects('Process'):
-            self.retrieve_or_fetch_entity(i)
+    def _load_all(self, workers=None):
+        """
+        Load every dataset in the archive, in stages: unit groups, then flow properties, flows and processes (see
+        LOAD_STAGES), so that the references of each dataset are already loaded when it is built.  Prints the time
+        spent parsing and building each stage, and keeps it in self.load_timing as a list of (dtype, count, parse
+        seconds, build seconds, skipped filenames).  Datasets that are not well-formed XML are skipped; other errors
+        are raised.  Only the latest version of each dataset is loaded.
+        :param workers: [None] if greater than 1, parse the datasets in that many worker processes.  The workers only
+         produce records; entities are built in this process, in archive order.
+        :return:
+        """
+        executor = None
+        if workers is not None and workers > 1:
+            if self._parse_cache is None:
+                cache_args = None
+            else:
+                cache_args = (self._parse_cache.cache_dir, CACHE_NAMESPACE)
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_ilcd_worker,
+                                           initargs=(self.source, self.internal_prefix, cache_args))
+        self.load_timing = []
+        try:
+            for dtype in LOAD_STAGES:
+                self.load_timing.append(self._load_stage(dtype, executor, workers))
+        finally:
+            self._staged = dict()
+            if executor is not None:
+                executor.shutdown()
+        for dtype, count, t_parse, t_build, skipped in self.load_timing:
+            print(' %-12s %6d datasets  parse %8.2f s  build %8.2f s  skipped %d' % (dtype, count, t_parse, t_build,
+                                                                                    len(skipped)))
+            for f in skipped:
+                print('   skipped %s' % f)
         self.check_counter('quantity')
         self.check_counter('flow')
         self.check_counter('process')
 
+    def _stage_files(self, dtype):
+        """
+        :param dtype:
+        :return: the latest version of each dataset of the given type that is not already loaded, in archive order
+        """
+        files = []
+        for u, versions in self._member_index()['ids'].get(dtype, dict()).items():
+            if dtype != 'UnitGroup' and self[u] is not None:
+                continue
+            files.append(max(versions)[2])
+        return files
+
+    def _load_stage(self, dtype, executor, workers):
+        """
+        Parse and build all datasets of one type.  Unit groups are not entities: their records are staged for
+        _create_unit.  Datasets that are not well-formed are reported and skipped.
+        :param dtype:
+        :param executor: a ProcessPoolExecutor, or None to parse in this process
+        :param workers:
+        :return: (dtype, count, parse seconds, build seconds, [skipped filename, ...])
+        """
+        files = self._stage_files(dtype)
+        t_parse = t_build = 0.0
+        if executor is None:
+            records = (_parse_or_skip(self._parse_record, self._fetch_filename, self._parse_cache, f) for f in files)
+        else:
+            chunksize = max(1, len(files) // (workers * 16))
+            records = executor.map(_parse_ilcd_worker, files, chunksize=chunksize)
+        records = iter(records)
+        skipped = []
+        for f in files:
+            t0 = time()
+            rec, reason = next(records)
+            t1 = time()
+            t_parse += t1 - t0
+            if rec is None:
+                print('Skipping %s (%s)' % (f, reason))
+                skipped.append(f)
+            elif isinstance(rec, IlcdUnitGroup):
+                self._staged[f] = rec
+            elif isinstance(rec, IlcdFlowProperty):
+                self._quantity_from_record(rec)
+            elif isinstance(rec, IlcdFlow):
+                self._flow_from_record(rec)
+            elif isinstance(rec, IlcdProcess):
+                self._process_from_record(rec)
+            else:
+                print('Skipping %s (not a %s dataset)' % (f, dtype))
+                skipped.append(f)
+            t_build += time() - t1
+        return dtype, len(files), t_parse, t_build, skipped
+
+
+def _parse_or_skip(parse, fetch, cache, filename):
+    """
+    :return: (record, None), or (None, reason) if the dataset is not well-formed XML or holds a value that can't be
+     read.  Other errors propagate, as they would in a recursive load.
+    """
+    try:
+        return parse(fetch, cache, filename), None
+    except (XMLSyntaxError, ValueError) as e:
+        return None, '%s: %s' % (e.__class__.__name__, e)
+
+
+_worker_store = None
+_worker_cache = None
+
+
+def _init_ilcd_worker(source, prefix, cache_args):
+    global _worker_store, _worker_cache
+    _worker_store = FileStore(source, internal_prefix=prefix)
+    _worker_store.internal_prefix = 'ILCD'  # appends, as in IlcdArchive.__init__
+    if cache_args is not None:
+        _worker_cache = ParseCache(cache_args[0], _worker_store, cache_args[1])
+
+
+def _worker_fetch(filename):
+    st = _worker_store.readfile(filename)
+    if st is None:
+        raise FileNotFoundError
+    return st
+
+
+def _parse_ilcd_worker(filename):
+    return _parse_or_skip(IlcdArchive._parse_record, _worker_fetch, _worker_cache, filename)
+
 
 '''
 class IlcdWebInterface(IlcdArchive):
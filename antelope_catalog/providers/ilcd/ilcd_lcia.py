@@ -70,14 +70,14 @@ class IlcdLcia(IlcdArchive):
 
         return lcia
 
-    def _load_all(self):
-        super(IlcdLcia, self)._load_all()
+    def _load_all(self, **kwargs):
+        super(IlcdLcia, self)._load_all(**kwargs)
         self.load_lcia()
         self.check_counter('quantity')
 
     def _fetch(self, term, dtype=None, version=None, **kwargs):
         o = super(IlcdLcia, self)._fetch(term, dtype=dtype, version=version, **kwargs)
-        if isinstance(o, LcEntity) or o is None:
+        if isinstance(o, LcEntity) or o is None or not hasattr(o, 'nsmap'):
             return o
         if dtype is None:
             dtype = dtype_from_nsmap(o.nsmap)
@@ -110,7 +110,7 @@ class IlcdLcia(IlcdArchive):
         :param load_all_flows: [False] If False, load CFs only for already-loaded flows. If True, load all flows
         :return:
         """
-        o = self._get_objectified_entity(self._path_from_parts('LCIAMethod', u, version=version))
+        o = self._get_objectified_entity(self._member_path('LCIAMethod', u, version=version))
         ns = find_ns(o.nsmap, 'LCIAMethod')
 
         lcia = self._create_lcia_quantity(o, ns)
@@ -1,7 +1,12 @@
 import unittest
 import os
+import re
+import shutil
+import tempfile
 
-from ..ilcd import IlcdArchive
+from antelope_utilities.benchmarks.synthetic import write_synthetic_ilcd
+
+from ..ilcd import IlcdArchive, LOAD_STAGES
 
 TEST_ARCHIVE = os.path.join(os.path.dirname(__file__), 'data', 'ilcd_test')
 test_flow = 'f579de8c-8897-4bdb-9a0a-b36f8b13282e'
@@ -25,5 +30,137 @@ class IlcdTest(unittest.TestCase):
         self.assertEqual(len(cfs), 4)
         self.assertSetEqual(set(cfs), {1.0, 0.0204, 0.015})
 
+
+class IlcdParseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def _profile(self, archive):
+        f = archive.retrieve_or_fetch_entity(test_flow)
+        return f['Name'], sorted((cf.quantity.external_ref, round(cf.value, 4)) for cf in f.profile())
+
+    def test_cached_records(self):
+        cold = IlcdArchive(TEST_ARCHIVE, ref='test.ilcd', parse_cache=self.cache_dir)
+        expected = self._profile(cold)
+        self.assertEqual(cold._parse_cache.hits, 0)
+        warm = IlcdArchive(TEST_ARCHIVE, ref='test.ilcd', parse_cache=self.cache_dir)
+        self.assertEqual(self._profile(warm), expected)
+        self.assertEqual(warm._parse_cache.misses, 0)
+        self.assertEqual(warm._parse_cache.hits, cold._parse_cache.misses)
+
+
+class IlcdMemberIndexTest(unittest.TestCase):
+    """
+    A copy of the test archive with two more versions of the test flow, the latest of which is renamed
+    """
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.tmp, 'ilcd_test')
+        shutil.copytree(TEST_ARCHIVE, cls.path)
+        flows = os.path.join(cls.path, 'ILCD', 'flows')
+        with open(os.path.join(flows, '%s.xml' % test_flow)) as fp:
+            xml = fp.read()
+        with open(os.path.join(flows, '%s_02.00.000.xml' % test_flow), 'w') as fp:
+            fp.write(xml.replace('at consumer', 'at plant'))
+        with open(os.path.join(flows, '%s_10.00.000.xml' % test_flow), 'w') as fp:
+            fp.write(xml.replace('at consumer', 'at pipeline'))
+        cls.A = IlcdArchive(cls.path, ref='test.ilcd.versions')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp)
+
+    def test_list_objects(self):
+        self.assertEqual(len(list(self.A.list_objects('Flow'))), 3)
+        self.assertEqual(len(list(self.A.list_objects('UnitGroup'))), 4)
+
+    def test_search_by_id(self):
+        self.assertEqual(len(self.A.search_by_id(test_flow)), 3)
+        self.assertEqual(len(self.A.search_by_id(test_flow.upper(), dtype='Flow')), 3)
+        self.assertEqual(len(self.A.search_by_id(test_flow, dtype='Process')), 0)
+        self.assertEqual(len(self.A.search_by_id('93a60a56-a3c8')), 4)
+
+    def test_latest_version(self):
+        self.assertTrue(self.A._member_path('Flow', test_flow).endswith('_10.00.000.xml'))
+        self.assertTrue(self.A._member_path('Flow', test_flow, version='02.00.000').endswith('_02.00.000.xml'))
+        f = self.A.retrieve_or_fetch_entity(test_flow)
+        self.assertEqual(f['Name'], 'RNA: natural gas, at pipeline')
+
+
+class IlcdStagedLoadTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        write_synthetic_ilcd(cls.tmp, n_processes=40, n_exchanges=12, n_elementary=30)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp)
+
+    @staticmethod
+    def _signature(archive):
+        return sorted((p.external_ref, sorted((x.flow.external_ref, x.direction, str(x.value), x.is_reference)
+                                              for x in p.exchanges()))
+                      for p in archive.entities_by_type('process'))
+
+    def test_matches_recursive_load(self):
+        recursive = IlcdArchive(self.tmp)
+        for f in recursive.list_objects('Process'):
+            recursive.retrieve_or_fetch_entity(f)
+        staged = IlcdArchive(self.tmp)
+        staged.load_all()
+        self.assertEqual(staged.count_by_type('process'), 40)
+        self.assertEqual(staged.count_by_type('flow'), recursive.count_by_type('flow'))
+        self.assertEqual(self._signature(staged), self._signature(recursive))
+
+    def test_load_timing(self):
+        staged = IlcdArchive(self.tmp)
+        staged.load_all()
+        self.assertEqual(tuple(k[0] for k in staged.load_timing), LOAD_STAGES)
+        self.assertEqual([k[1] for k in staged.load_timing], [1, 1, 70, 40])
+
+    def test_malformed(self):
+        tmp = tempfile.mkdtemp()
+        try:
+            write_synthetic_ilcd(tmp, n_processes=3, n_exchanges=2, n_elementary=2)
+            p_dir = os.path.join(tmp, 'ILCD', 'processes')
+            bad = sorted(os.listdir(p_dir))[0]
+            with open(os.path.join(p_dir, bad), 'w') as fp:
+                fp.write('<processDataSet')
+            archive = IlcdArchive(tmp)
+            archive.load_all()
+            self.assertEqual(archive.count_by_type('process'), 2)
+            skipped = archive.load_timing[-1][4]
+            self.assertEqual(len(skipped), 1)
+            self.assertTrue(skipped[0].endswith(bad))
+
+            with open(os.path.join(p_dir, bad), 'w') as fp:
+                fp.write('<flowDataSet/>')  # well-formed, but not a process
+            archive = IlcdArchive(tmp)
+            archive.load_all()
+            self.assertListEqual(archive.load_timing[-1][4], skipped)
+
+            good = sorted(os.listdir(p_dir))[1]
+            with open(os.path.join(p_dir, good)) as fp:
+                content = fp.read()
+            with open(os.path.join(p_dir, good), 'w') as fp:
+                fp.write(re.sub('<exchanges>.*</exchanges>', '', content, flags=re.S))  # a process missing a part
+            with self.assertRaises((KeyError, AttributeError)):
+                IlcdArchive(tmp).load_all()
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_workers(self):
+        serial = IlcdArchive(self.tmp)
+        serial.load_all()
+        parallel = IlcdArchive(self.tmp)
+        parallel.load_all(workers=2)
+        self.assertEqual(self._signature(parallel), self._signature(serial))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,144 @@
+"""
+An append-only, indexed store of serialized LCI datasets.  Used by EcoinventSpreadsheet to cache aggregated (LCI)
+processes read out of the ecoinvent LCI archive, so that a cache miss costs one dataset's worth of I/O rather than a
+rewrite of the whole cache.
+
+The store is a pair of files:
+ * path.dat: concatenated records, each an independently gzipped JSON document
+ * path.idx: one line per record: key <tab> offset <tab> length
+
+Records are appended to the data file before their index line is written, and readers only trust the index, so
+readers never see partial records.  Writers hold an exclusive lock on the index file while appending (where fcntl is
+available), so several sessions may share one store.  If a key is written twice, the later record wins.
+"""
+
+import gzip
+import json
+import os
+
+try:
+    import fcntl
+except ImportError:  # no advisory locking available; single-writer use only
+    fcntl = None
+
+
+def process_record(process):
+    """
+    Serialize a process together with the flows and quantities it depends on, in an LcArchive-compatible dict.
+    :param process:
+    :return:
+    """
+    flows = dict()
+    quantities = dict()
+    for x in process.exchanges():
+        flows[x.flow.external_ref] = x.flow
+        for cf in x.flow.characterizations():
+            quantities[cf.quantity.external_ref] = cf.quantity
+    return {
+        'quantities': [quantities[k].serialize() for k in sorted(quantities)],
+        'flows': [flows[k].serialize(characterizations=True, values=True) for k in sorted(flows)],
+        'processes': [process.serialize(exchanges=True, values=True)]
+    }
+
+
+def load_record(archive, record):
+    """
+    Add the entities in a record to an archive, skipping any that are already present.
+    :param archive: an LcArchive
+    :param record: as produced by process_record()
+    :return: list of the record's processes, as found in the archive
+    """
+    p_refs = [p['externalId'] for p in record.get('processes', [])]
+    for etype in ('quantities', 'flows', 'processes'):
+        for e in record.get(etype, []):
+            if archive[e['externalId']] is None:
+                archive.entity_from_json(e)  # consumes e
+    return [archive[k] for k in p_refs]
+
+
+class LciStore(object):
+    def __init__(self, path):
+        """
+        :param path: path to the store, without extension
+        """
+        self._path = path
+        self._index = dict()
+        self._idx_pos = 0
+        self.refresh()
+
+    @property
+    def data_file(self):
+        return self._path + '.dat'
+
+    @property
+    def index_file(self):
+        return self._path + '.idx'
+
+    def refresh(self):
+        """
+        Read any index entries written since the last refresh (e.g. by another session)
+        :return:
+        """
+        if not os.path.exists(self.index_file):
+            return
+        with open(self.index_file, 'rb') as fp:
+            fp.seek(self._idx_pos)
+            while True:
+                line = fp.readline()
+                if not line.endswith(b'\n'):
+                    break  # end of file, or a line still being written
+                key, offset, length = line.decode('utf-8').rstrip('\n').split('\t')
+                self._index[key] = (int(offset), int(length))
+                self._idx_pos = fp.tell()
+
+    def __contains__(self, key):
+        if key not in self._index:
+            self.refresh()
+        return key in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def keys(self):
+        self.refresh()
+        return self._index.keys()
+
+    def get(self, key):
+        """
+        :param key:
+        :return: the record stored under key, or None
+        """
+        if key not in self:
+            return None
+        offset, length = self._index[key]
+        with open(self.data_file, 'rb') as fp:
+            fp.seek(offset)
+            data = fp.read(length)
+        return json.loads(gzip.decompress(data).decode('utf-8'))
+
+    def put(self, key, record):
+        """
+        Append a record.
+        :param key: must not contain tabs or newlines
+        :param record: a JSON-serializable dict
+        :return:
+        """
+        data = gzip.compress(json.dumps(record).encode('utf-8'))
+        d = os.path.dirname(self.index_file)
+        if d and not os.path.isdir(d):
+            os.makedirs(d)
+        with open(self.index_file, 'a') as idx:
+            if fcntl is not None:
+                fcntl.flock(idx, fcntl.LOCK_EX)
+            try:
+                with open(self.data_file, 'ab') as fp:
+                    offset = fp.seek(0, os.SEEK_END)
+                    fp.write(data)
+                    fp.flush()
+                    os.fsync(fp.fileno())
+                idx.write('%s\t%d\t%d\n' % (key, offset, len(data)))
+                idx.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(idx, fcntl.LOCK_UN)
+        self._index[key] = (offset, len(data))
@@ -1,5 +1,8 @@
 import json
 import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from time import time
 
 from lcatools.entities import *
 from lcatools.entities.processes import NoExchangeFound
@@ -16,6 +19,10 @@ class OpenLcaException(Exception):
 
 SKIP_DURING_INDEX = ('context.json', 'meta.info')
 
+# _load_all decodes and builds objects of these types in this order, so that every object's references are built
+# before it is.  Categories and unit groups are not entities; they are kept for the objects that refer to them
+LOAD_STAGES = ('categories', 'unit_groups', 'flow_properties', 'flows', 'processes')
+
 
 class OpenLcaJsonLdArchive(LcArchive):
     """
@@ -24,12 +31,14 @@ class OpenLcaJsonLdArchive(LcArchive):
     def _gen_index(self):
         self._print('Generating index')
         self._type_index = dict()
+        self._type_members = defaultdict(list)
         for f in self._archive.listfiles():
             if f in SKIP_DURING_INDEX:
                 continue
             ff = f.split('/')
             fg = ff[1].split('.')
             self._type_index[fg[0]] = ff[0]
+            self._type_members[ff[0]].append(fg[0])
 
     def __init__(self, source, prefix=None, skip_index=False, **kwargs):
         super(OpenLcaJsonLdArchive, self).__init__(source, **kwargs)
@@ -37,16 +46,41 @@ class OpenLcaJsonLdArchive(LcArchive):
         self._drop_fields['process'].extend(['processDocumentation'])
 
         self._archive = FileStore(source, internal_prefix=prefix)
+        self.internal_prefix = prefix
 
         self._type_index = None
+        self._type_members = None  # keys of each type, in archive order
+        self._categories = dict()  # category key: list of category names, root first
+        self._staged = dict()  # (typ, key): decoded objects, during _load_all
+        self._olca_entities = dict()  # @id: entity, for lookups while building
+        self.load_timing = None
         if not skip_index:
             self._gen_index()
 
     def _check_id(self, _id):
         return self[_id] is not None
 
+    def _get_olca_entity(self, key, typ):
+        """
+        Retrieve or fetch an entity by its openLCA @id, remembering it: building a process looks up every exchange's
+        flow and flow property, and the archive's general key resolution is comparatively slow.
+        :param key:
+        :param typ:
+        :return:
+        """
+        try:
+            return self._olca_entities[key]
+        except KeyError:
+            ent = self.retrieve_or_fetch_entity(key, typ=typ)
+            if ent is not None:
+                self._olca_entities[key] = ent
+            return ent
+
     def _create_object(self, typ, key):
-        return json.loads(self._archive.readfile(os.path.join(typ, key + '.json')))
+        try:
+            return self._staged[typ, key]
+        except KeyError:
+            return json.loads(self._archive.readfile(os.path.join(typ, key + '.json')))
 
     def _process_from_json(self, entity_j, uid):
         process = super(OpenLcaJsonLdArchive, self)._process_from_json(entity_j, uid)
@@ -69,26 +103,28 @@ class OpenLcaJsonLdArchive(LcArchive):
         return j, name, cat
 
     def _get_category_list(self, cat_key):
-        c_j = self._create_object('categories', cat_key)
-        if 'category' in c_j:
-            cat = self._get_category_list(c_j['category']['@id'])
-        else:
-            cat = []
-        cat.append(c_j['name'])
-        return cat
+        if cat_key not in self._categories:
+            c_j = self._create_object('categories', cat_key)
+            if 'category' in c_j:
+                cat = self._get_category_list(c_j['category']['@id'])
+            else:
+                cat = []
+            cat.append(c_j['name'])
+            self._categories[cat_key] = cat
+        return list(self._categories[cat_key])
 
     def _create_unit(self, unit_id):
         try:
             u_j = self._create_object('unit_groups', unit_id)
-        except KeyError:
+        except (KeyError, FileNotFoundError):
             return LcUnit(unit_id), None
         unitconv = dict()
         unit = None
 
         for conv in u_j['units']:
-            is_ref = conv.pop('referenceUnit', False)
-            name = conv.pop('name')
-            cf_i = conv.pop('conversionFactor')
+            is_ref = conv.get('referenceUnit', False)
+            name = conv['name']
+            cf_i = conv['conversionFactor']
             unitconv[name] = 1.0 / cf_i
 
             if is_ref:
@@ -142,7 +178,7 @@ class OpenLcaJsonLdArchive(LcArchive):
         ref_q = None
 
         for fp in fps:
-            q = self.retrieve_or_fetch_entity(fp['flowProperty']['@id'], typ='flow_properties')
+            q = self._get_olca_entity(fp['flowProperty']['@id'], 'flow_properties')
             ref = fp.pop('referenceFlowProperty', False)
             fac = fp.pop('conversionFactor')
             if ref:
@@ -163,11 +199,11 @@ class OpenLcaJsonLdArchive(LcArchive):
         return f
 
     def _add_exchange(self, p, ex):
-        flow = self.retrieve_or_fetch_entity(ex['flow']['@id'], typ='flows')
+        flow = self._get_olca_entity(ex['flow']['@id'], 'flows')
         value = ex['amount']
         dirn = 'Input' if ex['input'] else 'Output'
 
-        fp = self.retrieve_or_fetch_entity(ex['flowProperty']['@id'], typ='flow_properties')
+        fp = self._get_olca_entity(ex['flowProperty']['@id'], 'flow_properties')
 
         try:
             v_unit = ex['unit']['name']
@@ -207,7 +243,7 @@ class OpenLcaJsonLdArchive(LcArchive):
                     print('Speculative CAUSAL_ALLOCATION')
                     continue
                 q = self._create_allocation_quantity(p, af['allocationType'])
-                f = self.retrieve_or_fetch_entity(af['product']['@id'], typ='flows')
+                f = self._get_olca_entity(af['product']['@id'], 'flows')
                 try:
                     x = p.reference(f)
                 except NoExchangeFound:
@@ -256,7 +292,7 @@ class OpenLcaJsonLdArchive(LcArchive):
         for ex in exch:
             ref = ex.pop('quantitativeReference', False)
             if ref:
-                flow = self.retrieve_or_fetch_entity(ex['flow']['@id'], typ='flows')
+                flow = self._get_olca_entity(ex['flow']['@id'], 'flows')
                 dirn = 'Input' if ex['input'] else 'Output'
                 p.add_reference(flow, dirn)
 
@@ -279,8 +315,78 @@ class OpenLcaJsonLdArchive(LcArchive):
 
         return _ent_g(key)
 
-    def _load_all(self, **kwargs):
-        for f in self._archive.listfiles(in_prefix='process'):
-            ff = f.split('/')
-            fg = ff[1].split('.')
-            self._create_process(fg[0])
+    def _load_all(self, workers=None, **kwargs):
+        """
+        Bulk import: decode every object in the archive, type by type (see LOAD_STAGES), and build entities from
+        them as they arrive.  Prints the time spent decoding and building each stage, and keeps it in
+        self.load_timing as a list of (typ, count, decode seconds, build seconds).
+        :param workers: [None] if greater than 1, decode the JSON files in that many worker processes.  Entities are
+         built in this process, in archive order.
+        :return:
+        """
+        if self._type_members is None:
+            self._gen_index()
+        executor = None
+        if workers is not None and workers > 1:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_olca_worker,
+                                           initargs=(self.source, self.internal_prefix))
+        self.load_timing = []
+        try:
+            for typ in LOAD_STAGES:
+                self.load_timing.append(self._load_stage(typ, executor, workers))
+        finally:
+            self._staged = dict()
+            if executor is not None:
+                executor.shutdown()
+        for typ, count, t_decode, t_build in self.load_timing:
+            print(' %-15s %6d objects  decode %8.2f s  build %8.2f s' % (typ, count, t_decode, t_build))
+        self.check_counter('quantity')
+        self.check_counter('flow')
+        self.check_counter('process')
+
+    def _load_stage(self, typ, executor, workers):
+        """
+        Decode and build all objects of one type that are not already loaded.  Unit groups stay staged until the end
+        of the load; other objects are dropped once built.
+        :param typ:
+        :param executor: a ProcessPoolExecutor, or None to decode in this process
+        :param workers:
+        :return: (typ, count, decode seconds, build seconds)
+        """
+        build = {'categories': self._get_category_list,
+                 'flow_properties': self._create_quantity,
+                 'flows': self._create_flow,
+                 'processes': self._create_process}.get(typ)
+        if typ in ('categories', 'unit_groups'):
+            keys = list(self._type_members.get(typ, []))
+        else:
+            keys = [k for k in self._type_members.get(typ, []) if self[k] is None]
+        paths = [os.path.join(typ, k + '.json') for k in keys]
+        if executor is None:
+            objs = (json.loads(self._archive.readfile(path)) for path in paths)
+        else:
+            objs = executor.map(_read_olca_worker, paths, chunksize=max(1, len(paths) // (workers * 16)))
+        objs = iter(objs)
+        t_decode = t_build = 0.0
+        for key in keys:
+            t0 = time()
+            self._staged[typ, key] = next(objs)
+            t1 = time()
+            t_decode += t1 - t0
+            if build is not None:
+                build(key)
+                self._staged.pop((typ, key), None)
+            t_build += time() - t1
+        return typ, len(keys), t_decode, t_build
+
+
+_worker_store = None
+
+
+def _init_olca_worker(source, prefix):
+    global _worker_store
+    _worker_store = FileStore(source, internal_prefix=prefix)
+
+
+def _read_olca_worker(path):
+    return json.loads(_worker_store.readfile(path))
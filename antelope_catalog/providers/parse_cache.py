@@ -0,0 +1,128 @@
+"""
+On-disk cache of records parsed from the member files of a FileStore, so that XML datasets only need to be parsed
+once.  Each entry is keyed by a hash of the parser namespace and the member's signature (archive path, member name,
+mtime and size -- see FileStore.member_signature), so a modified file or archive simply misses.
+
+Records must be picklable; providers store plain namedtuples rather than entities or objectified XML.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+
+class ParseCache(object):
+    """
+    A directory of pickled parse records for one FileStore.
+    """
+    def __init__(self, cache_dir, file_store, namespace):
+        """
+        :param cache_dir: directory to hold the cache; created if missing
+        :param file_store: the FileStore whose members are being parsed
+        :param namespace: distinguishes parsers (and parser versions) sharing a cache_dir
+        """
+        self._dir = os.path.abspath(cache_dir)
+        if not os.path.isdir(self._dir):
+            os.makedirs(self._dir)
+        self._store = file_store
+        self._ns = namespace
+        self.hits = 0
+        self.misses = 0
+        self.index_hits = 0  # get_or_build_index
+        self.index_misses = 0
+
+    @property
+    def cache_dir(self):
+        return self._dir
+
+    def _key(self, fname):
+        sig = self._store.member_signature(fname)
+        if sig is None:
+            return None
+        return hashlib.sha1(repr((self._ns,) + sig).encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self._dir, key[:2], key + '.pickle')
+
+    def get(self, fname):
+        """
+        :param fname: member name
+        :return: the cached record, or None
+        """
+        key = self._key(fname)
+        if key is not None:
+            try:
+                with open(self._path(key), 'rb') as fp:
+                    rec = pickle.load(fp)
+                self.hits += 1
+                return rec
+            except (OSError, EOFError, pickle.UnpicklingError):
+                pass
+        self.misses += 1
+        return None
+
+    def put(self, fname, record):
+        """
+        Store a record.  Writes are atomic so that concurrent loaders can share a cache.
+        :param fname: member name
+        :param record:
+        :return:
+        """
+        key = self._key(fname)
+        if key is None:
+            return
+        self._write(self._path(key), record)
+
+    @staticmethod
+    def _write(path, record):
+        d = os.path.dirname(path)
+        if not os.path.isdir(d):
+            os.makedirs(d, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=d)
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                pickle.dump(record, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def get_or_parse(self, fname, parse):
+        """
+        :param fname: member name
+        :param parse: callable fname -> record, called on a miss
+        :return:
+        """
+        rec = self.get(fname)
+        if rec is None:
+            rec = parse(fname)
+            if rec is not None:
+                self.put(fname, rec)
+        return rec
+
+    def get_or_build_index(self, name, build):
+        """
+        Like get_or_parse, but for a record describing the whole archive (e.g. a map of its members) rather than one
+        member file.  The entry is keyed by the archive's signature (see FileStore.archive_signature), so it is rebuilt
+        whenever the archive changes.
+        :param name: distinguishes different indices of the same archive
+        :param build: callable () -> record, called on a miss
+        :return:
+        """
+        sig = self._store.archive_signature()
+        if sig is None:
+            return build()
+        key = hashlib.sha1(repr((self._ns, name) + sig).encode('utf-8')).hexdigest()
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as fp:
+                rec = pickle.load(fp)
+            self.index_hits += 1
+            return rec
+        except (OSError, EOFError, pickle.UnpicklingError):
+            pass
+        self.index_misses += 1
+        rec = build()
+        self._write(path, rec)
+        return rec
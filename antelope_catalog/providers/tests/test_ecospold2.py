@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from antelope_utilities.benchmarks.synthetic import write_synthetic_spold2
+from ..ecospold2 import EcospoldV2Archive
+from ..ecospold2.ecospold2 import spold_filename
+
+
+class EcospoldV2ParallelLoadTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.path = tempfile.mkdtemp()
+        cls.n_files = write_synthetic_spold2(cls.path, n_processes=25, n_exchanges=12, n_elementary=40,
+                                             coproduct_every=5)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.path)
+
+    def _load(self, workers):
+        ar = EcospoldV2Archive(self.path)
+        ar.load_all(workers=workers)
+        return ar.serialize(exchanges=True, values=True)
+
+    def test_map_datasets(self):
+        ar = EcospoldV2Archive(self.path)
+        self.assertEqual(ar.count_by_type('process'), 25)
+        self.assertEqual(sum(len(r) for r in ar.ti.values()), self.n_files)
+
+    def test_parallel_matches_serial(self):
+        serial = self._load(None)
+        parallel = self._load(2)
+        for k in ('quantities', 'flows', 'processes'):
+            self.assertEqual(serial[k], parallel[k])
+        self.assertEqual(len(serial['processes']), 25)
+        co = next(p for p in serial['processes'] if p['Name'] == 'synthetic process 5')
+        self.assertEqual(len([x for x in co['exchanges'] if x.get('isReference')]), 2)
+
+    def test_parse_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        try:
+            serial = self._load(None)
+            cold = EcospoldV2Archive(self.path, parse_cache=cache_dir)
+            cold.load_all()
+            warm = EcospoldV2Archive(self.path, parse_cache=cache_dir)
+            warm.load_all()
+            self.assertEqual(cold._parse_cache.misses, self.n_files)
+            self.assertEqual(warm._parse_cache.hits, self.n_files)
+            self.assertEqual(warm._parse_cache.misses, 0)
+            self.assertEqual(serial['processes'], warm.serialize(exchanges=True, values=True)['processes'])
+        finally:
+            shutil.rmtree(cache_dir)
+
+    def test_dataset_map_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        path = os.path.join(tempfile.mkdtemp(), 'datasets')
+        try:
+            shutil.copytree(self.path, path)
+            cold = EcospoldV2Archive(path, parse_cache=cache_dir)
+            warm = EcospoldV2Archive(path, parse_cache=cache_dir)
+            self.assertEqual(cold._parse_cache.index_misses, 1)
+            self.assertEqual(warm._parse_cache.index_hits, 1)
+            self.assertEqual(warm._parse_cache.index_misses, 0)
+            self.assertEqual(dict(warm.ti), dict(cold.ti))
+            self.assertEqual(warm.count_by_type('process'), 25)
+
+            # adding a dataset changes the archive signature, so the map is rebuilt
+            src = sorted(os.listdir(path))[0]
+            shutil.copy(os.path.join(path, src), os.path.join(path, spold_filename('0' * 8 + src[8:36], src[37:73])))
+            changed = EcospoldV2Archive(path, parse_cache=cache_dir)
+            self.assertEqual(changed._parse_cache.index_misses, 1)
+            self.assertEqual(changed.count_by_type('process'), 26)
+        finally:
+            shutil.rmtree(cache_dir)
+            shutil.rmtree(os.path.dirname(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..file_store import FileStore
+
+SOLID_7Z = os.path.join(os.path.dirname(__file__), 'data', 'solid_test.7z')
+
+
+class FileStore7zTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'solid_test.7z')
+        shutil.copy(SOLID_7Z, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_listfiles_prefix(self):
+        fs = FileStore(self.path, internal_prefix='datasets')
+        self.assertEqual(len(list(fs.listfiles())), 12)
+        self.assertEqual(list(fs.listfiles(in_prefix='1')), ['10_member.xml', '11_member.xml'])
+        self.assertTrue(fs.readfile('05_member.xml').startswith(b'<member index="5">'))
+
+    def test_transcode(self):
+        fs = FileStore(self.path)
+        self.assertFalse(fs.random_access)
+        names = list(fs.listfiles())
+        contents = {n: fs.readfile(n) for n in reversed(names)}
+        fs.transcode()
+        self.assertTrue(fs.random_access)
+        self.assertEqual({n: fs.readfile(n) for n in names}, contents)
+
+        fs2 = FileStore(self.path)
+        self.assertTrue(fs2.random_access)
+        self.assertEqual(list(fs2.listfiles()), names)
+        self.assertEqual({n: fs2.readfile(n) for n in names}, contents)
+
+    def test_stale_transcode(self):
+        FileStore(self.path).transcode()
+        st = os.stat(self.path)
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertFalse(FileStore(self.path).random_access)
+
+    def test_read_cache(self):
+        fs = FileStore(self.path, internal_prefix='datasets', read_cache_size=200)
+        a = fs.readfile('00_member.xml')
+        self.assertIs(fs.readfile('00_member.xml'), a)
+        for n in ('01_member.xml', '02_member.xml', '03_member.xml'):
+            fs.readfile(n)
+        self.assertLessEqual(fs._read_cache_bytes, 200)
+        self.assertNotIn('datasets/00_member.xml', fs._read_cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
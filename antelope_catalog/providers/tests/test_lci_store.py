@@ -0,0 +1,69 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from lcatools.archives import LcArchive
+from antelope_utilities.benchmarks.synthetic import synthetic_archive_json, SYNTHETIC_REF
+from ..lci_store import LciStore, process_record, load_record
+
+
+class LciStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, 'lci_store_test')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_put_get(self):
+        store = LciStore(self.path)
+        self.assertIsNone(store.get('a'))
+        store.put('a', {'value': 1})
+        store.put('b', {'value': [2, 3]})
+        self.assertEqual(store.get('a'), {'value': 1})
+        self.assertEqual(store.get('b'), {'value': [2, 3]})
+        self.assertEqual(len(LciStore(self.path)), 2)
+
+    def test_later_record_wins(self):
+        store = LciStore(self.path)
+        store.put('a', {'value': 1})
+        store.put('a', {'value': 2})
+        self.assertEqual(LciStore(self.path).get('a'), {'value': 2})
+
+    def test_concurrent_reader(self):
+        reader = LciStore(self.path)
+        writer = LciStore(self.path)
+        writer.put('a', {'value': 1})
+        self.assertIn('a', reader)
+        self.assertEqual(reader.get('a'), {'value': 1})
+
+    def test_partial_index_line(self):
+        store = LciStore(self.path)
+        store.put('a', {'value': 1})
+        with open(store.index_file, 'a') as fp:
+            fp.write('b\t12')  # a writer in mid-line
+        reader = LciStore(self.path)
+        self.assertNotIn('b', reader)
+        self.assertEqual(reader.get('a'), {'value': 1})
+
+    def test_process_record(self):
+        src = LcArchive(None, ref=SYNTHETIC_REF)
+        src.load_from_dict(synthetic_archive_json(n_processes=10, n_exchanges=8, n_elementary=20), _check=False)
+        store = LciStore(self.path)
+        procs = sorted(src.entities_by_type('process'), key=lambda x: x.external_ref)
+        for p in procs:
+            store.put(p.external_ref, process_record(p))
+
+        dest = LcArchive(None, ref=SYNTHETIC_REF)
+        p = procs[3]
+        loaded = load_record(dest, store.get(p.external_ref))
+        self.assertEqual(len(loaded), 1)
+        self.assertEqual(loaded[0].serialize(exchanges=True, values=True), p.serialize(exchanges=True, values=True))
+        self.assertEqual(dest.count_by_type('process'), 1)
+        load_record(dest, store.get(procs[4].external_ref))  # shares flows with procs[3]
+        self.assertEqual(dest.count_by_type('process'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from antelope_utilities.benchmarks.synthetic import write_synthetic_olca, _uuid
+from ..openlca_jsonld import OpenLcaJsonLdArchive, LOAD_STAGES
+
+NS_UUID = '9a3a1a4e-1a5c-4b4a-8a4e-5b0e6f0e3c2d'  # so that allocation quantities get the same ids
+
+
+class OpenLcaBulkLoadTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.tmp, 'olca.zip')
+        write_synthetic_olca(cls.path, n_processes=30, n_exchanges=12, n_elementary=40, coproduct_every=5)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp)
+
+    @staticmethod
+    def _serialize(ar):
+        j = ar.serialize(characterizations=True, exchanges=True, values=True)
+        return dict((k, sorted(j[k], key=lambda x: x['entityId'])) for k in ('quantities', 'flows', 'processes'))
+
+    def _on_demand(self):
+        ar = OpenLcaJsonLdArchive(self.path, ns_uuid=NS_UUID)
+        for i in range(30):
+            ar.retrieve_or_fetch_entity(_uuid('olca', 'process', i), typ='processes')
+        return ar
+
+    def test_bulk_matches_on_demand(self):
+        bulk = OpenLcaJsonLdArchive(self.path, ns_uuid=NS_UUID)
+        bulk.load_all()
+        on_demand = self._serialize(self._on_demand())
+        s = self._serialize(bulk)
+        for k in ('quantities', 'flows', 'processes'):
+            self.assertEqual(s[k], on_demand[k])
+        self.assertEqual(len(s['processes']), 30)
+
+    def test_allocation(self):
+        bulk = OpenLcaJsonLdArchive(self.path, ns_uuid=NS_UUID)
+        bulk.load_all()
+        p = bulk[_uuid('olca', 'process', 5)]
+        self.assertEqual(len(list(p.references())), 2)
+        self.assertEqual(p['Classifications'], ['Processes', 'synthetic'])
+        self.assertEqual(bulk.count_by_type('quantity'), 1 + 6)  # mass + one allocation quantity per coproduct
+
+    def test_load_timing(self):
+        bulk = OpenLcaJsonLdArchive(self.path, ns_uuid=NS_UUID)
+        bulk.load_all()
+        self.assertEqual(tuple(k[0] for k in bulk.load_timing), LOAD_STAGES)
+        self.assertEqual([k[1] for k in bulk.load_timing], [7, 1, 1, 76, 30])
+
+    def test_workers(self):
+        serial = OpenLcaJsonLdArchive(self.path, ns_uuid=NS_UUID)
+        serial.load_all()
+        parallel = OpenLcaJsonLdArchive(self.path, ns_uuid=NS_UUID)
+        parallel.load_all(workers=2)
+        self.assertEqual(self._serialize(parallel)['processes'], self._serialize(serial)['processes'])
+
+
+if __name__ == '__main__':
+    unittest.main()
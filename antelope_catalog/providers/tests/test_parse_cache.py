@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..file_store import FileStore
+from ..parse_cache import ParseCache
+
+
+class ParseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.data_dir, 'a.xml'), 'w') as fp:
+            fp.write('<a/>')
+        self.store = FileStore(self.data_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+        shutil.rmtree(self.cache_dir)
+
+    def test_round_trip(self):
+        c = ParseCache(self.cache_dir, self.store, 'test')
+        self.assertIsNone(c.get('a.xml'))
+        self.assertEqual(c.get_or_parse('a.xml', lambda fn: {'parsed': fn}), {'parsed': 'a.xml'})
+        c2 = ParseCache(self.cache_dir, self.store, 'test')
+        self.assertEqual(c2.get_or_parse('a.xml', lambda fn: self.fail('parsed twice')), {'parsed': 'a.xml'})
+        self.assertEqual((c2.hits, c2.misses), (1, 0))
+
+    def test_namespace(self):
+        ParseCache(self.cache_dir, self.store, 'test').put('a.xml', 1)
+        self.assertIsNone(ParseCache(self.cache_dir, self.store, 'other').get('a.xml'))
+
+    def test_modified_member_misses(self):
+        c = ParseCache(self.cache_dir, self.store, 'test')
+        c.put('a.xml', 1)
+        path = os.path.join(self.data_dir, 'a.xml')
+        with open(path, 'w') as fp:
+            fp.write('<a>changed</a>')
+        self.assertIsNone(c.get('a.xml'))
+
+    def test_missing_member(self):
+        c = ParseCache(self.cache_dir, self.store, 'test')
+        c.put('b.xml', 1)
+        self.assertIsNone(c.get('b.xml'))
+        self.assertEqual(os.listdir(self.cache_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
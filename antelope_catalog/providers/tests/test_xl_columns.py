@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import xlrd
+
+from antelope_utilities.benchmarks.synthetic import write_synthetic_ei_lcia, write_xlsx
+from .. import xl_columns
+from ..xl_columns import XlColumns
+from ..xl_dict import XlDict
+from ..ecoinvent_lcia import EcoinventLcia
+from ..data import DEFAULT_DATA_PATH
+
+TRACI_2_1 = os.path.join(DEFAULT_DATA_PATH, 'traci_2_1_2014_dec_10_0_test.xlsx')
+
+
+def _no_workbook():
+    raise AssertionError('workbook opened')
+
+
+class XlColumnsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        xl_columns._compiled.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+        xl_columns._compiled.clear()
+
+    def test_matches_xl_dict(self):
+        cols = XlColumns.from_workbook(TRACI_2_1, 'Substances')
+        rows = XlDict.from_sheetname(xlrd.open_workbook(TRACI_2_1), 'Substances')
+        self.assertListEqual(list(cols.iterrows()), list(rows.iterrows()))
+
+    def test_cache_dir(self):
+        cache = os.path.join(self.tmp, 'cache')
+        cold = XlColumns.from_workbook(TRACI_2_1, 'Substances', cache_dir=cache)
+        self.assertEqual(len(os.listdir(cache)), 1)
+        xl_columns._compiled.clear()
+        warm = XlColumns.from_workbook(TRACI_2_1, 'Substances', cache_dir=cache, open_workbook=_no_workbook)
+        self.assertListEqual(warm.headers, cold.headers)
+        self.assertListEqual(warm.column('Substance Name'), cold.column('Substance Name'))
+
+    def test_changed_workbook(self):
+        path = os.path.join(self.tmp, 'book.xlsx')
+        write_xlsx(path, [('data', [['a', 'b'], ['x', 1.0], ['y', 2.0]])])
+        self.assertListEqual(XlColumns.from_workbook(path, 'data').column('b'), [1.0, 2.0])
+        write_xlsx(path, [('data', [['a', 'b'], ['x', 3.0]])])
+        self.assertListEqual(XlColumns.from_workbook(path, 'data').column('b'), [3.0])
+
+    def test_memo(self):
+        cols = XlColumns.from_workbook(TRACI_2_1, 'Substances')
+        workbook_hash, xl_columns.workbook_hash = xl_columns.workbook_hash, _no_workbook
+        try:
+            self.assertIs(XlColumns.from_workbook(TRACI_2_1, 'Substances'), cols)  # a hit does not hash the workbook
+        finally:
+            xl_columns.workbook_hash = workbook_hash
+        del cols
+        self.assertEqual(len(xl_columns._compiled), 0)  # released with the last reference
+
+    def test_groups(self):
+        path = os.path.join(self.tmp, 'book.xlsx')
+        write_xlsx(path, [('data', [['a', 'b'], ['x', 1.0], ['y', 2.0], ['x', 3.0]])])
+        cols = XlColumns.from_workbook(path, 0)
+        self.assertDictEqual(cols.groups('a'), {('x',): [0, 2], ('y',): [1]})
+        self.assertDictEqual(cols.row(2, drop=('a',)), {'b': 3.0})
+
+
+class EcoinventLciaOnDemandTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        cls.path = os.path.join(cls.tmp, 'lcia.xlsx')
+        write_synthetic_ei_lcia(cls.path, n_methods=6, n_flows=20)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp)
+
+    def test_load_all(self):
+        ar = EcoinventLcia(self.path)
+        ar.load_all()
+        self.assertEqual(ar.count_by_type('flow'), 20)
+        f = next(ar.entities_by_type('flow'))
+        self.assertEqual(len([cf for cf in f.characterizations() if cf.quantity is not ar._mass]), 6)
+
+    def test_single_method(self):
+        ar = EcoinventLcia(self.path, static=False)
+        qi = ar.make_interface('quantity')
+        key = 'synthetic method 0, category 3, indicator 3'
+        cfs = list(qi.factors(key))
+        self.assertEqual(len(cfs), 20)
+        self.assertEqual(ar._methods_loaded, {key})
+        full = EcoinventLcia(self.path)
+        full.load_all()
+        expected = dict((cf.flow.external_ref, cf.value) for cf in full.make_interface('quantity').factors(key))
+        self.assertDictEqual(dict((cf.flow.external_ref, cf.value) for cf in cfs), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,8 +12,7 @@ On that topic, it is simply foolhardy to try to build a version-agnostic provide
 versions (as is the case with TRACI)
 """
 
-import xlrd
-from ..xl_dict import XlDict
+from ..xl_columns import XlColumns
 from lcatools.archives import BasicArchive
 from lcatools.entities import LcQuantity, LcFlow
 from lcatools.characterizations import Characterization, DuplicateCharacterizationError
@@ -29,17 +28,28 @@ def transform_string_cas(string_cas):
 class Traci21Factors(BasicArchive):
     _ns_uuid_required = True
 
-    def __init__(self, source, ref=None, sheet_name='Substances', mass_quantity=None, ns_uuid=t_uuid, **kwargs):
+    def __init__(self, source, ref=None, sheet_name='Substances', mass_quantity=None, ns_uuid=t_uuid,
+                 sheet_cache=None, **kwargs):
+        """
+
+        :param source:
+        :param ref:
+        :param sheet_name:
+        :param mass_quantity:
+        :param ns_uuid:
+        :param sheet_cache: [None] directory in which to keep a compiled copy of the sheet (see XlColumns)
+        :param kwargs:
+        """
         if ref is None:
             ref = '.'.join(['local', 'traci', '2', '1', 'spreadsheet'])
         super(Traci21Factors, self).__init__(source, ref=ref, ns_uuid=ns_uuid, **kwargs)
 
         print('Loading workbook %s' % self.source)
-        self._xl = xlrd.open_workbook(self.source)
-
         self._serialize_dict['sheet_name'] = sheet_name
+        if sheet_cache is not None:
+            self._serialize_dict['sheet_cache'] = sheet_cache
 
-        self._rows = XlDict.from_sheetname(self._xl, sheet_name)
+        self._rows = XlColumns.from_workbook(self.source, sheet_name, cache_dir=sheet_cache)
 
         self._methods = dict()  # store column-to-method mapping
         for col, val in q_info.items():
@@ -152,11 +162,11 @@ class Traci21Factors(BasicArchive):
     def row_for_key(self, key):
         if CAS_regexp.match(key):
             key = transform_string_cas(key)
-            for i, row in self._rows.iterrows():
-                if row['CAS #'] == key:
-                    yield row
+            for i, cas in enumerate(self._rows.column('CAS #')):
+                if cas == key:
+                    yield self._rows.row(i)
         else:
             key = key.lower()
-            for i, row in self._rows.iterrows():
-                if row['Substance Name'].lower() == key:
-                    yield row
+            for i, name in enumerate(self._rows.column('Substance Name')):
+                if name.lower() == key:
+                    yield self._rows.row(i)
@@ -1,4 +1,3 @@
-import json
 from collections import defaultdict
 
 from lcatools.archives import BasicArchive, LC_ENTITY_TYPES
@@ -12,16 +11,15 @@ from .inventory import AntelopeInventoryImplementation
 from .quantity import AntelopeQuantityImplementation
 from .index import AntelopeIndexImplementation
 from .exceptions import AntelopeV1Error
+from .fetcher import EndpointFetcher, DEFAULT_MAX_AGE
 
 
-import requests
-
 try:
     # from urllib.request import urlopen, urljoin
-    from urllib.parse import urlparse, urljoin
+    from urllib.parse import urlparse
 except ImportError:
     # from urllib2 import urlopen
-    from urlparse import urlparse, urljoin
+    from urlparse import urlparse
 
 
 def remote_ref(url):
@@ -61,21 +59,32 @@ class AntelopeV1Client(BasicArchive):
     """
     _entity_types = set(FOREGROUND_ENTITY_TYPES).union(set(LC_ENTITY_TYPES))
 
-    def __init__(self, source, ref=None, **kwargs):
+    def __init__(self, source, ref=None, max_workers=8, cache_dir=None, max_age=None, **kwargs):
         """
 
         :param source:
         :param catalog:
+        :param max_workers: [8] upper bound on concurrent requests to the server
+        :param cache_dir: [None] directory in which to keep server responses between sessions
+        :param max_age: [None] seconds for which a cached response is used without revalidation, if the server
+         doesn't say.  Default one week.
         :param kwargs:
         """
         if ref is None:
             ref = remote_ref(source)
 
         super(AntelopeV1Client, self).__init__(source, ref=ref, **kwargs)
+        if max_workers != 8:
+            self._serialize_dict['max_workers'] = max_workers
+        if cache_dir is not None:
+            self._serialize_dict['cache_dir'] = cache_dir
+        if max_age is not None:
+            self._serialize_dict['max_age'] = max_age
 
         self._query = BasicQuery(self)
 
-        self._s = requests.Session()
+        self._fetcher = EndpointFetcher(source, max_workers=max_workers, cache_dir=cache_dir,
+                                        max_age=max_age or DEFAULT_MAX_AGE)
 
         # a set of dicts where the key is a string-formatted integer and the value is an entity_ref
         self._endpoints = dict()
@@ -92,6 +101,13 @@ class AntelopeV1Client(BasicArchive):
             self._parse_and_save_entity(fp)
         self._fetched_all['flowproperty'] = True
 
+    def close(self):
+        """
+        Stop the threads that fetch from the server and drop the raw responses kept in memory
+        :return:
+        """
+        self._fetcher.close()
+
     def make_interface(self, iface):
         if iface == 'index':
             return AntelopeIndexImplementation(self)
@@ -129,7 +145,10 @@ class AntelopeV1Client(BasicArchive):
                         continue
                 yield v
         else:
-            for j in self.get_endpoint(endp, cache=False):
+            js = self.get_endpoint(endp, cache=False)
+            if entity_type == 'fragment':
+                self.prefetch('flows/%s' % j['termFlowID'] for j in js)
+            for j in js:
                 yield self._parse_and_save_entity(j)
             self._fetched_all[entity_type] = True
 
@@ -155,13 +174,30 @@ class AntelopeV1Client(BasicArchive):
             return self._endpoints[endpoint]
 
         self._print('Fetching %s from remote server' % endpoint)
-        url = urljoin(self.source, endpoint)
-        j = json.loads(self._s.get(url).content)
+        j = self._fetcher.get(endpoint)
 
         if cache:
             self._endpoints[endpoint] = j
         return j
 
+    def prefetch(self, keys):
+        """
+        Fetch the named endpoints concurrently, skipping entities the client already knows, so that the requests
+        made while parsing a compound response are answered from memory.
+        :param keys: iterable of endpoints, e.g. 'flows/12'
+        :return:
+        """
+        fetch = []
+        for key in keys:
+            if key in self._entities or key in self._endpoints:
+                continue
+            parts = key.split('/')
+            if len(parts) == 2 and parts[1] in self._cached[parts[0]]:
+                continue
+            fetch.append(key)
+        if len(fetch) > 0:
+            self._fetcher.prefetch(fetch)
+
     def _key_to_id(self, key):
         return key
 
@@ -0,0 +1,231 @@
+"""
+Concurrent, coalescing, optionally persistent fetching of JSON endpoints from a remote server.
+
+The .NET-era Antelope API answers one small JSON document per endpoint, so a client that needs fifty entities makes
+fifty round trips.  EndpointFetcher lets the client ask for many endpoints at once:
+
+ * bounded parallelism: requests run in a thread pool of at most max_workers threads, each with its own
+   requests.Session;
+ * request coalescing: an endpoint that is already being fetched is not requested again-- later callers wait on the
+   same request;
+ * response memo: the most recently completed responses are kept (as raw bytes), up to memo_size of them, so that
+   endpoints prefetched together are answered from memory when the client then asks for them one by one.  Each
+   caller gets its own freshly decoded copy, since the client pop()s the parts of a response it uses;
+ * on-disk cache (optional): responses are stored in cache_dir together with freshness metadata-- time fetched,
+   max-age, ETag and Last-Modified.  Fresh entries are served without contacting the server; stale entries are
+   revalidated with a conditional GET, and a 304 just renews them.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+
+import requests
+
+try:
+    from urllib.parse import urljoin
+except ImportError:
+    from urlparse import urljoin
+
+
+DEFAULT_MAX_AGE = 7 * 24 * 3600  # seconds a cached response stays fresh, if the server doesn't say
+DEFAULT_MEMO_SIZE = 256
+
+_max_age_regex = re.compile(r'max-age=(\d+)')
+
+
+class EndpointFetcher(object):
+    def __init__(self, base_url, max_workers=8, cache_dir=None, max_age=DEFAULT_MAX_AGE, memo_size=DEFAULT_MEMO_SIZE):
+        """
+
+        :param base_url: endpoints are joined to this
+        :param max_workers: [8] upper bound on concurrent requests
+        :param cache_dir: [None] directory for the persistent response cache; created if missing
+        :param max_age: [one week] seconds for which a cached response is used without revalidation, unless the
+         response carries a Cache-Control max-age
+        :param memo_size: [256] number of responses kept in memory; the least recently used are dropped first
+        """
+        self._base = base_url
+        self._max_workers = max_workers
+        self._cache_dir = cache_dir
+        self._max_age = max_age
+        self._memo_size = memo_size
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._pool = None
+        self._in_flight = dict()  # endpoint: Future
+        self._responses = OrderedDict()  # endpoint: bytes, least recently used first
+
+        self.requests = 0  # GETs actually sent
+        self.revalidated = 0  # of which answered 304
+        self.disk_hits = 0
+        self.coalesced = 0
+
+    @property
+    def _session(self):
+        s = getattr(self._local, 'session', None)
+        if s is None:
+            s = self._local.session = requests.Session()
+        return s
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._max_workers)
+        return self._pool
+
+    def close(self):
+        """
+        Stop the request threads, once requests in flight are complete, and drop the responses kept in memory.  The
+        fetcher remains usable: a new thread pool is started if needed.
+        :return:
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        with self._lock:
+            self._responses.clear()
+
+    def __del__(self):
+        pool = getattr(self, '_pool', None)
+        if pool is not None:
+            pool.shutdown(wait=False)
+
+    '''
+    disk cache
+    '''
+    def _cache_path(self, url):
+        return os.path.join(self._cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.pkl')
+
+    def _read_cached(self, url):
+        if self._cache_dir is None:
+            return None
+        try:
+            with open(self._cache_path(url), 'rb') as fp:
+                return pickle.load(fp)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def _write_cached(self, url, meta, content):
+        if self._cache_dir is None:
+            return
+        try:
+            if not os.path.isdir(self._cache_dir):
+                os.makedirs(self._cache_dir, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self._cache_dir)
+            with os.fdopen(fd, 'wb') as fp:
+                pickle.dump((meta, content), fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._cache_path(url))
+        except OSError:
+            pass  # the cache is an optimization
+
+    def _response_meta(self, response):
+        max_age = None
+        m = _max_age_regex.search(response.headers.get('Cache-Control', ''))
+        if m is not None:
+            max_age = int(m.group(1))
+        return {'url': response.url,
+                'fetched': time.time(),
+                'max_age': max_age,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')}
+
+    '''
+    fetching
+    '''
+    def _get_url(self, url):
+        """
+        :param url:
+        :return: response content, from the disk cache if fresh
+        """
+        cached = self._read_cached(url)
+        headers = dict()
+        if cached is not None:
+            meta, content = cached
+            max_age = self._max_age if meta['max_age'] is None else meta['max_age']
+            if time.time() - meta['fetched'] < max_age:
+                with self._lock:
+                    self.disk_hits += 1
+                return content
+            if meta['etag'] is not None:
+                headers['If-None-Match'] = meta['etag']
+            if meta['last_modified'] is not None:
+                headers['If-Modified-Since'] = meta['last_modified']
+        r = self._session.get(url, headers=headers)
+        with self._lock:
+            self.requests += 1
+        if r.status_code == 304 and cached is not None:
+            with self._lock:
+                self.revalidated += 1
+            meta, content = cached
+            meta.update(fetched=time.time())
+            self._write_cached(url, meta, content)
+            return content
+        r.raise_for_status()
+        self._write_cached(url, self._response_meta(r), r.content)
+        return r.content
+
+    def _memo_get(self, endpoint):
+        """
+        Must be called with the lock held
+        """
+        content = self._responses.get(endpoint)
+        if content is not None:
+            self._responses.move_to_end(endpoint)
+        return content
+
+    def _complete(self, endpoint, future):
+        with self._lock:
+            self._in_flight.pop(endpoint, None)
+            if future.exception() is None and self._memo_size > 0:
+                self._responses[endpoint] = future.result()
+                self._responses.move_to_end(endpoint)
+                while len(self._responses) > self._memo_size:
+                    self._responses.popitem(last=False)
+
+    def submit(self, endpoint):
+        """
+        Start fetching an endpoint, unless it is already fetched or in flight.
+        :param endpoint:
+        :return: a Future whose result is the raw response content
+        """
+        with self._lock:
+            content = self._memo_get(endpoint)
+            if content is not None:
+                f = Future()
+                f.set_result(content)
+                return f
+            if endpoint in self._in_flight:
+                self.coalesced += 1
+                return self._in_flight[endpoint]
+            f = self._executor().submit(self._get_url, urljoin(self._base, endpoint))
+            self._in_flight[endpoint] = f
+        f.add_done_callback(lambda x: self._complete(endpoint, x))
+        return f
+
+    def get(self, endpoint):
+        """
+        Fetch one endpoint, waiting for it.
+        :param endpoint:
+        :return: decoded JSON-- a fresh copy for each call
+        """
+        with self._lock:
+            content = self._memo_get(endpoint)
+        if content is None:
+            content = self.submit(endpoint).result()
+        return json.loads(content)
+
+    def prefetch(self, endpoints):
+        """
+        Fetch several endpoints concurrently and wait for them, so that subsequent get() calls return immediately
+        (for as many of them as the memo holds).  Errors are not raised here, but by the get() calls.
+        :param endpoints:
+        :return:
+        """
+        wait([self.submit(e) for e in set(endpoints)])
@@ -67,6 +67,32 @@ class AntelopeInventoryImplementation(InventoryImplementation):
             for d in component['lciaDetail']:
                 self._add_lcia_detail(res, entity, d, loc=loc)
 
+    def _prefetch_lcia_entities(self, components):
+        """
+        Fetch the processes and flows named in a set of LCIA result components concurrently, rather than one at a time
+        as the components are added.
+        :param components:
+        :return:
+        """
+        keys = []
+        for component in components:
+            if 'processID' in component:
+                keys.append('processes/%s' % component['processID'])
+            keys.extend('flows/%s' % d['flowID'] for d in component['lciaDetail'])
+        self._archive.prefetch(keys)
+
+    def _prefetch_fragment_flow_entities(self, ffs):
+        keys = []
+        for ff in ffs:
+            keys.append('flows/%s' % ff['flowID'])
+            keys.extend('flowproperties/%s' % fpm['flowPropertyID'] for fpm in ff['flowPropertyMagnitudes'][1:])
+            keys.append('fragments/%s' % ff['fragmentID'])
+            if ff['nodeType'] == 'Process':
+                keys.append('processes/%s' % ff['processID'])
+            elif ff['nodeType'] == 'Fragment':
+                keys.append('fragments/%s' % ff['subFragmentID'])
+        self._archive.prefetch(keys)
+
     def _add_lcia_detail(self, res, entity, detail, loc='GLO'):
         flow = self._archive.retrieve_or_fetch_entity('flows/%s' % detail['flowID'])
         exch = ExchangeValue(entity, flow, detail['direction'], value=detail['quantity'])
@@ -134,6 +160,7 @@ class AntelopeInventoryImplementation(InventoryImplementation):
         if 'processes/%s' % component['processID'] != process:
             raise AntelopeV1Error('Reference mismatch: %s begat %s' % (process, component['processID']))
 
+        self._prefetch_lcia_entities(lcia_r['lciaScore'])
         self.add_lcia_component(res, component)
 
         self.check_total(res.total(), total)
@@ -145,9 +172,12 @@ class AntelopeInventoryImplementation(InventoryImplementation):
         else:
             endpoint = '%s/fragmentflows' % fragment
 
+        # the three requests are independent: let them run concurrently
+        self._archive.prefetch([endpoint, 'stages', '%s/flows' % fragment])
         self._archive.fetch_flows(fragment)
 
         ffs = self._archive.get_endpoint(endpoint)
+        self._prefetch_fragment_flow_entities(ffs)
         for ff in ffs:
             if 'fragmentStageID' in ff:
                 ff['StageName'] = self.get_stage_name(ff['fragmentStageID'])
@@ -167,6 +197,7 @@ class AntelopeInventoryImplementation(InventoryImplementation):
         res = LciaResult(lcia_q, scenario=lcia_r.pop('scenarioID'))
         total = lcia_r.pop('total')
 
+        self._prefetch_lcia_entities(lcia_r['lciaScore'])
         for component in lcia_r['lciaScore']:
             self.add_lcia_component(res, component)
 
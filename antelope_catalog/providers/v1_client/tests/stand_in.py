@@ -0,0 +1,287 @@
+"""
+A local stand-in for a .NET-era Antelope server, for testing and benchmarking AntelopeV1Client offline.
+
+StandInServer answers the endpoints the client uses with synthetic, internally consistent JSON: flow properties,
+flows, processes (with comments and LCIA results), one LCIA method, fragments (with flows, fragment flows and LCIA
+results) and stages.  It can add a fixed latency to every response, sends ETags and honours If-None-Match, optionally
+sends a Cache-Control max-age, and counts the requests it answers.
+
+    with StandInServer(latency=0.02) as server:
+        client = AntelopeV1Client(server.url)
+        ...
+        print(server.hits)
+"""
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+N_STAGES = 5
+
+
+def _uuid(endpoint):
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, endpoint))
+
+
+class StandInData(object):
+    """
+    The synthetic server contents.  Every process has an LCIA result against lciamethods/1 with n_details detailed
+    flows; every fragment has a root fragment flow terminated in a process, plus n_children child flows, each
+    terminated in a process and assigned to a stage.
+    """
+    def __init__(self, n_processes=50, n_flows=200, n_fragments=10, n_details=5, n_children=8):
+        self.n_processes = n_processes
+        self.n_flows = n_flows
+        self.n_fragments = n_fragments
+        self.n_details = n_details
+        self.n_children = n_children
+
+    def _flow_id(self, seed):
+        return seed % self.n_flows + 1
+
+    def _process_id(self, seed):
+        return seed % self.n_processes + 1
+
+    @staticmethod
+    def flowproperty(fp_id):
+        return {'resourceType': 'FlowProperty', 'links': [],
+                'uuid': _uuid('flowproperties/%d' % fp_id),
+                'flowPropertyID': fp_id,
+                'name': ['Mass', 'Volume'][fp_id - 1],
+                'referenceUnit': ['kg', 'm3'][fp_id - 1]}
+
+    @staticmethod
+    def flow(flow_id):
+        return {'resourceType': 'Flow', 'links': [],
+                'uuid': _uuid('flows/%d' % flow_id),
+                'flowID': flow_id,
+                'name': 'Synthetic flow %d' % flow_id,
+                'casNumber': '',
+                'category': ['air', 'water', 'soil', 'Intermediate'][flow_id % 4],
+                'referenceFlowPropertyID': 1}
+
+    @staticmethod
+    def process(process_id):
+        return {'resourceType': 'Process', 'links': [],
+                'uuid': _uuid('processes/%d' % process_id),
+                'processID': process_id,
+                'name': 'Synthetic process %d' % process_id,
+                'geography': 'GLO',
+                'referenceYear': '2018'}
+
+    @staticmethod
+    def lcia_method(lm_id):
+        return {'resourceType': 'LCIAMethod', 'links': [],
+                'uuid': _uuid('lciamethods/%d' % lm_id),
+                'lciaMethodID': lm_id,
+                'name': 'Synthetic method %d' % lm_id,
+                'methodology': 'Synthetic',
+                'referenceFlowPropertyID': 100 + lm_id,
+                'referenceFlowProperty': {'name': 'Synthetic indicator %d' % lm_id,
+                                          'referenceUnit': 'kg CO2 eq'},
+                'impactCategoryID': 1}
+
+    @staticmethod
+    def fragment(frag_id):
+        return {'resourceType': 'Fragment', 'links': [],
+                'uuid': _uuid('fragments/%d' % frag_id),
+                'fragmentID': frag_id,
+                'name': 'Synthetic fragment %d' % frag_id,
+                'direction': 'Output',
+                'termFlowID': frag_id}
+
+    def process_details(self, process_id):
+        details = []
+        for k in range(self.n_details):
+            quantity = 0.1 * (k + 1)
+            factor = 1.0 + 0.5 * ((process_id + k) % 3)
+            details.append({'flowID': self._flow_id(process_id * 7 + k),
+                            'direction': 'Output',
+                            'quantity': quantity,
+                            'factor': factor,
+                            'result': quantity * factor})
+        return details
+
+    def process_lcia(self, process_id):
+        details = self.process_details(process_id)
+        total = sum(d['result'] for d in details)
+        return {'scenarioID': 0, 'total': total,
+                'lciaScore': [{'processID': process_id, 'cumulativeResult': total, 'lciaDetail': details}]}
+
+    def fragment_flows(self, frag_id):
+        root_id = frag_id * 1000
+        ffs = [{'fragmentFlowID': root_id, 'fragmentID': frag_id, 'flowID': frag_id, 'direction': 'Output',
+                'nodeType': 'Process', 'processID': self._process_id(frag_id), 'nodeWeight': 1.0,
+                'flowPropertyMagnitudes': [{'flowPropertyID': 1, 'magnitude': 1.0}], 'fragmentStageID': 1}]
+        for k in range(1, self.n_children + 1):
+            nw = 0.1 * k
+            ffs.append({'fragmentFlowID': root_id + k, 'fragmentID': frag_id, 'parentFragmentFlowID': root_id,
+                        'flowID': self._flow_id(frag_id * 11 + k), 'direction': 'Input',
+                        'nodeType': 'Process', 'processID': self._process_id(frag_id * 13 + k), 'nodeWeight': nw,
+                        'flowPropertyMagnitudes': [{'flowPropertyID': 1, 'magnitude': nw},
+                                                   {'flowPropertyID': 2, 'magnitude': nw / 1000.0}],
+                        'fragmentStageID': k % N_STAGES + 1})
+        return ffs
+
+    def fragment_flow_ids(self, frag_id):
+        return sorted(set(ff['flowID'] for ff in self.fragment_flows(frag_id)))
+
+    def fragment_lcia(self, frag_id):
+        scores = dict()
+        for ff in self.fragment_flows(frag_id):
+            r = self.process_lcia(ff['processID'])['total'] * ff['nodeWeight']
+            scores[ff['fragmentStageID']] = scores.get(ff['fragmentStageID'], 0.0) + r
+        return {'scenarioID': 1, 'total': sum(scores.values()),
+                'lciaScore': [{'fragmentStageID': s, 'cumulativeResult': v, 'lciaDetail': []}
+                              for s, v in sorted(scores.items())]}
+
+    def respond(self, parts):
+        """
+        :param parts: the endpoint, split on '/'
+        :return: the JSON-serializable response, or None if the endpoint is unknown
+        """
+        n = len(parts)
+        if n == 1:
+            if parts[0] == 'flowproperties':
+                return [self.flowproperty(i) for i in (1, 2)]
+            if parts[0] == 'stages':
+                return [{'fragmentStageID': i, 'name': 'Stage %d' % i} for i in range(1, N_STAGES + 1)]
+            if parts[0] == 'impactcategories':
+                return [{'impactCategoryID': 1, 'name': 'Climate change'}]
+            if parts[0] == 'lciamethods':
+                return [self.lcia_method(1)]
+            if parts[0] == 'fragments':
+                return [self.fragment(i) for i in range(1, self.n_fragments + 1)]
+            if parts[0] == 'flows':
+                return [self.flow(i) for i in range(1, self.n_flows + 1)]
+            if parts[0] == 'processes':
+                return [self.process(i) for i in range(1, self.n_processes + 1)]
+            return None
+        try:
+            index = int(parts[1])
+        except ValueError:
+            index = None
+        if parts[0] == 'scenarios' and n > 4 and parts[2] == 'fragments':
+            if n == 7 and parts[6] == 'lciaresults':
+                return self.fragment_lcia(int(parts[3]))
+            if n == 5 and parts[4] == 'fragmentflows':
+                return self.fragment_flows(int(parts[3]))
+            return None
+        if index is None:
+            return None
+        if n == 2:
+            if parts[0] == 'flowproperties' and index in (1, 2):
+                return [self.flowproperty(index)]
+            if parts[0] == 'flows' and 0 < index <= self.n_flows:
+                return [self.flow(index)]
+            if parts[0] == 'processes' and 0 < index <= self.n_processes:
+                return [self.process(index)]
+            if parts[0] == 'fragments' and 0 < index <= self.n_fragments:
+                return [self.fragment(index)]
+            if parts[0] == 'lciamethods' and index == 1:
+                return [self.lcia_method(index)]
+            return None
+        if parts[0] == 'processes' and 0 < index <= self.n_processes:
+            if n == 3 and parts[2] == 'comment':
+                return {'comment': 'Comment on synthetic process %d' % index}
+            if n == 5 and parts[2] == 'lciamethods' and parts[4] == 'lciaresults':
+                return self.process_lcia(index)
+        if parts[0] == 'fragments' and 0 < index <= self.n_fragments and n == 3:
+            if parts[2] == 'flows':
+                return [self.flow(i) for i in self.fragment_flow_ids(index)]
+            if parts[2] == 'fragmentflows':
+                return self.fragment_flows(index)
+        return None
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server.stand_in
+        endpoint = self.path.split('?')[0]
+        if endpoint.startswith(server.prefix):
+            endpoint = endpoint[len(server.prefix):]
+        server.count(endpoint)
+        if server.latency > 0:
+            time.sleep(server.latency)
+
+        j = server.data.respond([p for p in endpoint.split('/') if len(p) > 0])
+        if j is None:
+            self.send_error(404)
+            return
+        body = json.dumps(j).encode('utf-8')
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        if server.max_age is not None:
+            self.send_header('Cache-Control', 'max-age=%d' % server.max_age)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(object):
+    """
+    Serves a StandInData on a free local port, from a background thread.
+    """
+    prefix = '/api/'
+
+    def __init__(self, data=None, latency=0.0, max_age=None):
+        """
+
+        :param data: [None] a StandInData; default has 50 processes, 200 flows and 10 fragments
+        :param latency: [0.0] seconds to wait before answering each request
+        :param max_age: [None] if given, responses carry Cache-Control: max-age=<max_age>
+        """
+        self.data = data or StandInData()
+        self.latency = latency
+        self.max_age = max_age
+        self.hits = Counter()
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    def count(self, endpoint):
+        with self._lock:
+            self.hits[endpoint] += 1
+
+    @property
+    def total_hits(self):
+        return sum(self.hits.values())
+
+    @property
+    def url(self):
+        return 'http://127.0.0.1:%d%s' % (self._httpd.server_address[1], self.prefix)
+
+    def start(self):
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), _StandInHandler)
+        self._httpd.daemon_threads = True
+        self._httpd.stand_in = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
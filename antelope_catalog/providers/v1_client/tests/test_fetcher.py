@@ -0,0 +1,139 @@
+import shutil
+import tempfile
+import time
+import unittest
+
+from requests import HTTPError
+
+from ..fetcher import EndpointFetcher
+from ..antelope_v1 import AntelopeV1Client
+from .stand_in import StandInServer, StandInData
+
+
+class EndpointFetcherTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandInServer(latency=0.05).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.server.hits.clear()
+        self.server.max_age = None
+        self._dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._dir)
+
+    def test_get(self):
+        f = EndpointFetcher(self.server.url)
+        j = f.get('flows/3')
+        self.assertEqual(j[0]['flowID'], 3)
+        j[0].pop('flowID')
+        self.assertEqual(f.get('flows/3')[0]['flowID'], 3)  # each caller gets its own copy
+        self.assertEqual(self.server.hits['flows/3'], 1)
+
+    def test_coalesce(self):
+        f = EndpointFetcher(self.server.url)
+        a = f.submit('processes/4')
+        b = f.submit('processes/4')
+        self.assertIs(a, b)
+        self.assertEqual(a.result(), b.result())
+        self.assertEqual(f.coalesced, 1)
+        self.assertEqual(self.server.hits['processes/4'], 1)
+
+    def test_prefetch_concurrent(self):
+        endpoints = ['flows/%d' % i for i in range(1, 9)]
+        f = EndpointFetcher(self.server.url, max_workers=8)
+        t = time.time()
+        f.prefetch(endpoints)
+        elapsed = time.time() - t
+        self.assertLess(elapsed, 8 * self.server.latency)
+        self.assertListEqual([f.get(e)[0]['flowID'] for e in endpoints], list(range(1, 9)))
+        self.assertEqual(f.requests, 8)
+
+    def test_memo_bound(self):
+        f = EndpointFetcher(self.server.url, memo_size=2)
+        for i in (1, 2, 3):
+            f.get('flows/%d' % i)
+        f.get('flows/2')
+        f.get('flows/3')
+        self.assertEqual(f.requests, 3)
+        f.get('flows/1')  # dropped from the memo
+        self.assertEqual(f.requests, 4)
+        f.close()
+        self.assertIsNone(f._pool)
+        self.assertEqual(len(f._responses), 0)
+        f.get('flows/2')  # still usable
+        self.assertEqual(f.requests, 5)
+
+    def test_missing(self):
+        f = EndpointFetcher(self.server.url)
+        with self.assertRaises(HTTPError):
+            f.get('flows/99999')
+
+    def test_disk_cache(self):
+        EndpointFetcher(self.server.url, cache_dir=self._dir).get('fragments/2/fragmentflows')
+        f = EndpointFetcher(self.server.url, cache_dir=self._dir)
+        self.assertEqual(len(f.get('fragments/2/fragmentflows')), StandInData().n_children + 1)
+        self.assertEqual(f.disk_hits, 1)
+        self.assertEqual(f.requests, 0)
+        self.assertEqual(self.server.hits['fragments/2/fragmentflows'], 1)
+
+    def test_revalidate(self):
+        EndpointFetcher(self.server.url, cache_dir=self._dir).get('stages')
+        f = EndpointFetcher(self.server.url, cache_dir=self._dir, max_age=0)
+        self.assertEqual(len(f.get('stages')), 5)
+        self.assertEqual(f.disk_hits, 0)
+        self.assertEqual(f.revalidated, 1)
+        self.assertEqual(self.server.hits['stages'], 2)
+
+    def test_server_max_age(self):
+        self.server.max_age = 3600
+        EndpointFetcher(self.server.url, cache_dir=self._dir, max_age=0).get('stages')
+        f = EndpointFetcher(self.server.url, cache_dir=self._dir, max_age=0)
+        f.get('stages')
+        self.assertEqual(f.disk_hits, 1)
+        self.assertEqual(self.server.hits['stages'], 1)
+
+
+class AntelopeV1StandInTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandInServer().start()
+        cls.ar = AntelopeV1Client(cls.server.url, quiet=True)
+        cls.inv = cls.ar.make_interface('inventory')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.ar.close()
+        cls.server.stop()
+
+    def test_lcia(self):
+        data = self.server.data
+        res = self.inv.lcia('processes/3', None, 'lciamethods/1')
+        self.assertAlmostEqual(res.total(), data.process_lcia(3)['total'], places=12)
+        for d in data.process_details(3):
+            self.assertIn('flows/%d' % d['flowID'], self.ar._entities)
+
+    def test_traverse(self):
+        ffs = self.inv.traverse('fragments/2')
+        self.assertEqual(len(ffs), self.server.data.n_children + 1)
+        self.assertEqual(self.server.hits['fragments/2/fragmentflows'], 1)
+        self.inv.traverse('fragments/2')
+        self.assertEqual(self.server.hits['fragments/2/fragmentflows'], 1)
+
+    def test_fragment_lcia(self):
+        res = self.inv.fragment_lcia('fragments/4', 'lciamethods/1')
+        self.assertAlmostEqual(res.total(), self.server.data.fragment_lcia(4)['total'], places=12)
+
+    def test_fragments(self):
+        frags = list(self.ar.entities_by_type('fragment'))
+        self.assertEqual(len(frags), self.server.data.n_fragments)
+        self.assertEqual(frags[0].flow.external_ref, 'flows/1')
+
+
+if __name__ == '__main__':
+    unittest.main()
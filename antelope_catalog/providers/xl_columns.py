@@ -0,0 +1,165 @@
+"""
+Compiled, columnar copies of spreadsheet tabs.
+
+Opening a large workbook with xlrd and walking it row by row through XlDict is slow, and providers built on
+spreadsheets do it every time they are instantiated.  XlColumns reads a tab once into a list of columns and keeps it:
+in memory for as long as some provider is using it, and optionally in a cache directory as a pickle, keyed by a hash
+of the workbook's contents and the tab.  A changed workbook hashes differently, so stale entries are never used.
+
+The in-memory memo is keyed on the workbook's path, modification time and size, so that a hit costs a stat() rather
+than hashing the workbook, and it holds its values weakly, so that a compiled tab is released along with the last
+archive using it.
+
+XlColumns offers the XlDict interface (iterrows, unique_units) plus column access and row grouping, so that callers
+can pick out the rows they need without building a dict for every row.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import weakref
+
+import xlrd
+
+# bump whenever the compiled representation changes, to invalidate caches
+COLUMNS_VERSION = 1
+
+_compiled = weakref.WeakValueDictionary()  # in-process memo: (path, mtime, size, sheet) -> XlColumns
+
+
+def workbook_hash(path):
+    h = hashlib.sha1()
+    with open(path, 'rb') as fp:
+        for chunk in iter(lambda: fp.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class XlColumns(object):
+    """
+    A spreadsheet tab as a list of headers and a list of columns, the first row being the headers.
+    """
+    @classmethod
+    def from_sheet(cls, sheet):
+        """
+        :param sheet: an xlrd.sheet.Sheet
+        :return:
+        """
+        headers = sheet.row_values(0)
+        columns = [sheet.col_values(i, start_rowx=1) for i in range(len(headers))]
+        return cls(headers, columns)
+
+    @classmethod
+    def from_workbook(cls, path, sheet, cache_dir=None, open_workbook=None):
+        """
+        Compile a tab of a workbook, or retrieve it from the in-process memo or the cache directory.  The workbook is
+        only hashed if the tab is not in the memo.
+        :param path: path to the workbook
+        :param sheet: sheet name or index
+        :param cache_dir: [None] directory in which to keep compiled tabs; created if missing
+        :param open_workbook: [None] callable returning the opened xlrd Book, used on a miss; lets a caller reading
+         several tabs open the workbook at most once.  Default is xlrd.open_workbook(path)
+        :return: an XlColumns
+        """
+        st = os.stat(path)
+        memo_key = (os.path.abspath(path), st.st_mtime_ns, st.st_size, sheet)
+        cols = _compiled.get(memo_key)
+        if cols is not None:
+            return cols
+        key = hashlib.sha1(('%d:%s:%s' % (COLUMNS_VERSION, workbook_hash(path), sheet)).encode('utf-8')).hexdigest()
+        cache_file = None
+        if cache_dir is not None:
+            cache_file = os.path.join(cache_dir, key + '.pkl')
+            try:
+                with open(cache_file, 'rb') as fp:
+                    headers, columns = pickle.load(fp)
+                cols = cls(headers, columns)
+                _compiled[memo_key] = cols
+                return cols
+            except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+                pass
+        if open_workbook is None:
+            book = xlrd.open_workbook(path)
+        else:
+            book = open_workbook()
+        if isinstance(sheet, int):
+            cols = cls.from_sheet(book.sheet_by_index(sheet))
+        else:
+            cols = cls.from_sheet(book.sheet_by_name(sheet))
+        if cache_file is not None:
+            cols._write(cache_file)
+        _compiled[memo_key] = cols
+        return cols
+
+    def __init__(self, headers, columns):
+        self._headers = headers
+        self._columns = columns
+        self._col_index = dict((h, i) for i, h in enumerate(headers))
+        self._groups = dict()
+
+    def _write(self, cache_file):
+        d = os.path.dirname(cache_file)
+        try:
+            if not os.path.isdir(d):
+                os.makedirs(d, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=d)
+            with os.fdopen(fd, 'wb') as fp:
+                pickle.dump((self._headers, self._columns), fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_file)
+        except OSError:
+            pass  # the cache is an optimization
+
+    @property
+    def headers(self):
+        return list(self._headers)
+
+    def __len__(self):
+        if len(self._columns) == 0:
+            return 0
+        return len(self._columns[0])
+
+    def column(self, name):
+        """
+        :param name: header
+        :return: the column's values, in row order (not a copy)
+        """
+        return self._columns[self._col_index[name]]
+
+    def row(self, index, drop=()):
+        """
+        :param index: 0-based data row (i.e. not counting the header row)
+        :param drop: headers to leave out
+        :return: dict of header: value
+        """
+        return dict((h, self._columns[i][index]) for i, h in enumerate(self._headers) if h not in drop)
+
+    def iterrows(self, drop=()):
+        """
+        As XlDict.iterrows: yields (index, row dict), index counting from 1
+        :param drop: headers to leave out
+        :return:
+        """
+        for index in range(len(self)):
+            yield index + 1, self.row(index, drop=drop)
+
+    def groups(self, *names):
+        """
+        Group the rows by the values in the named columns.  Computed once per set of names.
+        :param names: headers
+        :return: dict of tuple of values: list of 0-based row indices, in row order
+        """
+        if names not in self._groups:
+            groups = dict()
+            for index, key in enumerate(zip(*(self.column(n) for n in names))):
+                groups.setdefault(key, []).append(index)
+            self._groups[names] = groups
+        return self._groups[names]
+
+    def unique_units(self, internal=False):
+        """
+        As XlDict.unique_units
+        :param internal:
+        :return:
+        """
+        return set(self.column('unit' if internal else 'unitName'))
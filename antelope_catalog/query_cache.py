@@ -0,0 +1,107 @@
+"""
+Bounded cache for the results of catalog queries.
+
+CatalogQuery instances live as long as the catalog, so an unbounded memo of everything they have been asked grows
+without limit in a long-running process.  QueryCache is a least-recently-used cache with an optional time-to-live,
+keyed on (method, external_ref, ...) tuples, with statistics and invalidation by external_ref.
+"""
+
+from collections import OrderedDict
+from time import monotonic
+
+
+DEFAULT_CACHE_SIZE = 4096
+
+_MISSING = object()
+
+
+class QueryCache(object):
+    def __init__(self, max_size=DEFAULT_CACHE_SIZE, ttl=None):
+        """
+
+        :param max_size: [4096] maximum number of entries; the least recently used are evicted first.  0 disables
+         caching; None means unbounded
+        :param ttl: [None] seconds after which an entry expires; None means never
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._d = OrderedDict()  # key: (stored time, value)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self):
+        return self._max_size != 0
+
+    def __len__(self):
+        return len(self._d)
+
+    def get(self, key, default=None):
+        """
+        :param key:
+        :param default: returned on a miss
+        :return:
+        """
+        entry = self._d.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        if self._ttl is not None and monotonic() - entry[0] > self._ttl:
+            del self._d[key]
+            self.expirations += 1
+            self.misses += 1
+            return default
+        self._d.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key, value):
+        if not self.enabled:
+            return
+        self._d[key] = (monotonic(), value)
+        self._d.move_to_end(key)
+        if self._max_size is not None:
+            while len(self._d) > self._max_size:
+                self._d.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """
+        :param key: must be hashable
+        :param compute: callable () -> value, called on a miss.  Exceptions are not cached.
+        :return:
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def invalidate(self, external_ref=None):
+        """
+        Drop cached results.
+        :param external_ref: [None] drop only results concerning this external_ref; default is to drop everything
+        :return: the number of entries dropped
+        """
+        if external_ref is None:
+            n = len(self._d)
+            self._d.clear()
+            return n
+        stale = [k for k in self._d.keys() if k[1] == external_ref]
+        for k in stale:
+            del self._d[k]
+        return len(stale)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'size': len(self._d),
+                'max_size': self._max_size,
+                'ttl': self._ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations}
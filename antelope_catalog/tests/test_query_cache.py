@@ -0,0 +1,50 @@
+import unittest
+
+from ..query_cache import QueryCache
+
+
+class QueryCacheTest(unittest.TestCase):
+    def test_lru(self):
+        c = QueryCache(max_size=2)
+        c.put(('get', 'a'), 1)
+        c.put(('get', 'b'), 2)
+        self.assertEqual(c.get(('get', 'a')), 1)  # a is now most recently used
+        c.put(('get', 'c'), 3)
+        self.assertIsNone(c.get(('get', 'b')))
+        self.assertEqual(c.get(('get', 'a')), 1)
+        self.assertEqual(c.evictions, 1)
+        self.assertEqual(len(c), 2)
+
+    def test_ttl(self):
+        c = QueryCache(ttl=0)
+        c.put(('get', 'a'), 1)
+        self.assertIsNone(c.get(('get', 'a')))
+        self.assertEqual(c.expirations, 1)
+        self.assertEqual(len(c), 0)
+
+    def test_disabled(self):
+        c = QueryCache(max_size=0)
+        self.assertEqual(c.get_or_compute(('get', 'a'), lambda: 1), 1)
+        self.assertEqual(len(c), 0)
+
+    def test_get_or_compute(self):
+        c = QueryCache()
+        calls = []
+        for i in range(3):
+            self.assertEqual(c.get_or_compute(('get', 'a'), lambda: calls.append(1) or 'x'), 'x')
+        self.assertEqual(len(calls), 1)
+        self.assertAlmostEqual(c.stats()['hit_rate'], 2 / 3)
+
+    def test_invalidate(self):
+        c = QueryCache()
+        c.put(('get', 'a'), 1)
+        c.put(('get_item', 'a', 'Name'), 'A')
+        c.put(('get', 'b'), 2)
+        self.assertEqual(c.invalidate('a'), 2)
+        self.assertEqual(c.get(('get', 'b')), 2)
+        self.assertEqual(c.invalidate(), 1)
+        self.assertEqual(len(c), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
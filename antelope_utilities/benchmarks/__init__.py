@@ -0,0 +1,8 @@
+"""
+Benchmark scripts for measuring archive load time, memory footprint and query throughput.  These are not unit tests;
+each module can be run directly, e.g.
+
+    python -m antelope_utilities.benchmarks.lazy_exchanges
+
+and prints its results to stdout.
+"""
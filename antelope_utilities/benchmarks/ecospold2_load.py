@@ -0,0 +1,42 @@
+"""
+Time EcospoldV2Archive.load_all() on a synthetic linked EcoSpold2 directory, serially and with a pool of worker
+processes parsing the datasets (load_all(workers=n)), and serially against a cold and then a warm parse cache.
+
+python -m antelope_utilities.benchmarks.ecospold2_load [n_processes]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from antelope_catalog.providers.ecospold2 import EcospoldV2Archive
+
+from .synthetic import write_synthetic_spold2
+
+
+def bench(path, workers, parse_cache=None):
+    ar = EcospoldV2Archive(path, parse_cache=parse_cache)
+    t0 = time.perf_counter()
+    ar.load_all(workers=workers)
+    return time.perf_counter() - t0, ar
+
+
+def main(n_processes=2000, n_exchanges=60):
+    with tempfile.TemporaryDirectory() as d:
+        n_files = write_synthetic_spold2(d, n_processes=n_processes, n_exchanges=n_exchanges)
+        print('%d datasets x %d exchanges; %d cores' % (n_files, n_exchanges, os.cpu_count()))
+        base = None
+        for workers in [None] + [w for w in (2, 4, 8, 16) if w <= max(2, os.cpu_count())]:
+            t, ar = bench(d, workers)
+            if base is None:
+                base = t
+            print('workers %4s: %8.2f s  (%.2fx)  %d processes' % (workers or 1, t, base / t,
+                                                                 ar.count_by_type('process')))
+        with tempfile.TemporaryDirectory() as c:
+            for label in ('cold', 'warm'):
+                t, ar = bench(d, None, parse_cache=c)
+                print('%s cache: %8.2f s  (%.2fx)  %d processes' % (label, t, base / t, ar.count_by_type('process')))
+
+
+if __name__ == '__main__':
+    main(*[int(k) for k in sys.argv[1:]])
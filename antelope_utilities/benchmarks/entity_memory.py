@@ -0,0 +1,59 @@
+"""
+Measure the memory footprint of a fully loaded (eager-exchange) synthetic archive, using tracemalloc, and report the
+per-object cost of entities and exchanges.
+
+The default size (2000 processes x 200 exchanges, i.e. 400k exchanges) is a scaled-down stand-in for an ecoinvent
+system model (~15k processes, ~4M exchanges); memory scales linearly, so multiply by ~10.
+"""
+import copy
+import gc
+import resource
+import sys
+import time
+import tracemalloc
+
+from lcatools.archives import LcArchive
+
+from .synthetic import synthetic_archive_json, SYNTHETIC_REF
+
+
+def measure(n_processes=2000, n_exchanges=200):
+    j = synthetic_archive_json(n_processes=n_processes, n_exchanges=n_exchanges)
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    t0 = time.perf_counter()
+    ar = LcArchive(None, ref=SYNTHETIC_REF, lazy_exchanges=False)
+    ar.load_from_dict(copy.deepcopy(j), _check=False)
+    t_load = time.perf_counter() - t0
+    del j
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    n_ent = len(ar._entities)
+    n_x = sum(len(p) for p in ar.entities_by_type('process'))
+    return {
+        'entities': n_ent,
+        'exchanges': n_x,
+        'load_s': t_load,
+        'archive_mb': (current - base) / 2**20,
+        'bytes_per_exchange': (current - base) / n_x,
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'archive': ar
+    }
+
+
+def main(*args):
+    kw = dict()
+    if len(args) > 0:
+        kw['n_processes'] = int(args[0])
+    if len(args) > 1:
+        kw['n_exchanges'] = int(args[1])
+    r = measure(**kw)
+    print('%(entities)d entities, %(exchanges)d exchanges, load %(load_s).2f s (tracemalloc active)' % r)
+    print('archive traced memory: %(archive_mb).1f MB (%(bytes_per_exchange).0f bytes per exchange)' % r)
+    print('max RSS: %(max_rss_mb).1f MB' % r)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
@@ -0,0 +1,45 @@
+"""
+Time IlcdArchive.load_all() on a synthetic ILCD directory, serially and with a pool of worker processes parsing the
+datasets (load_all(workers=n)), and serially against a cold and then a warm parse cache.  Prints the time spent in
+each load stage.
+
+python -m antelope_utilities.benchmarks.ilcd_load [n_processes]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from antelope_catalog.providers.ilcd import IlcdArchive
+
+from .synthetic import write_synthetic_ilcd
+
+
+def bench(path, workers, parse_cache=None):
+    ar = IlcdArchive(path, parse_cache=parse_cache)
+    t0 = time.perf_counter()
+    ar.load_all(workers=workers)
+    return time.perf_counter() - t0, ar
+
+
+def main(n_processes=2000, n_exchanges=60):
+    with tempfile.TemporaryDirectory() as d, tempfile.TemporaryDirectory() as c:
+        n_files = write_synthetic_ilcd(d, n_processes=n_processes, n_exchanges=n_exchanges)
+        print('%d datasets; %d exchanges per process; %d cores' % (n_files, n_exchanges, os.cpu_count()))
+        runs = [('workers %d' % (w or 1), w, None) for w in [None] + [w for w in (2, 4, 8, 16)
+                                                                      if w <= max(2, os.cpu_count())]]
+        runs += [('cold cache', None, c), ('warm cache', None, c)]
+        base = None
+        report = []
+        for label, workers, cache in runs:
+            t, ar = bench(d, workers, parse_cache=cache)
+            if base is None:
+                base = t
+            report.append((label, t, ar.load_timing))
+        for label, t, timing in report:
+            print('%-11s %8.2f s  (%.2fx)  %s' % (label, t, base / t,
+                                                  '  '.join('%s %.2f+%.2f' % (k[0], k[2], k[3]) for k in timing)))
+
+
+if __name__ == '__main__':
+    main(*[int(k) for k in sys.argv[1:]])
@@ -0,0 +1,71 @@
+"""
+Compare load time and memory of an LcArchive loaded with eager vs lazy (deferred) process exchanges.
+
+Three figures are reported for each mode:
+ * load: time to load the archive from a JSON dict; memory retained once the caller's dict is dropped (including any
+   parts of it kept by the archive, such as the raw exchanges held by lazy loaders), and peak memory during the load
+   over and above the dict
+ * search: time to run a name search across all processes (touches no exchanges)
+ * touch-all: time to generate every process's inventory (forces materialization in lazy mode)
+"""
+import copy
+import gc
+import time
+import tracemalloc
+
+from lcatools.archives import LcArchive
+
+from .synthetic import synthetic_archive_json, SYNTHETIC_REF
+
+
+def _load(j, lazy):
+    ar = LcArchive(None, ref=SYNTHETIC_REF, lazy_exchanges=lazy)
+    ar.load_from_dict(j, _check=False)
+    return ar
+
+
+def bench(j, lazy):
+    tracemalloc.start()
+    j = copy.deepcopy(j)  # load_from_dict consumes its input
+    input_size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    ar = _load(j, lazy)
+    t_load = time.perf_counter() - t0
+    del j  # whatever of the input is still alive now is retained by the archive (e.g. in lazy loaders)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    peak -= input_size
+
+    t0 = time.perf_counter()
+    n_found = len([p for p in ar.search('process', Name='process 1')])
+    t_search = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    n_x = sum(len([x for x in p.inventory()]) for p in ar.entities_by_type('process'))
+    t_touch = time.perf_counter() - t0
+
+    return {
+        'mode': 'lazy' if lazy else 'eager',
+        'load_s': t_load,
+        'load_mem_mb': current / 2**20,
+        'peak_mem_mb': peak / 2**20,
+        'search_s': t_search,
+        'found': n_found,
+        'touch_all_s': t_touch,
+        'exchanges': n_x
+    }
+
+
+def main(n_processes=5000, n_exchanges=60):
+    j = synthetic_archive_json(n_processes=n_processes, n_exchanges=n_exchanges)
+    print('%d processes x %d exchanges' % (n_processes, n_exchanges))
+    print('%6s %9s %12s %12s %9s %11s' % ('mode', 'load (s)', 'retained MB', 'peak MB', 'search', 'touch-all'))
+    for lazy in (False, True):
+        r = bench(j, lazy)
+        print('%(mode)6s %(load_s)9.3f %(load_mem_mb)12.1f %(peak_mem_mb)12.1f %(search_s)9.3f %(touch_all_s)11.3f' % r)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Time OpenLcaJsonLdArchive on a synthetic zipped openLCA JSON-LD export: building each process on demand (which
+parses its flows and flow properties recursively), against the bulk load_all(), serially and with a pool of worker
+processes decoding the JSON files (load_all(workers=n)).
+
+python -m antelope_utilities.benchmarks.openlca_load [n_processes]
+"""
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+from antelope_catalog.providers.openlca_jsonld import OpenLcaJsonLdArchive
+
+from .synthetic import write_synthetic_olca
+
+
+def on_demand(path):
+    with zipfile.ZipFile(path) as z:
+        keys = [n[10:-5] for n in z.namelist() if n.startswith('processes/')]
+    ar = OpenLcaJsonLdArchive(path)
+    t0 = time.perf_counter()
+    for k in keys:
+        ar.retrieve_or_fetch_entity(k, typ='processes')
+    return time.perf_counter() - t0, ar
+
+
+def bulk(path, workers):
+    ar = OpenLcaJsonLdArchive(path)
+    t0 = time.perf_counter()
+    ar.load_all(workers=workers)
+    return time.perf_counter() - t0, ar
+
+
+def main(n_processes=10000, n_exchanges=50):
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, 'synthetic_olca.zip')
+        n_files = write_synthetic_olca(path, n_processes=n_processes, n_exchanges=n_exchanges)
+        print('%d JSON files; %d processes x %d exchanges; %d cores' % (n_files, n_processes, n_exchanges,
+                                                                       os.cpu_count()))
+        runs = [('on demand', on_demand, ())]
+        runs += [('bulk x%d' % (w or 1), bulk, (w,)) for w in [None] + [w for w in (2, 4, 8, 16)
+                                                                          if w <= max(2, os.cpu_count())]]
+        report = []
+        for label, fn, args in runs:
+            t, ar = fn(path, *args)
+            report.append((label, t, ar.count_by_type('process'), ar.load_timing))
+        base = report[0][1]
+        for label, t, n, timing in report:
+            stages = '' if timing is None else '  '.join('%s %.2f+%.2f' % (k[0], k[2], k[3]) for k in timing)
+            print('%-10s %8.2f s  (%.2fx)  %d processes  %s' % (label, t, base / t, n, stages))
+
+
+if __name__ == '__main__':
+    main(*[int(k) for k in sys.argv[1:]])
@@ -0,0 +1,115 @@
+"""
+Compare worker processes that each load their own FlatBackground from its .mat file ('private') against workers that
+attach to one copy hosted in shared memory ('shared'), for 1, 4 and 16 workers.
+
+The background is synthetic: a random, sparse LCI database (A, B) shaped like a scaled-down ecoinvent system model.
+Each worker measures its proportional set size (PSS, which divides shared pages among the processes mapping them)
+before and after getting its background, then runs lci() for a series of background processes.  Reported are:
+ * rss: resident set size per worker, after loading (shared pages count in full for every worker)
+ * bg MB: sum over workers of the PSS taken up by the background-- the real memory cost of serving it
+ * lci/s: lci() calls per second across all workers, from the moment all are ready to the last one finishing
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+from scipy.sparse import random as sparse_random, csr_matrix
+
+from antelope_background.background import FlatBackground
+
+
+def synthetic_flat_background(n_bg=5000, n_ex=2000, a_per_col=10, b_per_col=150, seed=1):
+    """
+    :param n_bg: number of background processes
+    :param n_ex: number of exterior (elementary) flows
+    :param a_per_col: average number of technology inputs per process
+    :param b_per_col: average number of emissions per process
+    :param seed:
+    :return: a FlatBackground with an empty foreground and a complete LCI database
+    """
+    rnd = np.random.RandomState(seed)
+    a = sparse_random(n_bg, n_bg, density=a_per_col / n_bg, random_state=rnd, format='csr')
+    a.data *= 0.5 / a_per_col  # column sums well below 1, so the iteration converges
+    b = sparse_random(n_ex, n_bg, density=b_per_col / n_ex, random_state=rnd, format='csr')
+    bg = [('flow %d' % i, 'Output', 'process %d' % i, 0) for i in range(n_bg)]
+    ex = [('emission %d' % i, 'Output', 'air', 0) for i in range(n_ex)]
+    return FlatBackground([], bg, ex, csr_matrix((0, 0)), csr_matrix((n_bg, 0)), csr_matrix((n_ex, 0)),
+                          lci_db=(a, b))
+
+
+def _memory():
+    """
+    :return: rss, pss in MB, from /proc/self/smaps_rollup
+    """
+    mem = dict()
+    with open('/proc/self/smaps_rollup') as fp:
+        for line in fp:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:'):
+                mem[parts[0]] = int(parts[1]) / 1024
+    return mem['Rss:'], mem['Pss:']
+
+
+def _worker(mode, arg, queries, ready, results, finished):
+    _, pss0 = _memory()
+    if mode == 'shared':
+        fb = FlatBackground.from_shared_memory(arg)
+    else:
+        fb = FlatBackground.from_file(arg)
+    ready.wait()
+    t0 = time.perf_counter()
+    for i in queries:
+        tr = fb.bg[i]
+        len(list(fb.lci(tr.term_ref, tr.flow_ref, quiet=True)))
+    elapsed = time.perf_counter() - t0
+    rss, pss1 = _memory()
+    results.put({'rss': rss, 'bg_pss': pss1 - pss0, 'start': t0, 'end': t0 + elapsed})
+    finished.wait()  # stay alive until every worker has measured, so shared pages are divided among all of them
+
+
+def bench(mode, arg, n_workers, n_bg, n_queries=20):
+    ctx = multiprocessing.get_context('spawn')
+    ready = ctx.Barrier(n_workers)
+    finished = ctx.Event()
+    results = ctx.Queue()
+    rnd = np.random.RandomState(n_workers)
+    procs = [ctx.Process(target=_worker, args=(mode, arg, list(rnd.randint(0, n_bg, n_queries)), ready, results,
+                                               finished))
+             for i in range(n_workers)]
+    for p in procs:
+        p.start()
+    rs = [results.get() for p in procs]
+    finished.set()
+    for p in procs:
+        p.join()
+    wall = max(r['end'] for r in rs) - min(r['start'] for r in rs)
+    return {
+        'mode': mode,
+        'workers': n_workers,
+        'rss_mb': sum(r['rss'] for r in rs) / n_workers,
+        'bg_mb': sum(r['bg_pss'] for r in rs),
+        'lci_per_s': n_workers * n_queries / wall
+    }
+
+
+def main(n_bg=5000, n_ex=2000, workers=(1, 4, 16)):
+    fb = synthetic_flat_background(n_bg=int(n_bg), n_ex=int(n_ex))
+    print('%d background processes, %d exterior flows, A nnz %d, B nnz %d' % (fb.ndim, len(fb.ex), fb._A.nnz,
+                                                                               fb._B.nnz))
+    with tempfile.TemporaryDirectory() as tmpdir:
+        matfile = os.path.join(tmpdir, 'background.mat')
+        fb.write_to_file(matfile)
+        with fb.host() as host:
+            print('shared segment: %.1f MB' % (host.size / 2**20))
+            print('%8s %8s %10s %10s %8s' % ('mode', 'workers', 'rss MB', 'bg MB', 'lci/s'))
+            for n in workers:
+                for mode, arg in (('private', matfile), ('shared', host.descriptor)):
+                    r = bench(mode, arg, n, fb.ndim)
+                    print('%(mode)8s %(workers)8d %(rss_mb)10.1f %(bg_mb)10.1f %(lci_per_s)8.1f' % r)
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
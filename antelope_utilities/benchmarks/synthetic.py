@@ -0,0 +1,520 @@
+"""
+Generate synthetic LcArchive JSON of arbitrary size, for benchmarking.  The archive resembles an ecoinvent unit process
+database: a few quantities, a pool of intermediate and elementary flows, and processes each having one reference
+exchange plus a number of terminated intermediate inputs and elementary emissions.
+"""
+import random
+import uuid
+
+SYNTHETIC_REF = 'local.synthetic'
+SYNTHETIC_NS = uuid.UUID('3b3bf8b0-0d5c-4c5b-9c5a-8e3e0f1f6f0a')
+
+
+def _uuid(*args):
+    return str(uuid.uuid3(SYNTHETIC_NS, '/'.join(str(k) for k in args)))
+
+
+def synthetic_archive_json(n_processes=1000, n_exchanges=50, n_elementary=2000, seed=1):
+    """
+    :param n_processes: number of processes; each has its own reference product flow
+    :param n_exchanges: number of non-reference exchanges per process
+    :param n_elementary: number of elementary flows shared among processes
+    :param seed: random seed, so that results are repeatable
+    :return: a dict suitable for LcArchive.load_from_dict()
+    """
+    rnd = random.Random(seed)
+    mass = _uuid('quantity', 'kg')
+    quantities = [{'entityId': mass, 'entityType': 'quantity', 'externalId': mass, 'Name': 'Mass',
+                   'referenceUnit': 'kg'}]
+
+    def _flow(kind, i, compartment):
+        u = _uuid('flow', kind, i)
+        return {'entityId': u, 'entityType': 'flow', 'externalId': u, 'Name': '%s flow %d' % (kind, i),
+                'CasNumber': '',
+                'Compartment': compartment,
+                'characterizations': [{'entityType': 'characterization', 'quantity': mass, 'isReference': True,
+                                       'value': 1.0}]}
+
+    products = [_flow('product', i, ['Intermediate Flows']) for i in range(n_processes)]
+    elementary = [_flow('elementary', i, ['air', 'unspecified']) for i in range(n_elementary)]
+    p_ids = [_uuid('process', i) for i in range(n_processes)]
+
+    processes = []
+    for i in range(n_processes):
+        exchs = [{'entityType': 'exchange', 'flow': products[i]['entityId'], 'direction': 'Output',
+                  'isReference': True, 'value': 1.0}]
+        n_inputs = n_exchanges // 4
+        for j in rnd.sample(range(n_processes), min(n_inputs, n_processes)):
+            if j == i:
+                continue
+            exchs.append({'entityType': 'exchange', 'flow': products[j]['entityId'], 'direction': 'Input',
+                          'termination': p_ids[j], 'value': rnd.random()})
+        for j in rnd.sample(range(n_elementary), min(n_exchanges - n_inputs, n_elementary)):
+            exchs.append({'entityType': 'exchange', 'flow': elementary[j]['entityId'], 'direction': 'Output',
+                          'value': rnd.random() * 1e-3})
+        processes.append({'entityId': p_ids[i], 'entityType': 'process', 'externalId': p_ids[i],
+                          'Name': 'synthetic process %d' % i, 'SpatialScope': 'GLO', 'TemporalScope': '2017',
+                          'Classifications': ['synthetic'], 'exchanges': exchs})
+
+    return {
+        'dataReference': SYNTHETIC_REF,
+        'dataSource': None,
+        'quantities': quantities,
+        'flows': products + elementary,
+        'processes': processes
+    }
+
+
+_SPOLD2_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<ecoSpold xmlns="http://www.EcoInvent.org/EcoSpold02">
+  <childActivityDataset>
+    <activityDescription>
+      <activity id="%(id)s" activityNameId="%(id)s" type="1">
+        <activityName xml:lang="en">%(name)s</activityName>
+        <generalComment>
+          <text xml:lang="en" index="1">Synthetic dataset {{index}} for benchmarking.</text>
+          <variable xml:lang="en" name="index">%(index)d</variable>
+        </generalComment>
+      </activity>
+      <classification classificationId="%(id)s">
+        <classificationSystem xml:lang="en">ISIC rev.4 ecoinvent</classificationSystem>
+        <classificationValue xml:lang="en">synthetic</classificationValue>
+      </classification>
+      <geography geographyId="%(id)s">
+        <shortname xml:lang="en">GLO</shortname>
+      </geography>
+      <timePeriod startDate="2011-01-01" endDate="2017-12-31" isDataValidForEntirePeriod="true"/>
+    </activityDescription>
+    <flowData>
+'''
+
+_SPOLD2_INTERMEDIATE = '''      <intermediateExchange id="%(xid)s" unitId="%(unit)s" amount="%(value)r" intermediateExchangeId="%(flow)s"%(link)s>
+        <name xml:lang="en">%(name)s</name>
+        <unitName xml:lang="en">kg</unitName>
+        <comment xml:lang="en">%(comment)s</comment>
+        <classification classificationId="%(flow)s">
+          <classificationSystem xml:lang="en">CPC</classificationSystem>
+          <classificationValue xml:lang="en">synthetic products</classificationValue>
+        </classification>
+        <%(group)s>%(group_value)d</%(group)s>
+      </intermediateExchange>
+'''
+
+_SPOLD2_ELEMENTARY = '''      <elementaryExchange id="%(xid)s" unitId="%(unit)s" amount="%(value)r" elementaryExchangeId="%(flow)s" casNumber="000000-00-0">
+        <name xml:lang="en">%(name)s</name>
+        <unitName xml:lang="en">kg</unitName>
+        <compartment subcompartmentId="%(flow)s">
+          <compartment xml:lang="en">air</compartment>
+          <subcompartment xml:lang="en">unspecified</subcompartment>
+        </compartment>
+        <outputGroup>4</outputGroup>
+      </elementaryExchange>
+'''
+
+_SPOLD2_FOOTER = '''    </flowData>
+  </childActivityDataset>
+</ecoSpold>
+'''
+
+
+def write_synthetic_spold2(path, n_processes=1000, n_exchanges=50, n_elementary=2000, coproduct_every=10, seed=1):
+    """
+    Writes a directory of linked EcoSpold2 datasets, named activity_reference.spold in the ecoinvent manner.  Every
+    coproduct_every-th process has a second reference product, and so has a second (allocated) dataset.
+    :param path: directory to write; created if missing
+    :param n_processes:
+    :param n_exchanges: number of non-reference exchanges per dataset
+    :param n_elementary: number of elementary flows shared among processes
+    :param coproduct_every:
+    :param seed: random seed, so that results are repeatable
+    :return: number of files written
+    """
+    import os
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    rnd = random.Random(seed)
+    unit = _uuid('unit', 'kg')
+    p_ids = [_uuid('process', i) for i in range(n_processes)]
+    products = [_uuid('flow', 'product', i) for i in range(n_processes)]
+    n_files = 0
+    for i in range(n_processes):
+        refs = [products[i]]
+        if coproduct_every and i % coproduct_every == 0:
+            refs.append(_uuid('flow', 'coproduct', i))
+        n_inputs = n_exchanges // 4
+        inputs = [j for j in rnd.sample(range(n_processes), min(n_inputs, n_processes)) if j != i]
+        emissions = rnd.sample(range(n_elementary), min(n_exchanges - n_inputs, n_elementary))
+        for k, ref in enumerate(refs):
+            lines = [_SPOLD2_HEADER % {'id': p_ids[i], 'name': 'synthetic process %d' % i, 'index': i}]
+            for m, rf in enumerate(refs):
+                lines.append(_SPOLD2_INTERMEDIATE % {'xid': _uuid('x', i, rf), 'unit': unit, 'flow': rf,
+                                                     'value': 1.0 if m == k else 0.0, 'link': '',
+                                                     'name': 'product %s' % rf, 'comment': 'reference product',
+                                                     'group': 'outputGroup', 'group_value': 0})
+            for j in inputs:
+                lines.append(_SPOLD2_INTERMEDIATE % {'xid': _uuid('x', i, j), 'unit': unit, 'flow': products[j],
+                                                     'value': rnd.random() / len(refs),
+                                                     'link': ' activityLinkId="%s"' % p_ids[j],
+                                                     'name': 'product %s' % products[j], 'comment': 'input %d' % j,
+                                                     'group': 'inputGroup', 'group_value': 5})
+            for j in emissions:
+                e = _uuid('flow', 'elementary', j)
+                lines.append(_SPOLD2_ELEMENTARY % {'xid': _uuid('x', i, e), 'unit': unit, 'flow': e,
+                                                   'value': rnd.random() * 1e-3 / len(refs),
+                                                   'name': 'elementary flow %d' % j})
+            lines.append(_SPOLD2_FOOTER)
+            with open(os.path.join(path, '%s_%s.spold' % (p_ids[i], ref)), 'w') as fp:
+                fp.write(''.join(lines))
+            n_files += 1
+    return n_files
+
+
+_ILCD_UNITGROUP = '''<?xml version="1.0" encoding="utf-8"?>
+<unitGroupDataSet xmlns="http://lca.jrc.it/ILCD/UnitGroup" xmlns:common="http://lca.jrc.it/ILCD/Common" version="1.1">
+  <unitGroupInformation>
+    <dataSetInformation>
+      <common:UUID>%(id)s</common:UUID>
+      <common:name xml:lang="en">Units of mass</common:name>
+    </dataSetInformation>
+    <quantitativeReference>
+      <referenceToReferenceUnit>0</referenceToReferenceUnit>
+    </quantitativeReference>
+  </unitGroupInformation>
+  <units>
+    <unit dataSetInternalID="0">
+      <name>kg</name>
+      <meanValue>1</meanValue>
+    </unit>
+    <unit dataSetInternalID="1">
+      <name>g</name>
+      <meanValue>0.001</meanValue>
+    </unit>
+  </units>
+</unitGroupDataSet>
+'''
+
+_ILCD_FLOWPROPERTY = '''<?xml version="1.0" encoding="utf-8"?>
+<flowPropertyDataSet xmlns="http://lca.jrc.it/ILCD/FlowProperty" xmlns:common="http://lca.jrc.it/ILCD/Common" version="1.1">
+  <flowPropertiesInformation>
+    <dataSetInformation>
+      <common:UUID>%(id)s</common:UUID>
+      <common:name xml:lang="en">Mass</common:name>
+      <common:generalComment xml:lang="en">Synthetic flow property</common:generalComment>
+    </dataSetInformation>
+    <quantitativeReference>
+      <referenceToReferenceUnitGroup refObjectId="%(ug)s" type="unit group data set" uri="../unitgroups/%(ug)s.xml"/>
+    </quantitativeReference>
+  </flowPropertiesInformation>
+</flowPropertyDataSet>
+'''
+
+_ILCD_FLOW = '''<?xml version="1.0" encoding="utf-8"?>
+<flowDataSet xmlns="http://lca.jrc.it/ILCD/Flow" xmlns:common="http://lca.jrc.it/ILCD/Common" version="1.1">
+  <flowInformation>
+    <dataSetInformation>
+      <common:UUID>%(id)s</common:UUID>
+      <name>
+        <baseName xml:lang="en">%(name)s</baseName>
+      </name>
+      <classificationInformation>
+        <common:elementaryFlowCategorization name="ILCD">
+          <common:category level="0">%(category)s</common:category>
+        </common:elementaryFlowCategorization>
+      </classificationInformation>
+      <CASNumber>000000-00-0</CASNumber>
+    </dataSetInformation>
+    <quantitativeReference>
+      <referenceToReferenceFlowProperty>0</referenceToReferenceFlowProperty>
+    </quantitativeReference>
+  </flowInformation>
+  <modellingAndValidation>
+    <LCIMethod>
+      <typeOfDataSet>%(type)s</typeOfDataSet>
+    </LCIMethod>
+  </modellingAndValidation>
+  <flowProperties>
+    <flowProperty dataSetInternalID="0">
+      <referenceToFlowPropertyDataSet refObjectId="%(fp)s" type="flow property data set" uri="../flowproperties/%(fp)s.xml"/>
+      <meanValue>1</meanValue>
+    </flowProperty>
+  </flowProperties>
+</flowDataSet>
+'''
+
+_ILCD_PROCESS_HEADER = '''<?xml version="1.0" encoding="utf-8"?>
+<processDataSet xmlns="http://lca.jrc.it/ILCD/Process" xmlns:common="http://lca.jrc.it/ILCD/Common" version="1.1">
+  <processInformation>
+    <dataSetInformation>
+      <common:UUID>%(id)s</common:UUID>
+      <name>
+        <baseName xml:lang="en">%(name)s</baseName>
+      </name>
+      <classificationInformation>
+        <common:classification name="ILCD">
+          <common:class level="0">synthetic</common:class>
+        </common:classification>
+      </classificationInformation>
+      <common:generalComment xml:lang="en">Synthetic dataset for benchmarking.</common:generalComment>
+    </dataSetInformation>
+    <quantitativeReference type="Reference flow(s)">
+      <referenceToReferenceFlow>0</referenceToReferenceFlow>
+    </quantitativeReference>
+    <time>
+      <common:referenceYear>2011</common:referenceYear>
+      <common:dataSetValidUntil>2017</common:dataSetValidUntil>
+    </time>
+    <geography>
+      <locationOfOperationSupplyOrProduction location="GLO"/>
+    </geography>
+  </processInformation>
+  <exchanges>
+'''
+
+_ILCD_EXCHANGE = '''    <exchange dataSetInternalID="%(xid)d">
+      <referenceToFlowDataSet refObjectId="%(flow)s" type="flow data set" uri="../flows/%(flow)s.xml">
+        <common:shortDescription xml:lang="en">%(name)s</common:shortDescription>
+      </referenceToFlowDataSet>
+      <exchangeDirection>%(dir)s</exchangeDirection>
+      <meanAmount>%(value)r</meanAmount>
+      <resultingAmount>%(value)r</resultingAmount>
+    </exchange>
+'''
+
+_ILCD_PROCESS_FOOTER = '''  </exchanges>
+</processDataSet>
+'''
+
+
+def write_synthetic_ilcd(path, n_processes=1000, n_exchanges=50, n_elementary=2000, seed=1):
+    """
+    Writes an ILCD archive directory (path/ILCD/processes etc.) with one unit group, one flow property, a product flow
+    for each process and a pool of elementary flows.  Each process produces its own product and consumes products of
+    other processes.
+    :param path: directory to write; created if missing
+    :param n_processes:
+    :param n_exchanges: number of non-reference exchanges per process
+    :param n_elementary: number of elementary flows shared among processes
+    :param seed: random seed, so that results are repeatable
+    :return: number of files written
+    """
+    import os
+    rnd = random.Random(seed)
+    dirs = dict((d, os.path.join(path, 'ILCD', d)) for d in ('unitgroups', 'flowproperties', 'flows', 'processes'))
+    for d in dirs.values():
+        if not os.path.isdir(d):
+            os.makedirs(d)
+
+    def _write(d, u, content):
+        with open(os.path.join(dirs[d], '%s.xml' % u), 'w') as fp:
+            fp.write(content)
+
+    ug = _uuid('ilcd', 'unitgroup')
+    fp_id = _uuid('ilcd', 'flowproperty')
+    _write('unitgroups', ug, _ILCD_UNITGROUP % {'id': ug})
+    _write('flowproperties', fp_id, _ILCD_FLOWPROPERTY % {'id': fp_id, 'ug': ug})
+    products = [_uuid('ilcd', 'product', i) for i in range(n_processes)]
+    elementary = [_uuid('ilcd', 'elementary', j) for j in range(n_elementary)]
+    for i, u in enumerate(products):
+        _write('flows', u, _ILCD_FLOW % {'id': u, 'name': 'product %d' % i, 'category': 'synthetic products',
+                                         'type': 'Product flow', 'fp': fp_id})
+    for j, u in enumerate(elementary):
+        _write('flows', u, _ILCD_FLOW % {'id': u, 'name': 'elementary flow %d' % j, 'category': 'Emissions to air',
+                                         'type': 'Elementary flow', 'fp': fp_id})
+    for i in range(n_processes):
+        p = _uuid('ilcd', 'process', i)
+        n_inputs = n_exchanges // 4
+        inputs = [j for j in rnd.sample(range(n_processes), min(n_inputs, n_processes)) if j != i]
+        emissions = rnd.sample(range(n_elementary), min(n_exchanges - n_inputs, n_elementary))
+        lines = [_ILCD_PROCESS_HEADER % {'id': p, 'name': 'synthetic process %d' % i},
+                 _ILCD_EXCHANGE % {'xid': 0, 'flow': products[i], 'name': 'product %d' % i, 'dir': 'Output',
+                                   'value': 1.0}]
+        for j in inputs:
+            lines.append(_ILCD_EXCHANGE % {'xid': len(lines) - 1, 'flow': products[j], 'name': 'product %d' % j,
+                                           'dir': 'Input', 'value': rnd.random()})
+        for j in emissions:
+            lines.append(_ILCD_EXCHANGE % {'xid': len(lines) - 1, 'flow': elementary[j],
+                                           'name': 'elementary flow %d' % j, 'dir': 'Output',
+                                           'value': rnd.random() * 1e-3})
+        lines.append(_ILCD_PROCESS_FOOTER)
+        _write('processes', p, ''.join(lines))
+    return 2 + n_processes * 2 + n_elementary
+
+
+def write_synthetic_olca(path, n_processes=1000, n_exchanges=50, n_elementary=2000, coproduct_every=10, seed=1):
+    """
+    Writes a zipped openLCA JSON-LD export: a mass unit group and flow property, a small category tree, a product flow
+    for each process and a pool of elementary flows.  Every coproduct_every-th process has a second product, with
+    physical allocation factors.
+    :param path: zip file to write
+    :param n_processes:
+    :param n_exchanges: number of non-reference exchanges per process
+    :param n_elementary: number of elementary flows shared among processes
+    :param coproduct_every:
+    :param seed: random seed, so that results are repeatable
+    :return: number of members written
+    """
+    import json
+    import zipfile
+    rnd = random.Random(seed)
+    members = []
+
+    def _obj(typ, u, name, category=None, **kwargs):
+        j = {'@context': 'http://greendelta.github.io/olca-schema/context.jsonld', '@type': typ, '@id': u,
+             'name': name}
+        if category is not None:
+            j['category'] = {'@type': 'Category', '@id': category}
+        j.update(kwargs)
+        return j
+
+    def _ref(typ, u):
+        return {'@type': typ, '@id': u}
+
+    cats = dict()
+    for names in (('Elementary flows', 'Emission to air', 'unspecified'), ('Products', 'synthetic'),
+                  ('Processes', 'synthetic')):
+        parent = None
+        for k in range(len(names)):
+            u = _uuid('olca', 'category', *names[:k + 1])
+            if u not in cats:
+                cats[u] = _obj('Category', u, names[k], category=parent)
+                members.append(('categories', cats[u]))
+            parent = u
+    c_elem, c_prod, c_proc = (_uuid('olca', 'category', *n) for n in (
+        ('Elementary flows', 'Emission to air', 'unspecified'), ('Products', 'synthetic'), ('Processes', 'synthetic')))
+
+    ug = _uuid('olca', 'unitgroup')
+    members.append(('unit_groups', _obj('UnitGroup', ug, 'Units of mass', units=[
+        {'@type': 'Unit', 'name': 'kg', 'conversionFactor': 1.0, 'referenceUnit': True},
+        {'@type': 'Unit', 'name': 'g', 'conversionFactor': 0.001}])))
+    mass = _uuid('olca', 'flowproperty')
+    members.append(('flow_properties', _obj('FlowProperty', mass, 'Mass', unitGroup=_ref('UnitGroup', ug),
+                                            flowPropertyType='PHYSICAL_QUANTITY')))
+    fps = [{'@type': 'FlowPropertyFactor', 'flowProperty': _ref('FlowProperty', mass), 'conversionFactor': 1.0,
+            'referenceFlowProperty': True}]
+
+    def _flow(u, name, category, flow_type):
+        return _obj('Flow', u, name, category=category, flowType=flow_type, cas='000000-00-0',
+                    flowProperties=[dict(k) for k in fps])
+
+    products = [_uuid('olca', 'product', i) for i in range(n_processes)]
+    elementary = [_uuid('olca', 'elementary', j) for j in range(n_elementary)]
+    for i, u in enumerate(products):
+        members.append(('flows', _flow(u, 'product %d' % i, c_prod, 'PRODUCT_FLOW')))
+    for j, u in enumerate(elementary):
+        members.append(('flows', _flow(u, 'elementary flow %d' % j, c_elem, 'ELEMENTARY_FLOW')))
+
+    def _exch(n, flow, value, is_input, ref=False):
+        x = {'@type': 'Exchange', 'internalId': n, 'flow': _ref('Flow', flow), 'amount': value, 'input': is_input,
+             'flowProperty': _ref('FlowProperty', mass), 'unit': {'@type': 'Unit', 'name': 'kg'}}
+        if ref:
+            x['quantitativeReference'] = True
+        return x
+
+    for i in range(n_processes):
+        exchs = [_exch(1, products[i], 1.0, False, ref=True)]
+        kwargs = dict()
+        if coproduct_every and i % coproduct_every == 0:
+            co = _uuid('olca', 'coproduct', i)
+            members.append(('flows', _flow(co, 'coproduct %d' % i, c_prod, 'PRODUCT_FLOW')))
+            exchs.append(_exch(2, co, 0.5, False))
+            kwargs['allocationFactors'] = [
+                {'@type': 'AllocationFactor', 'allocationType': 'PHYSICAL_ALLOCATION',
+                 'product': _ref('Flow', products[i]), 'value': 0.75},
+                {'@type': 'AllocationFactor', 'allocationType': 'PHYSICAL_ALLOCATION', 'product': _ref('Flow', co),
+                 'value': 0.25}]
+            kwargs['defaultAllocationMethod'] = 'PHYSICAL_ALLOCATION'
+        n_inputs = n_exchanges // 4
+        for j in rnd.sample(range(n_processes), min(n_inputs, n_processes)):
+            if j != i:
+                exchs.append(_exch(len(exchs) + 1, products[j], rnd.random(), True))
+        for j in rnd.sample(range(n_elementary), min(n_exchanges - n_inputs, n_elementary)):
+            exchs.append(_exch(len(exchs) + 1, elementary[j], rnd.random() * 1e-3, False))
+        u = _uuid('olca', 'process', i)
+        members.append(('processes', _obj('Process', u, 'synthetic process %d' % i, category=c_proc,
+                                          processType='UNIT_PROCESS', location={'@type': 'Location', 'name': 'GLO'},
+                                          processDocumentation={'validFrom': '2011-01-01',
+                                                                'validUntil': '2017-12-31'},
+                                          exchanges=exchs, **kwargs)))
+
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as z:
+        for typ, j in members:
+            z.writestr('%s/%s.json' % (typ, j['@id']), json.dumps(j))
+    return len(members)
+
+
+def write_xlsx(path, sheets):
+    """
+    Writes a minimal .xlsx workbook (inline strings, no styles) that xlrd can read
+    :param path:
+    :param sheets: list of (sheet name, rows); each row is a list of str or float
+    :return:
+    """
+    import zipfile
+    from xml.sax.saxutils import escape
+
+    def _col(i):
+        s = ''
+        i += 1
+        while i:
+            i, r = divmod(i - 1, 26)
+            s = chr(65 + r) + s
+        return s
+
+    def _cell(ref, v):
+        if isinstance(v, str):
+            return '<c r="%s" t="inlineStr"><is><t>%s</t></is></c>' % (ref, escape(v))
+        return '<c r="%s"><v>%r</v></c>' % (ref, v)
+
+    ct = 'application/vnd.openxmlformats-officedocument.spreadsheetml'
+    rel = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+    pkg = 'http://schemas.openxmlformats.org/package/2006'
+    main = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as z:
+        z.writestr('[Content_Types].xml', ''.join(
+            ['<?xml version="1.0" encoding="UTF-8"?><Types xmlns="%s/content-types">' % pkg,
+             '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>',
+             '<Default Extension="xml" ContentType="application/xml"/>',
+             '<Override PartName="/xl/workbook.xml" ContentType="%s.sheet.main+xml"/>' % ct] +
+            ['<Override PartName="/xl/worksheets/sheet%d.xml" ContentType="%s.worksheet+xml"/>' % (i + 1, ct)
+             for i in range(len(sheets))] + ['</Types>']))
+        z.writestr('_rels/.rels', '<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="%s/relationships">'
+                                  '<Relationship Id="rId1" Type="%s/officeDocument" Target="xl/workbook.xml"/>'
+                                  '</Relationships>' % (pkg, rel))
+        z.writestr('xl/workbook.xml', ''.join(
+            ['<?xml version="1.0" encoding="UTF-8"?><workbook xmlns="%s" xmlns:r="%s"><sheets>' % (main, rel)] +
+            ['<sheet name="%s" sheetId="%d" r:id="rId%d"/>' % (escape(n), i + 1, i + 1)
+             for i, (n, _) in enumerate(sheets)] + ['</sheets></workbook>']))
+        z.writestr('xl/_rels/workbook.xml.rels', ''.join(
+            ['<?xml version="1.0" encoding="UTF-8"?><Relationships xmlns="%s/relationships">' % pkg] +
+            ['<Relationship Id="rId%d" Type="%s/worksheet" Target="worksheets/sheet%d.xml"/>' % (i + 1, rel, i + 1)
+             for i in range(len(sheets))] + ['</Relationships>']))
+        for i, (n, rows) in enumerate(sheets):
+            z.writestr('xl/worksheets/sheet%d.xml' % (i + 1), ''.join(
+                ['<?xml version="1.0" encoding="UTF-8"?><worksheet xmlns="%s"><sheetData>' % main] +
+                ['<row r="%d">%s</row>' % (r + 1, ''.join(_cell('%s%d' % (_col(c), r + 1), v)
+                                                          for c, v in enumerate(row)))
+                 for r, row in enumerate(rows)] + ['</sheetData></worksheet>']))
+
+
+EI_LCIA_HEADERS = ['method', 'category', 'indicator', 'name', 'compartment', 'subcompartment', 'unit', 'note',
+                   'Known issue', 'CF 3.1', 'Change?']
+
+
+def write_synthetic_ei_lcia(path, n_methods=50, n_flows=600, seed=1):
+    """
+    Writes a workbook shaped like the ecoinvent 'LCIA implementation' spreadsheet: an 'impact methods' sheet with one
+    row per (method, flow) characterization factor.
+    :param path: .xlsx file to write
+    :param n_methods: number of (method, category, indicator) triples
+    :param n_flows: number of (name, compartment, subcompartment) flows characterized by every method
+    :param seed:
+    :return: number of CF rows
+    """
+    rnd = random.Random(seed)
+    rows = [EI_LCIA_HEADERS]
+    for m in range(n_methods):
+        for j in range(n_flows):
+            rows.append(['synthetic method %d' % (m // 5), 'category %d' % m, 'indicator %d' % m,
+                         'elementary flow %d' % j, 'air', 'unspecified', 'kg eq', '', '', rnd.random(), ''])
+    write_xlsx(path, [('impact methods', rows)])
+    return len(rows) - 1
@@ -0,0 +1,45 @@
+"""
+Time AntelopeV1Client against a local stand-in server with simulated latency: process LCIA, fragment traversal and
+fragment LCIA for every process and fragment, with one request at a time (max_workers=1) and with concurrent
+prefetching; then again from a warm on-disk response cache.
+
+python -m antelope_utilities.benchmarks.v1_client_fetch [latency_ms] [n_processes] [n_fragments]
+"""
+import sys
+import tempfile
+import time
+
+from antelope_catalog.providers.v1_client import AntelopeV1Client
+from antelope_catalog.providers.v1_client.tests.stand_in import StandInServer, StandInData
+
+
+def workload(server, max_workers, cache_dir=None):
+    t0 = time.perf_counter()
+    ar = AntelopeV1Client(server.url, max_workers=max_workers, cache_dir=cache_dir, quiet=True)
+    inv = ar.make_interface('inventory')
+    for i in range(1, server.data.n_processes + 1):
+        inv.lcia('processes/%d' % i, None, 'lciamethods/1')
+    for i in range(1, server.data.n_fragments + 1):
+        inv.traverse('fragments/%d' % i)
+        inv.fragment_lcia('fragments/%d' % i, 'lciamethods/1')
+    ar._fetcher.close()
+    return time.perf_counter() - t0, ar._fetcher
+
+
+def main(latency_ms=20, n_processes=100, n_fragments=20):
+    data = StandInData(n_processes=n_processes, n_flows=4 * n_processes, n_fragments=n_fragments)
+    with StandInServer(data=data, latency=latency_ms / 1000.0) as server, tempfile.TemporaryDirectory() as d:
+        print('%d ms latency; %d processes, %d fragments' % (latency_ms, n_processes, n_fragments))
+        runs = [('serial', 1, None), ('x8', 8, None), ('x16', 16, None), ('x8 cold disk', 8, d),
+                ('x8 warm disk', 8, d)]
+        base = None
+        for label, workers, cache_dir in runs:
+            server.hits.clear()
+            t, f = workload(server, workers, cache_dir=cache_dir)
+            base = base or t
+            print('%-13s %7.2f s  (%.2fx)  %5d requests  %5d disk hits' % (label, t, base / t, server.total_hits,
+                                                                          f.disk_hits))
+
+
+if __name__ == '__main__':
+    main(*[int(k) for k in sys.argv[1:]])
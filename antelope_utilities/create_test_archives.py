@@ -55,7 +55,7 @@ def shrink_petro(_petro, max_count=3):
             c_out += 1
     # assert len(ditch) + (2 * max_count) == 40, len(ditch)
     for i in ditch:
-        _petro._exchanges.pop(i.key)
+        _petro.remove_exchange(i)
     _petro._d.pop('allocationFactors')
 
     # ensure the named exchanges required by tests are included
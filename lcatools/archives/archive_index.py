@@ -6,6 +6,7 @@ from .entity_store import construct_new_ref
 from .basic_archive import BasicArchive, BASIC_ENTITY_TYPES, InterfaceError, ArchiveError
 from .lc_archive import LcArchive, LC_ENTITY_TYPES
 from ..implementations import IndexImplementation
+from ..implementations.termination_index import TerminationIndex
 
 
 class AbstractIndex(object):
@@ -23,7 +24,11 @@ class BasicIndex(BasicArchive, AbstractIndex):
 
 class LcIndex(LcArchive, AbstractIndex):
     def serialize(self, exchanges=False, characterizations=False, values=False, domesticate=False):
-        return super(LcIndex, self).serialize(exchanges=False, characterizations=False, values=False, domesticate=False)
+        j = super(LcIndex, self).serialize(exchanges=False, characterizations=False, values=False, domesticate=False)
+        ti = getattr(self, 'ti', None)
+        if isinstance(ti, TerminationIndex) and not ti.cutoffs:
+            j['terminations'] = ti.serialize()
+        return j
 
 
 def index_archive(archive, source, ref=None, signifier='index', force=False):
@@ -59,5 +64,13 @@ def index_archive(archive, source, ref=None, signifier='index', force=False):
 
     index.load_from_dict({'catalogNames': names})
 
+    if isinstance(index, LcIndex):
+        # store the termination index so that it can be loaded without walking processes
+        ti = getattr(archive, 'ti', None)
+        if not isinstance(ti, TerminationIndex) or ti.cutoffs:
+            ti = TerminationIndex(archive)
+        ti.update()
+        index.load_from_dict({'terminations': ti.serialize()})
+
     index.write_to_file(source, gzip=True)
     return index
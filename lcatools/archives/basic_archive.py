@@ -286,10 +286,25 @@ class BasicArchive(EntityStore):
             self.check_counter()
 
     @staticmethod
-    def _narrow_search(entity, **kwargs):
+    def _compile_search(**kwargs):
+        """
+        Compile keyword search terms once, so that they can be re-used for every entity in every archive searched.
+        :param kwargs: property name: regex or list of regexes
+        :return: list of (property name, [compiled regexes])
+        """
+        terms = []
+        for k, v in kwargs.items():
+            if isinstance(v, str):
+                v = [v]
+            terms.append((k, [re.compile(vv, flags=re.IGNORECASE) for vv in v]))
+        return terms
+
+    @staticmethod
+    def _narrow_search(entity, _compiled=None, **kwargs):
         """
         Narrows a result set using sequential keyword filtering
         :param entity:
+        :param _compiled: output of _compile_search(), used in place of kwargs if present
         :param kwargs:
         :return: bool
         """
@@ -300,38 +315,77 @@ class BasicArchive(EntityStore):
                 return tag
             else:
                 return ' '.join([_recurse_expand_subtag(t) for t in tag])
-        keep = True
-        for k, v in kwargs.items():
-            if k not in entity.keys():
+        if _compiled is None:
+            _compiled = BasicArchive._compile_search(**kwargs)
+        keys = entity.keys()
+        for k, regexes in _compiled:
+            if k not in keys:
                 return False
-            if isinstance(v, str):
-                v = [v]
-            for vv in v:
-                keep = keep and bool(re.search(vv, _recurse_expand_subtag(entity[k]), flags=re.IGNORECASE))
-        return keep
+            text = _recurse_expand_subtag(entity[k])
+            for r in regexes:
+                if not r.search(text):
+                    return False
+        return True
 
-    def search(self, etype=None, upstream=False, **kwargs):
+    def _upstream_chain(self):
+        """
+        Generate this archive followed by each of its upstream archives in order, stopping if a cycle is detected
+        :return:
+        """
+        seen = set()
+        ar = self
+        while ar is not None and id(ar) not in seen:
+            seen.add(id(ar))
+            yield ar
+            ar = ar._upstream
+
+    def _search_local(self, etype, compiled):
+        if etype is not None:
+            _gen = self.entities_by_type(etype)
+        else:
+            _gen = self._entities.values()
+        for ent in _gen:
+            if self._narrow_search(ent, _compiled=compiled):
+                yield ent
+
+    def search(self, etype=None, upstream=False, limit=None, **kwargs):
         """
         Find entities by search term, either full or partial uuid or entity property like 'Name', 'CasNumber',
         or so on.
+
+        If upstream is True, the archive and its upstream archives are searched in sequence, with search terms
+        compiled once for the whole chain.  An entity is reported only once per entity type and external ref, the
+        first time it is encountered (i.e. local entities shadow upstream ones).  The search is lazy: upstream archives
+        are only scanned if the consumer keeps iterating, and a limit stops the search outright.
         :param etype: optional first argument is entity type
         :param upstream: (False) if upstream archive exists, search there too
+        :param limit: [None] stop after this many results
         :param kwargs: regex search through entities' properties as named in the kw arguments
         :return: result set
         """
         if etype is None:
             if 'entity_type' in kwargs.keys():
                 etype = kwargs.pop('entity_type')
-        if etype is not None:
-            for ent in self.entities_by_type(etype):
-                if self._narrow_search(ent, **kwargs):
-                    yield ent
+        if limit is not None and limit <= 0:
+            return
+        compiled = self._compile_search(**kwargs)
+        if upstream:
+            archives = self._upstream_chain()
         else:
-            for ent in self._entities.values():
-                if self._narrow_search(ent, **kwargs):
-                    yield ent
-        if upstream and self._upstream is not None:
-            self._upstream.search(etype, upstream=upstream, **kwargs)
+            archives = (self, )
+        seen = set()
+        found = 0
+        for ar in archives:
+            for ent in ar._search_local(etype, compiled):
+                if upstream:
+                    key = (ent.entity_type, ent.external_ref)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                yield ent
+                found += 1
+                if limit is not None and found >= limit:
+                    return
 
     def serialize(self, characterizations=False, values=False, domesticate=False):
         """
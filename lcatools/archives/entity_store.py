@@ -15,6 +15,7 @@ from datetime import datetime
 from collections import defaultdict
 
 from ..interfaces import to_uuid, local_ref
+from .. import tracing
 
 LD_CONTEXT = 'https://bkuczenski.github.io/lca-tools-datafiles/context.jsonld'
 
@@ -528,7 +529,8 @@ class EntityStore(object):
                 return entity
 
         # fetch
-        return self._fetch(key, **kwargs)
+        with tracing.span('archive', '%s._fetch' % self.__class__.__name__, self.ref):
+            return self._fetch(key, **kwargs)
 
     def get(self, key):
         return self.retrieve_or_fetch_entity(key)
@@ -573,7 +575,8 @@ class EntityStore(object):
     def load_all(self, **kwargs):
         if self._loaded is False:
             print('Loading %s' % self.source)
-            self._load_all(**kwargs)
+            with tracing.span('archive', '%s._load_all' % self.__class__.__name__, self.ref):
+                self._load_all(**kwargs)
             self._loaded = True
 
     def entities_by_type(self, entity_type):
@@ -583,6 +586,9 @@ class EntityStore(object):
     def count_by_type(self, entity_type):
         return len(self._ents_by_type[entity_type])
 
+    def count_all(self):
+        return len(self._entities)
+
     @property
     def init_args(self):
         return self._serialize_dict
@@ -624,15 +630,19 @@ class EntityStore(object):
                 s['loaded'] = True
         else:
             s = self.serialize(**kwargs)
+        # write to a temporary file and move it into place, so that readers never see a partial file
         if gzip is True:
             if not bool(re.search('\.gz$', filename)):
                 filename += '.gz'
+            tmp = filename + '.part'
             if six.PY3:  # python3
-                with gz.open(filename, 'wt') as fp:
+                with gz.open(tmp, 'wt') as fp:
                     json.dump(s, fp, indent=2, sort_keys=True)
             else:  # python2
-                with gz.open(filename, 'w') as fp:
+                with gz.open(tmp, 'w') as fp:
                     json.dump(s, fp, indent=2, sort_keys=True)
         else:
-            with open(filename, 'w') as fp:
+            tmp = filename + '.part'
+            with open(tmp, 'w') as fp:
                 json.dump(s, fp, indent=2, sort_keys=True)
+        os.replace(tmp, filename)
@@ -11,6 +11,7 @@ import os
 from ..entities import LcEntity, LcProcess
 from ..from_json import from_json
 from ..implementations import InventoryImplementation, BackgroundImplementation, ConfigureImplementation
+from ..implementations.termination_index import TerminationIndex
 from .basic_archive import BasicArchive, BASIC_ENTITY_TYPES
 
 
@@ -31,6 +32,17 @@ class LcArchive(BasicArchive):
     """
     _entity_types = set(LC_ENTITY_TYPES)
 
+    def __init__(self, source, lazy_exchanges=True, **kwargs):
+        """
+        :param source:
+        :param lazy_exchanges: [True] when loading processes from JSON, construct only their reference exchanges up
+         front; the remaining exchanges are built the first time the process's exchanges are accessed.  Set False to
+         build every exchange at load time.
+        :param kwargs: passed to BasicArchive
+        """
+        super(LcArchive, self).__init__(source, **kwargs)
+        self._lazy_exchanges = lazy_exchanges
+
     def __getitem__(self, item):
         """
         Note: this user-friendliness check adds 20% to the execution time of getitem-- so avoid it if possible
@@ -76,11 +88,25 @@ class LcArchive(BasicArchive):
         if 'processes' in j:
             for e in j['processes']:
                 self.entity_from_json(e)
+        if 'terminations' in j:
+            self._load_terminations(j['terminations'])
         if _check:
             self.check_counter()
         if jsonfile is not None and jsonfile == self.source:
             self._loaded = True
 
+    def _load_terminations(self, packed):
+        """
+        Load a persisted termination index, merging it into any index the archive already has
+        :param packed: as generated by TerminationIndex.serialize()
+        :return:
+        """
+        ti = getattr(self, 'ti', None)
+        if isinstance(ti, TerminationIndex):
+            ti.load_packed(packed)
+        else:
+            self.ti = TerminationIndex.from_packed(self, packed)
+
     def _process_from_json(self, entity_j, uid):
         # note-- we are officially abandoning referenceExchange notation
         entity_j.pop('externalId')  # TODO - see basic archive
@@ -90,28 +116,46 @@ class LcArchive(BasicArchive):
         exchs = entity_j.pop('exchanges', [])
         process = LcProcess(uid, **entity_j)
         refs, nonrefs = [], []
-        ref_x = dict()
-        for i, x in enumerate(exchs):
+        for x in exchs:
             if 'isReference' in x and x['isReference'] is True:
-                refs.append(i)
+                refs.append(x)
             else:
-                nonrefs.append(i)
+                nonrefs.append(x)
         # first add reference exchanges
-        for i in refs:
-            x = exchs[i]
+        for x in refs:
             # eventually move this to an exchange classmethod - which is why I'm repeating myself for now
             v = None
             f = self._get_entity(x['flow'])
             d = x['direction']
             if 'value' in x:
                 v = x['value']
-            ref_x[x['flow']] = process.add_exchange(f, d, value=v)
+            process.add_exchange(f, d, value=v)
             process.add_reference(f, d)
-        # then add ordinary [allocated] exchanges
-        for i in nonrefs:
-            x = exchs[i]
+
+        if a_b_q is not None:
+            alloc_q = self[a_b_q['externalId']]  # allocation quantity must be locally present
+            process.allocate_by_quantity(alloc_q)
+
+        # then add ordinary [allocated] exchanges, now or on first access
+        if len(nonrefs) > 0:
+            if self._lazy_exchanges:
+                process.defer_exchanges(lambda p: self._add_exchanges_from_json(p, nonrefs))
+            else:
+                self._add_exchanges_from_json(process, nonrefs)
+
+        return process
+
+    def _add_exchanges_from_json(self, process, exchs):
+        """
+        Construct a process's non-reference exchanges from their serialized form.  The process's reference exchanges
+        must already be present, since allocated values are keyed to them.
+        :param process:
+        :param exchs: list of serialized non-reference exchanges
+        :return:
+        """
+        ref_x = {rx.flow.uuid: process.get_exchange(rx.key) for rx in process.reference_entity}
+        for x in exchs:
             t = None
-            # is_ref = False
             f = self._get_entity(x['flow'])
             d = x['direction']
             if 'termination' in x:
@@ -132,12 +176,6 @@ class LcArchive(BasicArchive):
                     # assert rx.direction == drr
                     process.add_exchange(f, d, reference=rx, value=val, termination=t)
 
-        if a_b_q is not None:
-            alloc_q = self[a_b_q['externalId']]  # allocation quantity must be locally present
-            process.allocate_by_quantity(alloc_q)
-
-        return process
-
     def _make_entity(self, e, etype, uid):
         if etype == 'process':
             return self._process_from_json(e, uid)
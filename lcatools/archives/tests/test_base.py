@@ -1,8 +1,12 @@
 from ..lc_archive import LcArchive
+from ..archive_index import index_archive
 from ...from_json import from_json
 
 import os
 import json
+import tempfile
+import threading
+import time
 from shutil import rmtree
 import unittest
 from datetime import datetime
@@ -210,6 +214,63 @@ class LcArchiveTest(unittest.TestCase):
         self.assertEqual(ar.ref, 'test.basic')
 
 
+class LazyExchangeTest(unittest.TestCase):
+    p_uuid = '78c8b1e5-ca60-38b6-9a94-dde046560a38'
+
+    def test_deferred_on_load(self):
+        ar = LcArchive.from_file(test_file)
+        p = ar[self.p_uuid]
+        self.assertTrue(p.exchanges_deferred)
+        self.assertEqual(len(p.reference_entity), 1)
+        self.assertEqual(len([x for x in p.inventory()]), 3)
+        self.assertFalse(p.exchanges_deferred)
+
+    def test_concurrent_access(self):
+        ar = LcArchive.from_file(test_file)
+        p = ar[self.p_uuid]
+        loader, started = p._x_loader, threading.Event()
+
+        def slow_loader(proc):
+            started.set()
+            time.sleep(0.1)
+            loader(proc)
+
+        p._x_loader = slow_loader
+        t = threading.Thread(target=lambda: len(p))
+        t.start()
+        started.wait(5)
+        self.assertEqual(len([x for x in p.inventory()]), 3)  # waits for the loader to finish
+        t.join(5)
+
+    def test_serialize_references(self):
+        ar = LcArchive(None, ref='test.basic')
+        ar.load_from_dict(from_json(test_file), jsonfile=test_file)
+        eager = LcArchive(None, ref='test.basic', lazy_exchanges=False)
+        eager.load_from_dict(from_json(test_file), jsonfile=test_file)
+        j = ar[self.p_uuid].serialize(exchanges=False, values=True)
+        self.assertTrue(ar[self.p_uuid].exchanges_deferred)
+        self.assertDictEqual(j, eager[self.p_uuid].serialize(exchanges=False, values=True))
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(rmtree, tmp)
+        index_archive(ar, os.path.join(tmp, 'test_index.json.gz'), ref='test.basic.index')
+        self.assertTrue(ar[self.p_uuid].exchanges_deferred)
+
+    def test_eager(self):
+        ar = LcArchive(None, ref='test.basic', lazy_exchanges=False)
+        ar.load_from_dict(from_json(test_file), jsonfile=test_file)
+        self.assertFalse(ar[self.p_uuid].exchanges_deferred)
+
+    def test_lazy_matches_eager(self):
+        lazy = LcArchive(None, ref='test.basic')
+        lazy.load_from_dict(from_json(test_file), jsonfile=test_file)
+        eager = LcArchive(None, ref='test.basic', lazy_exchanges=False)
+        eager.load_from_dict(from_json(test_file), jsonfile=test_file)
+        ref = eager[self.p_uuid].reference()
+        self.assertEqual(lazy[self.p_uuid].reference().value, ref.value)
+        self.assertDictEqual(lazy[self.p_uuid].serialize(exchanges=True, values=True),
+                             eager[self.p_uuid].serialize(exchanges=True, values=True))
+
+
 class DescendantTest(unittest.TestCase):
     @classmethod
     def tearDownClass(cls):
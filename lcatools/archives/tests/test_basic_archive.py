@@ -77,5 +77,34 @@ class BasicArchiveTestCase(unittest.TestCase):
         self.assertSetEqual(set(k for k in a.get_sources(test_ref)), {conflict_file, WORKING_FILE})
 
 
+class UpstreamSearchTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.up = BasicArchive('/dummy/upstream', ref='test.upstream')
+        mass = cls.up.new_quantity('mass', 'kg')
+        for name in ('water', 'wastewater', 'steel', 'steam'):
+            cls.up.new_flow(name, mass)
+        cls.down = BasicArchive('/dummy/downstream', ref='test.downstream', upstream=cls.up)
+        cls.down.new_flow('water', mass)  # shadows the upstream flow with the same external ref
+        cls.down.new_flow('seawater', mass)
+
+    def test_local_only(self):
+        self.assertSetEqual({f.external_ref for f in self.down.search('flow', Name='water')}, {'water', 'seawater'})
+
+    def test_upstream(self):
+        found = [f for f in self.down.search('flow', upstream=True, Name='water')]
+        self.assertEqual(len(found), 3)
+        self.assertSetEqual({f.external_ref for f in found}, {'water', 'seawater', 'wastewater'})
+        self.assertEqual(next(f for f in found if f.external_ref == 'water').origin, 'test.downstream')
+
+    def test_limit(self):
+        self.assertEqual(len([f for f in self.down.search('flow', upstream=True, limit=2, Name='water')]), 2)
+        self.assertEqual(len([f for f in self.down.search('flow', upstream=True, limit=0)]), 0)
+
+    def test_multiple_terms(self):
+        found = [f for f in self.down.search('flow', upstream=True, Name=['^s', 'e[ae]'])]
+        self.assertSetEqual({f.external_ref for f in found}, {'seawater', 'steel', 'steam'})
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -8,6 +8,7 @@ class Characterization(object):
     A characterization is an affiliation of a flow and a quantity. Characterizations are inherently naively spatialized,
     with factors stored in a dict of locations, and the 'GLO' location being used as the default.
     """
+    __slots__ = ('flow', 'quantity', '_locations', '_origins', '_natural_dirn')
 
     entity_type = 'characterization'
 
@@ -1,6 +1,7 @@
 from __future__ import print_function, unicode_literals
 
 import uuid
+from sys import intern
 from itertools import chain
 from numbers import Number
 from lcatools.entity_refs import CatalogRef
@@ -33,6 +34,8 @@ class LcEntity(object):
     """
     All LC entities behave like dicts, but they all have some common properties, defined here.
     """
+    __slots__ = ('_uuid', '_d', '_entity_type', 'reference_entity', '_origin', '_external_ref', '_query_ref')
+
     _pre_fields = ['Name']
     _new_fields = []
     _ref_field = ''
@@ -41,9 +44,9 @@ class LcEntity(object):
     def __init__(self, entity_type, entity_uuid, origin=None, external_ref=None, **kwargs):
 
         if isinstance(entity_uuid, uuid.UUID):
-            self._uuid = str(entity_uuid)
+            self._uuid = intern(str(entity_uuid))
         else:
-            self._uuid = str(uuid.UUID(entity_uuid))
+            self._uuid = intern(str(uuid.UUID(entity_uuid)))  # exchange terminations refer to these
         self._d = LowerDict()
 
         self._entity_type = entity_type
@@ -16,6 +16,7 @@ class DeleteReference(Exception):
 
 
 class LcFlow(LcEntity):
+    __slots__ = ('_characterizations', '_local_unit')
 
     _ref_field = 'referenceQuantity'
     _new_fields = ['CasNumber', 'Compartment']
@@ -23,17 +23,36 @@ class LowerDictKeys(object):
 
 # caseinsensitivedict.py
 class LowerDict(dict):
+    """
+    Keys are stored as LowerDict.Key instances.  Since a handful of property names are shared by every entity, Key
+    instances are cached and re-used across all LowerDicts (see _key()), so that each entity does not carry its own
+    copies of 'Name', 'Comment', etc.
+    """
+    __slots__ = ()
 
     class Key(str):
         def __init__(self, key):
             str.__init__(key)
+            self._hash = hash(self.lower())
 
         def __hash__(self):
-            return hash(self.lower())
+            return self._hash
 
         def __eq__(self, other):
             return self.lower() == other.lower()
 
+    _keys = dict()  # maps literal (case-sensitive) key string to shared Key instance
+
+    @classmethod
+    def _key(cls, key):
+        if isinstance(key, cls.Key):
+            return key
+        try:
+            return cls._keys[key]
+        except KeyError:
+            k = cls._keys[key] = cls.Key(key)
+            return k
+
     def __init__(self, *args, data=None, **kwargs):
         super(LowerDict, self).__init__(*args, **kwargs)
         if data is None:
@@ -42,19 +61,19 @@ class LowerDict(dict):
             self[key] = val
 
     def __contains__(self, key):
-        key = self.Key(key)
+        key = self._key(key)
         return super(LowerDict, self).__contains__(key)
 
     def __setitem__(self, key, value):
-        key = self.Key(key)
+        key = self._key(key)
         super(LowerDict, self).__setitem__(key, value)
 
     def __getitem__(self, key):
-        key = self.Key(key)
+        key = self._key(key)
         return super(LowerDict, self).__getitem__(key)
 
     def pop(self, key, default=None):
-        key = self.Key(key)
+        key = self._key(key)
         return super(LowerDict, self).pop(key, default)
 
     def items(self):
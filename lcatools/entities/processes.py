@@ -1,9 +1,11 @@
 from __future__ import print_function, unicode_literals
 from numbers import Number
 
+import threading
 import uuid
 
 from collections import defaultdict
+from itertools import chain
 
 from ..interfaces import InventoryRequired
 
@@ -45,6 +47,8 @@ class RxRef(object):
     A placeholder object to store reference exchange info for process_refs.  It can be modified to interoperate in
     places where exchanges are expected, e.g by having equivalent equality tests, hashes, etc., as needed.
     """
+    __slots__ = ('_process_ref', '_flow_ref', '_direction', '_hash', '_comment', '_cached_value')
+
     def __init__(self, process_uuid, flow, direction, comment=None):
         self._process_ref = None
         self._flow_ref = flow
@@ -150,7 +154,12 @@ class RxRef(object):
         return '%6.6s: %s [%s %s] %s' % (self.direction, ref, self._value_string, self.flow.unit(), self.flow)
 
 
+_x_load_lock = threading.RLock()  # serializes the materialization of deferred exchanges
+_LOADING = object()  # stands in for a deferred exchange loader while it runs
+
+
 class LcProcess(LcEntity):
+    __slots__ = ('_x_dict', '_x_map', '_x_term', '_x_loader', '_alloc_by_quantity', '_alloc_sum', '_alloc_cache')
 
     _ref_field = 'referenceExchange'
     _new_fields = ['SpatialScope', 'TemporalScope', 'Classifications']
@@ -181,8 +190,11 @@ class LcProcess(LcEntity):
         :param entity_uuid:
         :param kwargs:
         """
-        self._exchanges = dict()  # maps exchange key to exchange
-        self._exch_map = defaultdict(set)  # maps flow external_ref to exchanges having that flow
+        self._x_dict = dict()  # maps exchange key to exchange
+        self._x_map = dict()  # maps direction -> flow external_ref -> list of exchanges with that flow and direction
+        self._x_term = defaultdict(list)  # maps termination to exchanges having that termination
+        self._x_loader = None  # deferred exchange constructor; see defer_exchanges()
+        self._alloc_cache = None  # (non-reference exchanges, {reference key: allocated values}); see allocation_matrix()
 
         super(LcProcess, self).__init__('process', entity_uuid, **kwargs)
         if self.reference_entity is not None:
@@ -198,6 +210,83 @@ class LcProcess(LcEntity):
         if 'Classifications' not in self._d:
             self._d['Classifications'] = []
 
+    @property
+    def _exchanges(self):
+        if self._x_loader is not None:
+            self._load_deferred_exchanges()
+        return self._x_dict
+
+    @property
+    def _exch_map(self):
+        if self._x_loader is not None:
+            self._load_deferred_exchanges()
+        return self._x_map
+
+    @property
+    def _term_map(self):
+        if self._x_loader is not None:
+            self._load_deferred_exchanges()
+        return self._x_term
+
+    def _index_exchange(self, x):
+        try:
+            by_flow = self._x_map[x.direction]
+        except KeyError:
+            by_flow = self._x_map[x.direction] = defaultdict(list)
+        by_flow[x.flow.external_ref].append(x)
+        if x.termination is not None:
+            self._x_term[x.termination].append(x)
+
+    def _unindex_exchange(self, x):
+        by_flow = self._x_map[x.direction]
+        by_flow[x.flow.external_ref].remove(x)
+        if len(by_flow[x.flow.external_ref]) == 0:
+            by_flow.pop(x.flow.external_ref)
+        if x.termination is not None:
+            self._x_term[x.termination].remove(x)
+            if len(self._x_term[x.termination]) == 0:
+                self._x_term.pop(x.termination)
+
+    def defer_exchanges(self, loader):
+        """
+        Postpone construction of the process's non-reference exchanges until they are first needed.  The loader is a
+        callable that accepts the process as its only argument and populates it by calling add_exchange(); it is
+        called exactly once, the first time the process's exchanges are accessed.
+
+        Reference exchanges should be added before the loader is deferred, so that the process's reference_entity
+        and allocation are available without materializing the full inventory.
+        :param loader: callable(process)
+        :return:
+        """
+        if self._x_loader is not None:
+            self._load_deferred_exchanges()
+        self._x_loader = loader
+
+    @property
+    def exchanges_deferred(self):
+        """
+        True if the process has exchanges that have not yet been materialized.
+        :return:
+        """
+        return self._x_loader is not None
+
+    def _load_deferred_exchanges(self):
+        """
+        Run the deferred loader.  The loader stays registered (as _LOADING) until it has finished, so that another
+        thread arriving meanwhile waits for the complete exchanges instead of reading a partial set; the loader's own
+        calls to add_exchange() find _LOADING and go straight to the exchanges.
+        :return:
+        """
+        with _x_load_lock:
+            loader = self._x_loader
+            if loader is None or loader is _LOADING:
+                return
+            self._x_loader = _LOADING
+            try:
+                loader(self)
+            finally:
+                self._x_loader = None
+
     def _make_ref_ref(self, query):
         return [RxRef(self.uuid, x.flow.make_ref(query), x.direction, comment=x.comment) for x in self.references()]
 
@@ -223,6 +312,7 @@ class LcProcess(LcEntity):
         :return:
         """
         self._validate_reference({ref_entity})
+        self.reset_allocation_cache()
 
         if ref_entity.key in self._exchanges:
             if self._exchanges[ref_entity.key].set_ref(self):
@@ -264,38 +354,43 @@ class LcProcess(LcEntity):
             num += 1
         return it
 
-    def _gen_exchanges(self, flow=None, direction=None, reference=None):
+    def _gen_exchanges(self, flow=None, direction=None, reference=None, termination=None):
         """
         Generate a list of exchanges matching the supplied flow and direction.
 
-        If this is too slow, we could hash the process's exchanges by flow
+        Exchanges are indexed by direction and flow, and by termination, so a lookup costs O(matches) and not
+        O(exchanges).  Reference exchanges are never deferred, so reference lookups do not trigger materialization of
+        deferred exchanges.
         :param flow: either a flow entity, flow ref, or external_ref
         :param direction: [None] or filter by direction
         :param reference: [None] find any exchange; True: only reference exchanges; False: only non-reference exchanges
+        :param termination: [None] or filter by termination
         :return:
         """
-        if flow is None:
-            if reference is True:
-                _x_gen = (self._exchanges[x.key] for x in self.reference_entity)
-            elif reference is False:
-                _x_gen = (x for x in self._exchanges.values() if not x.is_reference)
-            else:
-                _x_gen = (x for x in self._exchanges.values())
-        else:
+        if flow is not None:
             if hasattr(flow, 'entity_type'):
                 if flow.entity_type != 'flow':
                     raise TypeError('Flow argument must be a flow')
                 flow = flow.external_ref
-            if reference is True:
-                _x_gen = (x for x in self._exch_map[flow] if x.is_reference)
-            elif reference is False:
-                _x_gen = (x for x in self._exch_map[flow] if not x.is_reference)
+        if reference is True:
+            _x_gen = (self._x_dict[x.key] for x in self.reference_entity
+                      if flow is None or x.flow.external_ref == flow)
+        elif flow is not None:
+            if direction is None:
+                _x_gen = chain.from_iterable(by_flow.get(flow, ()) for by_flow in self._exch_map.values())
             else:
-                _x_gen = (x for x in self._exch_map[flow])
+                _x_gen = self._exch_map.get(direction, {}).get(flow, ())
+        elif termination is not None:
+            _x_gen = self._term_map.get(termination, ())
+        else:
+            _x_gen = self._exchanges.values()
         for x in _x_gen:
-            if direction is not None:
-                if x.direction != direction:
-                    continue
+            if reference is False and x.is_reference:
+                continue
+            if direction is not None and x.direction != direction:
+                continue
+            if termination is not None and x.termination != termination:
+                continue
             yield x
 
     def get_exchange(self, key):
@@ -305,15 +400,25 @@ class LcProcess(LcEntity):
         for x in self._gen_exchanges(flow=flow, direction=direction):
             yield x.trim()
 
-    def exchange_values(self, flow, direction=None):
+    def exchange_values(self, flow, direction=None, termination=None):
         """
         Yield full exchanges matching flow specification.  Flow specification required.
         Will only yield multiple results if there are multiple terminations for the same flow.
         :param flow:
         :param direction:
+        :param termination: [None] if specified, only yield exchanges with the given termination
         :return:
         """
-        for x in self._gen_exchanges(flow=flow, direction=direction):
+        for x in self._gen_exchanges(flow=flow, direction=direction, termination=termination):
+            yield x
+
+    def terminated_exchanges(self, termination):
+        """
+        Yield full exchanges that are terminated to the given process
+        :param termination: external_ref (uuid for ecospold2) of the terminating process
+        :return:
+        """
+        for x in self._gen_exchanges(termination=termination):
             yield x
 
     def has_exchange(self, flow, direction=None):
@@ -342,23 +447,63 @@ class LcProcess(LcEntity):
                 ref_exch = self.find_exchange(ref_flow, direction=direction)
             except MultipleReferencesFound:
                 ref_exch = self.find_exchange(ref_flow, direction=direction, reference=True)
-        for i in self._exchanges.values():
-            if ref_exch is None:
-                # generate unallocated exchanges
+        if ref_exch is None:
+            # generate unallocated exchanges
+            for i in self._exchanges.values():
                 yield i
-            elif ref_exch.is_reference:
-                # generate allocated, normalized, non-reference exchanges
-                if i in self.reference_entity:
-                    continue
-                else:
-                    yield ExchangeValue.from_allocated(i, ref_exch)
-            else:
-                # generate un-allocated, normalized, non-query exchanges
+        elif ref_exch.is_reference:
+            # generate allocated, normalized, non-reference exchanges
+            rows, col = self._allocation_column(ref_exch)
+            for i, v in zip(rows, col):
+                yield ExchangeValue.from_allocated(i, ref_exch, value=v)
+        else:
+            # generate un-allocated, normalized, non-query exchanges
+            for i in self._exchanges.values():
                 if i is ref_exch:
                     continue
                 else:
                     yield ExchangeValue.from_allocated(i, ref_exch)
 
+    def reset_allocation_cache(self):
+        """
+        Discard cached allocated exchange values.  This is done automatically whenever the process's exchanges,
+        references, or allocation change.  It is not done when a reference flow's characterization changes, so call
+        this after re-characterizing reference flows in the allocation quantity.
+        :return:
+        """
+        self._alloc_cache = None
+
+    def _allocation_column(self, ref_exch):
+        """
+        Return the non-reference exchanges and their values allocated to the given reference exchange, computing and
+        caching the column if it is not already known.
+        :param ref_exch: a reference exchange belonging to the process
+        :return: 2-tuple: list of non-reference exchanges, list of allocated values (None for valueless Exchanges)
+        """
+        if self._alloc_cache is None:
+            self._alloc_cache = ([x for x in self._exchanges.values() if x not in self.reference_entity], dict())
+        rows, cols = self._alloc_cache
+        try:
+            col = cols[ref_exch.key]
+        except KeyError:
+            col = [x[ref_exch] if isinstance(x, ExchangeValue) else None for x in rows]
+            cols[ref_exch.key] = col
+        return rows, col
+
+    def allocation_matrix(self):
+        """
+        Compute (or retrieve from cache) the process's allocated exchange values with respect to every reference
+        exchange.  The cache is discarded whenever the process's exchanges, references or allocation change.
+        :return: 2-tuple: list of non-reference exchanges (rows), dict mapping reference exchange to a list of
+         allocated values (columns), aligned with the rows.  Valueless exchanges have None entries.
+        """
+        rows, cols = None, dict()
+        for rx in self.references():
+            rows, cols[rx] = self._allocation_column(rx)
+        if rows is None:
+            rows = [x for x in self._exchanges.values() if x not in self.reference_entity]
+        return rows, cols
+
     def find_exchange(self, spec=None, reference=None, direction=None):
         """
         returns an exchange matching the specification.
@@ -406,6 +551,7 @@ class LcProcess(LcEntity):
 
     def remove_reference(self, flow, dirn):
         reference = Exchange(self, flow, dirn)
+        self.reset_allocation_cache()
         self._exchanges[reference.key].unset_ref(self)
         self.remove_allocation(reference)
         if reference in self.reference_entity:
@@ -416,10 +562,10 @@ class LcProcess(LcEntity):
     def references(self, flow=None):
         for rf in self.reference_entity:
             if flow is None:
-                yield self._exchanges[rf.key]
+                yield self._x_dict[rf.key]
             else:
                 if rf.flow == flow or rf.flow.match(flow):
-                    yield self._exchanges[rf.key]
+                    yield self._x_dict[rf.key]
 
     def reference(self, flow=None):
         return self.find_exchange(flow, reference=True)
@@ -449,9 +595,9 @@ class LcProcess(LcEntity):
                 raise ValueError('An allocation quantity is required to compute normalized allocation factors')
             quantity = self._alloc_by_quantity
 
-        return {rf: self._exchanges[rf.key].value * rf.flow.cf(quantity)
+        return {rf: self._x_dict[rf.key].value * rf.flow.cf(quantity)
                 for rf in self.reference_entity
-                if self._exchanges[rf.key].value is not None}
+                if self._x_dict[rf.key].value is not None}
 
     def allocate_by_quantity(self, quantity):
         """
@@ -465,6 +611,7 @@ class LcProcess(LcEntity):
         :param quantity: an LcQuantity (or None to remove quantity allocation)
         :return:
         """
+        self.reset_allocation_cache()
         if quantity is None:
             self._alloc_by_quantity = None
             self._alloc_sum = 0.0
@@ -533,6 +680,7 @@ class LcProcess(LcEntity):
                 raise MissingAllocation('Missing allocation factors for above exchanges')
 
     def remove_allocation(self, reference):
+        self.reset_allocation_cache()
         for x in self._exchanges.values():
             x.remove_allocation(reference)
 
@@ -608,9 +756,25 @@ class LcProcess(LcEntity):
 
             # This is the only point an exchange is added to the process
             self._exchanges[e.key] = e
-            self._exch_map[e.flow.external_ref].add(e)
+            self._index_exchange(e)
+            self.reset_allocation_cache()
             return e
 
+    def remove_exchange(self, exchange):
+        """
+        Remove an exchange from the process.  If it is a reference exchange, it is first removed from the process's
+        references.
+        :param exchange: an exchange belonging to the process (or one that hashes the same)
+        :return: the removed exchange
+        """
+        x = self._exchanges[exchange.key]
+        if x.is_reference:
+            self.remove_reference(x.flow, x.direction)
+        self._exchanges.pop(x.key)
+        self._unindex_exchange(x)
+        self.reset_allocation_cache()
+        return x
+
     def lcias(self, quantities, **kwargs):
         results = LciaResults(entity=self)
         for q in quantities:
@@ -641,8 +805,8 @@ class LcProcess(LcEntity):
                                     key=lambda x: (x['direction'], x['flow']))
         else:
             # if exchanges is false, only report reference exchanges
-            j['exchanges'] = sorted([x.serialize(**kwargs) for x in self._exchanges.values()
-                                     if x in self.reference_entity],
+            # (reference exchanges are always present, so this does not materialize deferred exchanges)
+            j['exchanges'] = sorted([self._x_dict[x.key].serialize(**kwargs) for x in self.reference_entity],
                                     key=lambda x: (x['direction'], x['flow']))
             j.pop('allocationFactors', None)  # added just for OpenLCA JSON-LD, but could be generalized
         return j
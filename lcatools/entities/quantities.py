@@ -5,6 +5,7 @@ from lcatools.entities.entities import LcEntity
 
 
 class LcQuantity(LcEntity):
+    __slots__ = ()
 
     _ref_field = 'referenceUnit'
     _new_fields = []
@@ -100,6 +101,8 @@ class LcUnit(object):
     Dummy class to store a reference to a unit definition
     Design decision: even though ILCD unitgroups have assigned UUIDs, we are not maintaining unitgroups
     """
+    __slots__ = ('_uuid', '_unitstring', '_external_ref')
+
     entity_type = 'unit'
 
     def __init__(self, unitstring, unit_uuid=None):
@@ -1,5 +1,8 @@
 import unittest
 from .base_testclass import BasicEntityTest
+from ..processes import LcProcess
+from ..flows import LcFlow
+from ..quantities import LcQuantity
 
 
 class ProcessesTest(BasicEntityTest):
@@ -30,6 +33,35 @@ class ProcessesTest(BasicEntityTest):
         for x in self.grid.inventory(ex):
             self.assertEqual(x.value, inv_dict[x.flow] / ex.value)
 
+    def test_allocation_matrix(self):
+        """
+        allocated inventories are column slices of the process's allocation matrix, and agree with the exchange
+        relation computed directly
+        :return:
+        """
+        rows, cols = self.petro.allocation_matrix()
+        self.assertEqual(len(cols), len(self.petro.reference_entity))
+        for rx, col in cols.items():
+            self.assertEqual(len(col), len(rows))
+            inv = [x for x in self.petro.inventory(rx)]
+            self.assertEqual(len(inv), len(rows))
+            for x, row, v in zip(inv, rows, col):
+                self.assertIs(x.flow, row.flow)
+                self.assertEqual(x.value, row[rx])
+                self.assertEqual(x.value, v)
+
+    def test_allocation_cache_reset(self):
+        rx = next(self.petro.references())
+        q = self.petro.alloc_qty
+        before = {x.key: x.value for x in self.petro.inventory(rx)}
+        self.petro.allocate_by_quantity(None)
+        try:
+            after = {x.key: x.value for x in self.petro.inventory(rx)}
+            self.assertNotEqual(before, after)
+        finally:
+            self.petro.allocate_by_quantity(q)
+        self.assertDictEqual(before, {x.key: x.value for x in self.petro.inventory(rx)})
+
     def test_inv_not_reference(self):
         """
         test implementation of the interface specification for inventory
@@ -40,5 +72,55 @@ class ProcessesTest(BasicEntityTest):
         pass
 
 
+class ExchangeIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        mass = LcQuantity.new('mass', 'kg')
+        cls.product = LcFlow.new('product', mass)
+        cls.steel = LcFlow.new('steel', mass)
+        cls.scrap = LcFlow.new('scrap', mass)
+
+    def setUp(self):
+        self.p = LcProcess.new('test process')
+        self.p.add_exchange(self.product, 'Output', value=1.0)
+        self.p.add_reference(self.product, 'Output')
+        self.p.add_exchange(self.steel, 'Input', value=1.1, termination='steel mill')
+        self.p.add_exchange(self.steel, 'Input', value=0.2, termination='mini mill')
+        self.p.add_exchange(self.scrap, 'Output', value=0.3)
+        self.p.add_exchange(self.scrap, 'Input', value=0.05, termination='mini mill')
+
+    def test_by_flow(self):
+        self.assertEqual(len([x for x in self.p.exchange_values(self.steel)]), 2)
+        self.assertEqual(len([x for x in self.p.exchange_values(self.scrap.external_ref)]), 2)
+
+    def test_by_flow_direction(self):
+        self.assertEqual(self.p.find_exchange(self.scrap, direction='Output').value, 0.3)
+        self.assertEqual(len([x for x in self.p.exchange_values(self.scrap, direction='Input')]), 1)
+
+    def test_by_termination(self):
+        self.assertSetEqual({x.flow.external_ref for x in self.p.terminated_exchanges('mini mill')},
+                            {self.steel.external_ref, self.scrap.external_ref})
+        self.assertEqual(len([x for x in self.p.exchange_values(self.steel, termination='steel mill')]), 1)
+
+    def test_reference(self):
+        self.assertIs(self.p.reference().flow, self.product)
+        self.assertEqual(len([x for x in self.p._gen_exchanges(reference=False)]), 4)
+
+    def test_remove(self):
+        x = self.p.find_exchange(self.scrap, direction='Output')
+        self.p.remove_exchange(x)
+        self.assertEqual(len(self.p), 4)
+        self.assertFalse(self.p.has_exchange(self.scrap, direction='Output'))
+        self.assertEqual(len([x for x in self.p.terminated_exchanges('mini mill')]), 2)
+        x = self.p.find_exchange(self.scrap, direction='Input')
+        self.p.remove_exchange(x)
+        self.assertEqual(len([x for x in self.p.terminated_exchanges('mini mill')]), 1)
+
+    def test_remove_reference(self):
+        self.p.remove_exchange(self.p.reference())
+        self.assertEqual(len(self.p.reference_entity), 0)
+        self.assertFalse(self.p.has_exchange(self.product))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,13 @@
+from sys import intern
+from types import MappingProxyType
+
 from .interfaces import comp_dir
 
 
+# shared, read-only value_dict for exchanges that have no allocation; replaced by a real dict on first assignment
+_NO_ALLOCATION = MappingProxyType({})
+
+
 class ExchangeError(Exception):
     pass
 
@@ -30,6 +37,8 @@ class Exchange(object):
     differently-terminated flows. (ecoinvent)
     """
 
+    __slots__ = ('_process', '_flow', '_direction', '_termination', '_comment', '_hash', '_is_reference')
+
     entity_type = 'exchange'
 
     def __init__(self, process, flow, direction, termination=None, comment=None):
@@ -48,11 +57,11 @@ class Exchange(object):
 
         self._process = process
         self._flow = flow
-        self._direction = direction
+        self._direction = intern(direction)  # direction and termination strings are heavily repeated
         self._termination = None
         self._comment = comment  # don't bother to serialize these yet...
         if termination is not None:
-            self._termination = str(termination)
+            self._termination = intern(str(termination))
         # self._hash_tuple =
         self._hash = hash((process.uuid, flow.external_ref, direction, self._termination))  # have to use uuid because
         # process's external_ref is not set until after exchanges are populated!
@@ -251,6 +260,8 @@ class ExchangeValue(Exchange):
     An ExchangeValue is an exchange with a single value (corresponding to unallocated exchange value) plus a dict of
     values allocated to different reference flows.
     """
+    __slots__ = ('_value', '_value_dict')
+
     @classmethod
     def from_exchange(cls, exch, value=None, **kwargs):
         if isinstance(exch, ExchangeValue):
@@ -260,15 +271,18 @@ class ExchangeValue(Exchange):
         return cls(exch.process, exch.flow, exch.direction, value=value, **kwargs)
 
     @classmethod
-    def from_allocated(cls, allocated, reference):
+    def from_allocated(cls, allocated, reference, value=None):
         """
         Use to flatten an allocated process inventory into a standalone inventory
         :param allocated:
         :param reference: a reference exchange
+        :param value: [None] the allocated value, if already known (e.g. from the process's allocation matrix)
         :return:
         """
         if isinstance(allocated, ExchangeValue):
-            return cls(allocated.process, allocated.flow, allocated.direction, value=allocated[reference],
+            if value is None:
+                value = allocated[reference]
+            return cls(allocated.process, allocated.flow, allocated.direction, value=value,
                        termination=allocated.termination, comment=allocated.comment)
         elif isinstance(allocated, Exchange):
             return allocated
@@ -282,7 +296,19 @@ class ExchangeValue(Exchange):
         return cls(allocated.process, allocated.flow, allocated.direction, value=value,
                    termination=allocated.termination)
 
+    def _reset_process_cache(self):
+        """
+        Let the owning process know that its cached allocated values are stale. Processes that are not LcProcesses
+        (fragments, refs) have no such cache.
+        :return:
+        """
+        try:
+            self._process.reset_allocation_cache()
+        except AttributeError:
+            pass
+
     def add_to_value(self, value, reference=None):
+        self._reset_process_cache()
         if reference is None:
             self._value += value
         else:
@@ -300,7 +326,7 @@ class ExchangeValue(Exchange):
         # assert isinstance(value, float), 'ExchangeValues must be floats (or subclasses)'
         self._value = value
         if value_dict is None:
-            self._value_dict = dict()  # keys must live in self.process.reference_entity
+            self._value_dict = _NO_ALLOCATION  # keys must live in self.process.reference_entity
         else:
             self._value_dict = value_dict
 
@@ -335,6 +361,7 @@ class ExchangeValue(Exchange):
             raise DuplicateExchangeError('Unallocated exchange value already set to %g (new: %g)' % (self._value,
                                                                                                      exch_val))
         self._value = exch_val
+        self._reset_process_cache()
 
     def is_allocated(self, key):
         """
@@ -433,7 +460,10 @@ class ExchangeValue(Exchange):
                 if value != 0:
                     raise ValueError('Non-reference Allocation for reference exchange should be 0.')
         else:
+            if self._value_dict is _NO_ALLOCATION:
+                self._value_dict = dict()
             self._value_dict[key] = value
+            self._reset_process_cache()
 
     def remove_allocation(self, key):
         """
@@ -443,6 +473,7 @@ class ExchangeValue(Exchange):
         """
         if key in self._value_dict:
             self._value_dict.pop(key)
+            self._reset_process_cache()
 
     def __str__(self):
         if self.process.entity_type == 'fragment':
@@ -1,7 +1,6 @@
-from collections import defaultdict
-
 from .basic import BasicImplementation
-from ..interfaces import IndexInterface, comp_dir, CONTEXT_STATUS_
+from .termination_index import TerminationIndex
+from ..interfaces import IndexInterface, comp_dir
 
 
 class NotForeground(Exception):
@@ -30,26 +29,20 @@ class IndexImplementation(BasicImplementation, IndexInterface):
         return self._archive.ti
 
     def re_index(self, cutoffs=False):
-        self._archive.ti = defaultdict(set)
-        self._index_terminations(cutoffs=cutoffs)
+        self._archive.ti = TerminationIndex(self._archive, cutoffs=cutoffs)
+        self._index_terminations()
 
-    def _index_terminations(self, cutoffs=False):
+    def _index_terminations(self):
         """
-        This can't be done on add because new processes may get stored before their references are setup.
+        Bring the termination index up to date with the archive's processes.  This can't be done on add because new
+        processes may get stored before their references are setup; instead, processes added since the last lookup
+        are indexed when terminate() is next called.
         This should only be run if the archive is local
-        :param cutoffs: [False] if true, terminations include all cutoff [null-termination] exchanges, not just
-          references
-         :NOTE: until context refactor there is no consistent usage of terminations, so we will skip this
-        :return:
+         :NOTE: until context refactor there is no consistent usage of terminations, so cutoffs mode is moot
+        :return: the number of processes newly indexed
         """
-        for p in self._archive.entities_by_type('process'):
-            if cutoffs and CONTEXT_STATUS_ == 'new':
-                for x in p.exchanges():
-                    if x.termination is None:
-                        self._terminations[x.flow.external_ref].add((x.direction, p))
-            else:
-                for rx in p.reference_entity:
-                    self._terminations[rx.flow.external_ref].add((rx.direction, p))
+        return self._terminations.update()
+
     """
     CatalogInterface core methods
     These are the main tools for describing information about the contents of the archive
@@ -98,7 +91,7 @@ class IndexImplementation(BasicImplementation, IndexInterface):
             cdir = comp_dir(direction)
             if not isinstance(flow_ref, str) and not isinstance(flow_ref, int):  # NSUUID archives can use integer ids
                 flow_ref = flow_ref.external_ref
-            for x in self._terminations[flow_ref]:  # defaultdict, so no KeyError
+            for x in self._terminations[flow_ref]:  # indexes new processes first; no KeyError
                 if direction is None:
                     yield x[1]
                 else:
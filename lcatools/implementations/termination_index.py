@@ -0,0 +1,133 @@
+"""
+The termination index maps a flow's external_ref to the (direction, process) pairs in an archive that terminate it.
+
+It is kept up to date incrementally: processes added to the archive since the last lookup are indexed on the next
+lookup (not on add, because new processes may get stored before their references are setup), and processes that have
+left the archive are dropped.  It can be serialized in packed form-- flow external_ref: [[direction, process ref],
+...]-- and stored with an archive index, so that loading the index does not require walking every process again.
+Packed entries are resolved to process entities the first time their flow is looked up.
+
+Flow refs are keyed as strings, because NSUUID archives may use integer external_refs and JSON keys are strings.
+"""
+
+from collections import defaultdict
+
+from ..interfaces import CONTEXT_STATUS_
+
+
+class TerminationIndex(object):
+    def __init__(self, archive, cutoffs=False):
+        """
+        :param archive: the archive whose processes are indexed
+        :param cutoffs: [False] if true, terminations include all cutoff [null-termination] exchanges, not just
+          references
+        """
+        self._archive = archive
+        self._cutoffs = cutoffs
+        self._terms = defaultdict(set)  # str(flow_ref): {(direction, process), ...}
+        self._packed = dict()  # flow_ref: [(direction, process_ref), ...] not yet resolved
+        self._by_process = dict()  # process_ref: [flow_ref, ...] for every indexed process
+
+    @classmethod
+    def from_packed(cls, archive, packed):
+        ti = cls(archive)
+        ti.load_packed(packed)
+        return ti
+
+    @property
+    def cutoffs(self):
+        return self._cutoffs
+
+    def __len__(self):
+        return len(self._by_process)
+
+    def _process_entries(self, p):
+        if self._cutoffs and CONTEXT_STATUS_ == 'new':
+            return [(str(x.flow.external_ref), x.direction) for x in p.exchanges() if x.termination is None]
+        return [(str(rx.flow.external_ref), rx.direction) for rx in p.reference_entity]
+
+    def add_process(self, p):
+        if p.external_ref in self._by_process:
+            self.remove_process(p.external_ref)
+        entries = self._process_entries(p)
+        for flow_ref, direction in entries:
+            self._terms[flow_ref].add((direction, p))
+        self._by_process[p.external_ref] = [flow_ref for flow_ref, direction in entries]
+
+    def remove_process(self, process_ref):
+        """
+        :param process_ref: process or its external_ref
+        :return:
+        """
+        if not isinstance(process_ref, str) and not isinstance(process_ref, int):
+            process_ref = process_ref.external_ref
+        for flow_ref in self._by_process.pop(process_ref, []):
+            self._unpack(flow_ref)
+            terms = {t for t in self._terms[flow_ref] if t[1].external_ref != process_ref}
+            if terms:
+                self._terms[flow_ref] = terms
+            else:
+                self._terms.pop(flow_ref)
+
+    def update(self):
+        """
+        Index processes added to the archive since the last update, and drop processes no longer in it
+        :return: the number of processes indexed
+        """
+        if self._archive.count_by_type('process') == len(self._by_process):
+            return 0
+        current = set()
+        added = 0
+        for p in self._archive.entities_by_type('process'):
+            current.add(p.external_ref)
+            if p.external_ref not in self._by_process:
+                self.add_process(p)
+                added += 1
+        for process_ref in [k for k in self._by_process.keys() if k not in current]:
+            self.remove_process(process_ref)
+        return added
+
+    def _unpack(self, flow_ref):
+        for direction, process_ref in self._packed.pop(flow_ref, []):
+            p = self._archive[process_ref]
+            if p is not None:
+                self._terms[flow_ref].add((direction, p))
+
+    def __getitem__(self, flow_ref):
+        flow_ref = str(flow_ref)
+        self.update()
+        self._unpack(flow_ref)
+        if flow_ref in self._terms:
+            return self._terms[flow_ref]
+        return set()
+
+    def load_packed(self, packed):
+        """
+        Add packed entries, as generated by serialize().  Processes already indexed are skipped; every process
+        present in the archive is considered indexed afterwards.
+        :param packed: dict of flow_ref: list of [direction, process_ref]
+        :return:
+        """
+        known = set(self._by_process.keys())
+        for flow_ref, entries in packed.items():
+            flow_ref = str(flow_ref)
+            for direction, process_ref in entries:
+                if process_ref in known:
+                    continue
+                self._packed.setdefault(flow_ref, []).append((direction, process_ref))
+                self._by_process.setdefault(process_ref, []).append(flow_ref)
+        for p in self._archive.entities_by_type('process'):
+            self._by_process.setdefault(p.external_ref, [])
+
+    def serialize(self):
+        """
+        :return: packed form-- dict of flow_ref: sorted list of [direction, process_ref]
+        """
+        packed = defaultdict(set)
+        for flow_ref, entries in self._packed.items():
+            for direction, process_ref in entries:
+                packed[flow_ref].add((direction, process_ref))
+        for flow_ref, terms in self._terms.items():
+            for direction, p in terms:
+                packed[flow_ref].add((direction, p.external_ref))
+        return {k: sorted([list(t) for t in v], key=lambda x: (x[0], str(x[1]))) for k, v in packed.items()}
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+from shutil import rmtree
+
+from ...archives import archive_from_json, index_archive
+from ...archives.tests import basic_archive_src
+from ...entities import LcProcess
+
+
+process_ref = 'Reforesting, average state or private moist cold softwood forest, INW'
+flow_ref = 37572
+
+
+class TerminationIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.ar = archive_from_json(basic_archive_src)
+        self.index = self.ar.make_interface('index')
+        self._dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        rmtree(self._dir)
+
+    def test_terminate(self):
+        terms = list(self.index.terminate(flow_ref))
+        self.assertListEqual([p.external_ref for p in terms], [process_ref])
+        self.assertListEqual(list(self.index.terminate(str(flow_ref), direction='Input')), terms)
+        self.assertListEqual(list(self.index.terminate(flow_ref, direction='Output')), [])
+
+    def test_incremental(self):
+        list(self.index.terminate(flow_ref))
+        flow = self.ar[flow_ref]
+        p = LcProcess.new('Another reforesting process')
+        self.ar.add(p)
+        p.add_exchange(flow, 'Output')  # reference set up after the process is stored
+        p.add_reference(flow, 'Output')
+        self.assertEqual(len(list(self.index.terminate(flow_ref))), 2)
+        self.assertEqual(self.index._index_terminations(), 0)
+
+    def test_persist(self):
+        index_archive(self.ar, os.path.join(self._dir, 'index.json'))
+        ix = archive_from_json(os.path.join(self._dir, 'index.json.gz'))
+        self.assertEqual(ix.ti.update(), 0)  # nothing to walk
+        terms = list(ix.make_interface('index').terminate(flow_ref, direction='Input'))
+        self.assertListEqual([p.external_ref for p in terms], [process_ref])
+        self.assertIs(terms[0], ix[process_ref])
+
+
+if __name__ == '__main__':
+    unittest.main()
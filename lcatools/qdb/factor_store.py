@@ -0,0 +1,78 @@
+"""
+Persistent store of compiled LCIA factors, one file per quantity.
+
+Loading an LCIA method the slow way means retrieving every characterization from the quantity's origin and adding it
+to the Qdb, resolving flowable synonyms and compartments for each one.  Once that has been done, Qdb.compile_factors()
+captures the result-- the flowable synonym sets, compartments, and flows with their values-- and the store saves it
+keyed by the quantity's link, together with a signature of the quantity's source (if one is cheaply known).  A record is
+only used while the source has the same signature, and while its contents match the hash saved with it.  Qdb.
+add_compiled_factors() imports a record in bulk, resolving each distinct flowable and compartment only once and without
+consulting the origin.
+"""
+
+import hashlib
+import json
+import os
+
+from lcatools.from_json import from_json, to_json
+
+
+class FactorStore(object):
+    def __init__(self, directory):
+        self._dir = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @property
+    def directory(self):
+        return self._dir
+
+    def _file(self, link):
+        h = hashlib.sha1()
+        h.update(link.encode('utf-8'))
+        return os.path.join(self._dir, h.hexdigest() + '.json.gz')
+
+    @staticmethod
+    def content_hash(record):
+        h = hashlib.sha1()
+        h.update(json.dumps(record, sort_keys=True).encode('utf-8'))
+        return h.hexdigest()
+
+    def known(self, link):
+        return os.path.exists(self._file(link))
+
+    def save(self, link, record, signature=None):
+        """
+        :param link: the quantity's link
+        :param record: as generated by Qdb.compile_factors()
+        :param signature: [None] identifies the state of the quantity's source
+        :return: the content hash
+        """
+        content_hash = self.content_hash(record)
+        fname = self._file(link)
+        tmp = fname + '.part.gz'
+        to_json({'link': link, 'signature': signature, 'hash': content_hash, 'record': record}, tmp, gzip=True)
+        os.replace(tmp, fname)
+        return content_hash
+
+    def load(self, link, signature=None):
+        """
+        :param link:
+        :param signature: [None] the present signature of the quantity's source
+        :return: the stored record, or None if there is none, it was compiled from a source with a different
+         signature, or it fails its hash check
+        """
+        fname = self._file(link)
+        if not os.path.exists(fname):
+            return None
+        j = from_json(fname)
+        if j.get('link') != link or self.content_hash(j['record']) != j.get('hash'):
+            print('Discarding compiled factors for %s: content does not match' % link)
+            return None
+        if j.get('signature') != signature:
+            print('Discarding compiled factors for %s: source has changed' % link)
+            return None
+        return j['record']
+
+    def remove(self, link):
+        if os.path.exists(self._file(link)):
+            os.remove(self._file(link))
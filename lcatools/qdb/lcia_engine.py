@@ -1,18 +1,24 @@
 # from antelope_reports import FlowablesGrid
 from .qdb import Qdb
+from .factor_store import FactorStore
+from lcatools import tracing
 
 
 class LciaEngine(object):
     """
     A class for interfacing with a Qdb to perform LCIA calculations
     """
-    def __init__(self, **kwargs):
+    def __init__(self, factor_dir=None, **kwargs):
         """
 
+        :param factor_dir: [None] directory in which to keep compiled LCIA factors.  If None, factors are always
+         loaded from the quantity's origin.
         :param kwargs: passed to Qdb
         """
+        self._qdb_args = kwargs
         self._qdb = Qdb(**kwargs)
         self._lcia_methods = set()
+        self._factor_store = None if factor_dir is None else FactorStore(factor_dir)
 
     @property
     def qdb(self):
@@ -37,13 +43,71 @@ class LciaEngine(object):
     def is_elementary(self, flow):
         return self._qdb.c_mgr.is_elementary(flow)
 
-    def load_lcia_factors(self, ref):
-        if ref.link not in self._lcia_methods:
-            for fb in ref.flowables():
-                self._qdb.add_new_flowable(*filter(None, fb))
-            for cf in ref.factors():
-                self._qdb.add_cf(cf)
-            self._lcia_methods.add(ref.link)
+    @staticmethod
+    def _load_from_origin(qdb, ref):
+        flowables = list(ref.flowables())
+        for fb in flowables:
+            qdb.add_new_flowable(*filter(None, fb))
+        cfs = list(ref.factors())
+        for cf in cfs:
+            qdb.add_cf(cf)
+        return flowables, cfs
+
+    def _factor_signature(self, ref):
+        """
+        Identifies the state of a quantity's source, so that factors compiled from it are not used once it changes.
+        It must be cheap to compute-- it is not worth consulting the origin to decide whether to consult the origin.
+        The engine alone has no such knowledge, so it returns None and stored records are trusted; use refresh=True
+        or verify_lcia_factors() to check them against the origin.  A subclass that knows where quantities come
+        from can do better.
+        :param ref: quantity ref
+        :return: a string, or None
+        """
+        return None
+
+    @tracing.traced('lcia', 'LciaEngine.load_lcia_factors')
+    def load_lcia_factors(self, ref, refresh=False):
+        """
+        Load a quantity's characterization factors into the Qdb, once per session.  If the engine has a factor store,
+        factors are imported from it when they were compiled from the present state of the quantity's source;
+        otherwise they are retrieved from the quantity's origin and then compiled into the store.
+        :param ref: quantity ref
+        :param refresh: [False] retrieve factors from the origin even if already loaded or compiled, and recompile
+        :return:
+        """
+        if ref.link in self._lcia_methods and not refresh:
+            return
+        signature = None
+        if self._factor_store is not None:
+            signature = self._factor_signature(ref)
+            if not refresh:
+                record = self._factor_store.load(ref.link, signature)
+                if record is not None and self._qdb.add_compiled_factors(ref, record):
+                    self._lcia_methods.add(ref.link)
+                    return
+        flowables, cfs = self._load_from_origin(self._qdb, ref)
+        if self._factor_store is not None:
+            self._factor_store.save(ref.link, self._qdb.compile_factors(ref, flowables=flowables, cfs=cfs),
+                                    signature)
+        self._lcia_methods.add(ref.link)
+
+    def verify_lcia_factors(self, ref):
+        """
+        Check a quantity's compiled factors against its origin: load them both ways into scratch Qdbs and compare.
+        :param ref: quantity ref
+        :return: True if they agree; False if not; None if there are no current compiled factors
+        """
+        if self._factor_store is None:
+            return None
+        record = self._factor_store.load(ref.link, self._factor_signature(ref))
+        if record is None:
+            return None
+        slow = Qdb(**self._qdb_args)
+        self._load_from_origin(slow, ref)
+        fast = Qdb(**self._qdb_args)
+        if not fast.add_compiled_factors(ref, record):
+            return False
+        return slow.factor_table(ref) == fast.factor_table(ref)
 
     def annotate(self, flow, quantity=None, factor=None, value=None, locale=None):
         """
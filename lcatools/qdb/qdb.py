@@ -32,6 +32,8 @@ from lcatools.archives import BasicArchive
 from lcatools.basic_query import BasicQuery
 from lcatools.flowdb.compartments import Compartment, CompartmentManager, MissingCompartment
 from lcatools.characterizations import Characterization
+from lcatools.entities import LcFlow
+from lcatools import tracing
 # from lcatools.dynamic_grid import dynamic_grid
 # from lcatools.interact import pick_one
 from synlist import SynList, Flowables, InconsistentIndices, ConflictingCas, EntityFound
@@ -592,6 +594,124 @@ class Qdb(BasicArchive):
             self._f_dict[f_ind].add(q_ind)
             self._fq_dict[f_ind, q_ind][comp] = factor
 
+    def compile_factors(self, quantity, flowables=(), cfs=None):
+        """
+        Capture the characterization factors loaded for a quantity in a form that add_compiled_factors() can import
+        in bulk.  Flows are recorded with their values, compartments and the flowable sets they resolved to; each
+        flowable set holds the terms of all the flows that resolved to it.
+        :param quantity:
+        :param flowables: (CAS, name) pairs reported by the quantity's origin, which are added to the Qdb on load
+        :param cfs: [None] only compile these characterizations (e.g. those retrieved from the quantity's origin),
+         leaving out any others the Qdb holds for the quantity.  Default is all of them.
+        :return: a JSON-serializable dict
+        """
+        q_ind = self._get_q_ind(quantity)
+        only = None if cfs is None else set(id(cf) for cf in cfs)
+        fb_rows = dict()  # f_ind: row
+        fb_terms = []
+        comp_rows = dict()  # compartment tuple: row
+        flows = dict()  # id(cf): entry
+        for f_ind in sorted(self._q_dict[q_ind]):
+            for cf in self._fq_dict[f_ind, q_ind].cfs():
+                if only is not None and id(cf) not in only:
+                    continue
+                if f_ind not in fb_rows:
+                    fb_rows[f_ind] = len(fb_terms)
+                    fb_terms.append(set())
+                fb_terms[fb_rows[f_ind]].update(self._flow_terms(cf.flow))
+                if id(cf) not in flows:
+                    comp = tuple(cf.flow['Compartment'])
+                    if comp not in comp_rows:
+                        comp_rows[comp] = len(comp_rows)
+                    flows[id(cf)] = [str(cf.flow.get_uuid()), cf.flow.external_ref, cf.flow.origin, cf.flow['Name'],
+                                     cf.flow['CasNumber'], comp_rows[comp], str(cf.flow.reference_entity.uuid),
+                                     [], {l: cf[l] for l in cf.locations()}, {l: cf.origin(l) for l in cf.locations()}]
+                flows[id(cf)][7].append(fb_rows[f_ind])
+        quantities = dict()  # the characterized quantity and every flow's reference quantity, as entities
+        for f_ind in self._q_dict[q_ind]:
+            for cf in self._fq_dict[f_ind, q_ind].cfs():
+                if only is not None and id(cf) not in only:
+                    continue
+                for q in (cf.quantity, cf.flow.reference_entity):
+                    if str(q.uuid) not in quantities:
+                        quantities[str(q.uuid)] = q.serialize()
+        return {'quantity': str(quantity.uuid),
+                'quantities': quantities,
+                'listed': [list(fb) for fb in flowables],
+                'flowables': [sorted(t) for t in fb_terms],
+                'compartments': [list(c) for c, row in sorted(comp_rows.items(), key=lambda x: x[1])],
+                'flows': sorted(flows.values(), key=lambda x: x[0])}
+
+    def add_compiled_factors(self, quantity, record):
+        """
+        Import characterization factors as captured by compile_factors().  Each distinct flowable set and compartment
+        is resolved once; factors are then filed directly.
+        :param quantity:
+        :param record:
+        :return: True if the record was imported; False if it refers to reference quantities unknown to the Qdb, in
+         which case nothing is changed
+        """
+        try:
+            qs = {uid: self._quantity_from_compiled(dict(j)) for uid, j in record['quantities'].items()}
+        except KeyError:
+            return False
+        q_ind = self._get_q_ind(quantity)
+        q = qs.get(record['quantity'])
+        if q is None:
+            return False
+        for k in qs.values():
+            self._get_q_ind(k)
+
+        for fb in record['listed']:
+            self.add_new_flowable(*filter(None, fb))
+        fb_inds = []
+        for terms in record['flowables']:
+            self.add_new_flowable(*terms)
+            fb_inds.append(list(self._find_flowables(*terms)))
+        comps = [self.c_mgr.find_matching(c, interact=False) for c in record['compartments']]
+
+        for uid, ext_ref, origin, name, cas, c_row, ref_q, fb_rows, values, origins in record['flows']:
+            flow = LcFlow(uid, external_ref=ext_ref, origin=origin, Name=name, CasNumber=cas,
+                          Compartment=record['compartments'][c_row], ReferenceQuantity=qs[ref_q])
+            cf = Characterization(flow, q)
+            for l, v in values.items():
+                cf.add_value(value=v, location=l, origin=origins[l])
+            comp = comps[c_row]
+            for f_ind in set(i for row in fb_rows for i in fb_inds[row]):
+                self._q_dict[q_ind].add(f_ind)
+                self._f_dict[f_ind].add(q_ind)
+                self._fq_dict[f_ind, q_ind][comp] = cf
+        return True
+
+    def _quantity_from_compiled(self, j):
+        """
+        Rebuild a quantity entity serialized by compile_factors().  Raises KeyError if the serialization is not a
+        complete entity (e.g. a catalog ref)
+        """
+        uid = j.pop('entityId')
+        ext_ref = j['externalId']
+        j.pop('entityType', None)
+        q = self._quantity_from_json(j, uid)
+        q.set_external_ref(ext_ref)
+        return q
+
+    def factor_table(self, quantity):
+        """
+        A session-independent listing of the factors loaded for a quantity, for comparing two ways of loading them
+        :param quantity:
+        :return: sorted list of (flowable name, compartment, reference quantity name, flow uuid, values) tuples
+        """
+        q_ind = self._get_q_ind(quantity)
+        rows = set()
+        for f_ind in self._q_dict[q_ind]:
+            lookup = self._fq_dict[f_ind, q_ind]
+            for comp in lookup.compartments():
+                for cf in lookup[comp]:
+                    rows.add((self._f.name(f_ind), tuple(comp.to_list()),
+                              self._q.name(self._get_q_ind(cf.flow.reference_entity)), str(cf.flow.get_uuid()),
+                              tuple(sorted((l, cf[l]) for l in cf.locations()))))
+        return sorted(rows)
+
     def _lookup_cfs(self, f_inds, compartment, q_ind):
         if isinstance(f_inds, int):
             f_inds = [f_inds]
@@ -812,6 +932,7 @@ class Qdb(BasicArchive):
             # TODO: implement semantic disambiguator to pick best CF
         return vals[0]
 
+    @tracing.traced('lcia', 'Qdb.do_lcia')
     def do_lcia(self, quantity, inventory, locale='GLO', refresh=False, debug=False, **kwargs):
         """
         takes a quantity and an exchanges generator; returns an LciaResult for the given quantity.
@@ -0,0 +1,69 @@
+from lcatools import tracing
+
+import json
+import os
+import tempfile
+import unittest
+
+
+@tracing.traced('test', 'decorated')
+def decorated(x):
+    return x + 1
+
+
+class TracingTestCase(unittest.TestCase):
+    def setUp(self):
+        tracing.reset()
+
+    def tearDown(self):
+        tracing.disable()
+        tracing.reset()
+
+    def _row(self, category, name, origin=None):
+        return next(r for r in tracing.flat_profile() if (r['category'], r['name'], r['origin']) ==
+                    (category, name, origin))
+
+    def test_disabled(self):
+        with tracing.span('test', 'outer', 'test.origin'):
+            tracing.count('test', 'cache', 'test.origin', hit=True)
+        self.assertEqual(decorated(1), 2)
+        self.assertListEqual(tracing.flat_profile(), [])
+        self.assertListEqual(tracing.chrome_trace()['traceEvents'], [])
+
+    def test_nested(self):
+        tracing.enable()
+        for i in range(3):
+            with tracing.span('test', 'outer', 'test.origin'):
+                with tracing.span('test', 'inner', 'test.origin'):
+                    decorated(i)
+        tracing.count('test', 'cache', 'test.origin', hit=True)
+        tracing.count('test', 'cache', 'test.origin', hit=False)
+        tracing.disable()
+        outer = self._row('test', 'outer', 'test.origin')
+        inner = self._row('test', 'inner', 'test.origin')
+        self.assertEqual(outer['calls'], 3)
+        self.assertEqual(self._row('test', 'decorated')['calls'], 3)
+        self.assertAlmostEqual(outer['self'], outer['total'] - inner['total'])
+        cache = self._row('test', 'cache', 'test.origin')
+        self.assertEqual((cache['calls'], cache['hits'], cache['misses']), (0, 1, 1))
+
+    def test_chrome_trace(self):
+        tracing.enable(max_events=2)
+        for i in range(3):
+            with tracing.span('test', 'op', 'test.origin', step=i):
+                pass
+        tracing.disable()
+        self.assertEqual(self._row('test', 'op', 'test.origin')['calls'], 3)
+        with tempfile.TemporaryDirectory() as tmpdir:
+            fname = os.path.join(tmpdir, 'trace.json')
+            self.assertEqual(tracing.export_chrome_trace(fname), 2)
+            with open(fname) as fp:
+                trace = json.load(fp)
+        e = trace['traceEvents'][0]
+        self.assertEqual((e['ph'], e['cat'], e['name']), ('X', 'test', 'op'))
+        self.assertDictEqual(e['args'], {'origin': 'test.origin', 'step': '0'})
+        self.assertEqual(trace['otherData']['dropped'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,262 @@
+"""
+Low-overhead tracing of queries through the catalog stack.
+
+Code that does significant work-- routing a query, answering it in an interface, fetching an entity from an archive's
+source, parsing a provider's XML, solving a background system-- opens a span:
+
+    with tracing.span('archive', 'fetch', origin):
+        ...
+
+and places where a cache is consulted record a hit or a miss with tracing.count().  Spans are identified by category,
+name and origin.  While tracing is disabled (the default) span() returns a shared do-nothing context manager, so an
+instrumented call costs one function call and a flag test.
+
+While tracing is enabled, every span is recorded with its start time, duration and thread, and aggregated into a
+profile of call counts, total time and self time (total time less the time spent in nested spans) for each
+(category, name, origin).  The record can be exported as a Chrome trace (load it in chrome://tracing or Perfetto) or
+reported as a flat profile.  To keep memory bounded, only the first max_events spans are kept for the trace; the
+profile counts all of them.
+
+    tracing.enable()
+    ... run queries ...
+    tracing.disable()
+    tracing.print_profile()
+    tracing.export_chrome_trace('trace.json')
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from time import perf_counter
+
+
+DEFAULT_MAX_EVENTS = 1000000
+
+_enabled = False
+
+
+class _NullSpan(object):
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Recorder(object):
+    def __init__(self, max_events=DEFAULT_MAX_EVENTS):
+        self.max_events = max_events
+        self.t0 = perf_counter()
+        self.events = []  # (category, name, origin, start, duration, thread id, args)
+        self.dropped = 0
+        self.stats = defaultdict(lambda: [0, 0.0, 0.0])  # (category, name, origin): [calls, total, self]
+        self.counters = defaultdict(lambda: [0, 0])  # (category, name, origin): [hits, misses]
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def stack(self):
+        try:
+            return self.local.stack
+        except AttributeError:
+            self.local.stack = []
+            return self.local.stack
+
+
+_recorder = _Recorder()
+
+
+class _Span(object):
+    __slots__ = ('_key', '_args', '_start', '_child', '_rec')
+
+    def __init__(self, key, args):
+        self._key = key
+        self._args = args
+        self._start = 0.0
+        self._child = 0.0  # time spent in nested spans
+        self._rec = _recorder  # a span ends in the record it began in, even if reset() intervenes
+
+    def __enter__(self):
+        self._rec.stack().append(self)
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration = perf_counter() - self._start
+        rec = self._rec
+        stack = rec.stack()
+        stack.pop()
+        if stack:
+            stack[-1]._child += duration
+        with rec.lock:
+            stat = rec.stats[self._key]
+            stat[0] += 1
+            stat[1] += duration
+            stat[2] += duration - self._child
+            if len(rec.events) < rec.max_events:
+                rec.events.append(self._key + (self._start, duration, threading.get_ident(), self._args))
+            else:
+                rec.dropped += 1
+        return False
+
+
+def is_enabled():
+    return _enabled
+
+
+def enable(max_events=None):
+    """
+    Start recording.  Anything already recorded is kept; use reset() to start afresh.
+    :param max_events: [None] change the number of spans kept for the trace (default 1,000,000)
+    :return:
+    """
+    global _enabled
+    if max_events is not None:
+        _recorder.max_events = max_events
+    _enabled = True
+
+
+def disable():
+    """
+    Stop recording.  The record is kept until reset().
+    :return:
+    """
+    global _enabled
+    _enabled = False
+
+
+def reset():
+    """
+    Discard everything recorded
+    :return:
+    """
+    global _recorder
+    _recorder = _Recorder(max_events=_recorder.max_events)
+
+
+def span(category, name, origin=None, **args):
+    """
+    :param category: e.g. 'query', 'interface', 'archive', 'provider', 'background'
+    :param name: the operation, e.g. a method name
+    :param origin: [None] the origin being queried
+    :param args: anything else to record with the span in the trace
+    :return: a context manager
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span((category, name, origin), args or None)
+
+
+def traced(category, name=None):
+    """
+    Decorator: trace every call of a function.  If the function is a method of an object with an 'origin' attribute,
+    the span takes that origin.
+    :param category:
+    :param name: [None] default is the function's qualified name
+    :return:
+    """
+    def decorator(fn):
+        span_name = name or fn.__qualname__
+
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            origin = getattr(args[0], 'origin', None) if args else None
+            with _Span((category, span_name, origin if isinstance(origin, str) else None), None):
+                return fn(*args, **kwargs)
+        wrapper.__name__ = fn.__name__
+        wrapper.__qualname__ = fn.__qualname__
+        wrapper.__doc__ = fn.__doc__
+        wrapper.__wrapped__ = fn
+        return wrapper
+    return decorator
+
+
+def count(category, name, origin=None, hit=True):
+    """
+    Record a cache hit or miss
+    :param category:
+    :param name: the cache
+    :param origin:
+    :param hit: [True] False for a miss
+    :return:
+    """
+    if not _enabled:
+        return
+    rec = _recorder
+    with rec.lock:
+        rec.counters[category, name, origin][0 if hit else 1] += 1
+
+
+def flat_profile():
+    """
+    :return: list of dicts, one per (category, name, origin), in decreasing order of self time, with keys 'category',
+     'name', 'origin', 'calls', 'total', 'self' (seconds), 'hits' and 'misses'.  Entries with only hits and misses
+     have no calls.
+    """
+    rec = _recorder
+    with rec.lock:
+        keys = set(rec.stats.keys()) | set(rec.counters.keys())
+        rows = []
+        for key in keys:
+            calls, total, self_time = rec.stats[key] if key in rec.stats else (0, 0.0, 0.0)
+            hits, misses = rec.counters[key] if key in rec.counters else (0, 0)
+            rows.append({'category': key[0], 'name': key[1], 'origin': key[2],
+                         'calls': calls, 'total': total, 'self': self_time, 'hits': hits, 'misses': misses})
+    return sorted(rows, key=lambda x: (-x['self'], -x['calls'], -x['hits'] - x['misses']))
+
+
+def print_profile(limit=40):
+    """
+    Print the flat profile
+    :param limit: [40] number of rows to show
+    :return:
+    """
+    rows = flat_profile()
+    print('%9s %9s %8s %9s %9s  %-10s %-36s %s' % ('self (s)', 'total (s)', 'calls', 'hits', 'misses', 'category',
+                                                   'name', 'origin'))
+    for r in rows[:limit]:
+        print('%9.4f %9.4f %8d %9d %9d  %-10s %-36s %s' % (r['self'], r['total'], r['calls'], r['hits'], r['misses'],
+                                                           r['category'], r['name'], r['origin'] or ''))
+    if _recorder.dropped:
+        print('(%d spans not kept for the trace)' % _recorder.dropped)
+
+
+def chrome_trace():
+    """
+    :return: the recorded spans in Chrome trace event format, as a dict
+    """
+    rec = _recorder
+    pid = os.getpid()
+    with rec.lock:
+        events = list(rec.events)
+        counters = {'%s:%s:%s' % k: {'hits': v[0], 'misses': v[1]} for k, v in rec.counters.items()}
+    trace = []
+    for category, name, origin, start, duration, tid, args in events:
+        e = {'name': name, 'cat': category, 'ph': 'X', 'pid': pid, 'tid': tid,
+             'ts': (start - rec.t0) * 1e6, 'dur': duration * 1e6}
+        a = dict(args) if args else dict()
+        if origin is not None:
+            a['origin'] = origin
+        if a:
+            e['args'] = {k: str(v) for k, v in a.items()}
+        trace.append(e)
+    return {'traceEvents': trace, 'displayTimeUnit': 'ms', 'otherData': {'counters': counters,
+                                                                          'dropped': rec.dropped}}
+
+
+def export_chrome_trace(filename):
+    """
+    Write the recorded spans as a Chrome trace JSON file
+    :param filename:
+    :return: the number of spans written
+    """
+    trace = chrome_trace()
+    with open(filename, 'w') as fp:
+        json.dump(trace, fp)
+    return len(trace['traceEvents'])